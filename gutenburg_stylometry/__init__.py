@@ -3,17 +3,25 @@ Gutenberg Stylometry - Quantitative stylometric analysis for Project Gutenberg c
 
 This package provides tools for computing and comparing stylometric metrics
 across authors, enabling quantitative literary analysis.
+
+Exports are imported lazily: `import gutenburg_stylometry` does not load
+the tokenizer or pydantic until one of them is used.
 """
 
+from typing import TYPE_CHECKING
+
+from gutenburg_stylometry._lazy import lazy_exports
+
 __version__ = "0.1.0"
 
-from gutenburg_stylometry.tokenizer import VictorianTokenizer, tokenize
-from gutenburg_stylometry.models import (
-    BookMetadata,
-    TTRResult,
-    TTRAggregate,
-    TTRComparison,
-)
+if TYPE_CHECKING:
+    from gutenburg_stylometry.tokenizer import VictorianTokenizer, tokenize
+    from gutenburg_stylometry.models import (
+        BookMetadata,
+        TTRResult,
+        TTRAggregate,
+        TTRComparison,
+    )
 
 __all__ = [
     "VictorianTokenizer",
@@ -23,3 +31,12 @@ __all__ = [
     "TTRAggregate",
     "TTRComparison",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "VictorianTokenizer": "gutenburg_stylometry.tokenizer",
+    "tokenize": "gutenburg_stylometry.tokenizer",
+    "BookMetadata": "gutenburg_stylometry.models",
+    "TTRResult": "gutenburg_stylometry.models",
+    "TTRAggregate": "gutenburg_stylometry.models",
+    "TTRComparison": "gutenburg_stylometry.models",
+})
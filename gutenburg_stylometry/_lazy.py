@@ -0,0 +1,41 @@
+"""
+Lazy package exports (PEP 562).
+
+Package __init__ modules re-export their public classes without importing
+the defining modules up front: the tokenizer compiles its regexes and the
+models pull in pydantic, and a short-lived CLI or a freshly spawned worker
+should only pay for what it uses. Each export is imported on first
+attribute access and then cached in the package namespace.
+"""
+
+import importlib
+import sys
+from typing import Any, Callable
+
+
+def lazy_exports(
+    package: str, exports: dict[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Build a package's module-level __getattr__ and __dir__.
+
+    Args:
+        package: The package's __name__
+        exports: Public name -> fully qualified module that defines it
+
+    Returns:
+        Tuple of (__getattr__, __dir__) to assign in the package
+    """
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*vars(sys.modules[package]), *exports})
+
+    return __getattr__, __dir__
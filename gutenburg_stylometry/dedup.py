@@ -0,0 +1,274 @@
+"""
+Near-duplicate detection for normalized books with MinHash and LSH.
+
+select_best_version only merges files that share a canonical filename;
+the same work also turns up under different titles and editions. Each
+book is reduced to a MinHash signature of its word shingles while it is
+normalized, and locality-sensitive hashing (banding the signature)
+proposes candidate pairs in roughly linear time. Candidates whose
+estimated Jaccard similarity clears a threshold are joined with
+union-find into clusters, and every cluster keeps one book by the
+select_best_version rule (largest, then newest ID).
+
+The result is a dedup map (dedup_map.json in the normalized directory)
+naming the books to leave out; normalize_files and TTRService honour it.
+"""
+
+import json
+import re
+import zlib
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+DEDUP_MAP_NAME = "dedup_map.json"
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 5  # Words per shingle
+DEFAULT_BANDS = 16  # 16 bands x 8 rows: pairs near 0.7 Jaccard become candidates
+DEFAULT_THRESHOLD = 0.8  # Estimated Jaccard similarity to call a pair duplicates
+
+_WORD_PATTERN = re.compile(r"\w+")
+_SHINGLE_BLOCK = 8192  # Shingles hashed per block (bounds the permutation matrix)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+
+class DocumentSignature(NamedTuple):
+    """MinHash signature of one book, with what is needed to pick a keeper."""
+
+    name: str  # Output file name
+    size: int  # Characters, for the largest-version rule
+    work_id: int  # Gutenberg ID, for tie breaks
+    signature: np.ndarray
+
+
+class MinHasher:
+    """Computes MinHash signatures of word shingles."""
+
+    def __init__(
+        self,
+        num_perm: int = DEFAULT_NUM_PERM,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        seed: int = 1,
+    ):
+        """
+        Initialize hasher.
+
+        Signatures are only comparable between hashers built with the
+        same num_perm, shingle_size and seed.
+
+        Args:
+            num_perm: Hash functions (signature length)
+            shingle_size: Words per shingle
+            seed: Seed for the hash function parameters
+        """
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: h(x) = ((a * x + b) mod 2^64) >> 32, a odd
+        self._a = rng.integers(1, 2**63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+        self._num_perm = num_perm
+        self._shingle_size = shingle_size
+
+    @property
+    def num_perm(self) -> int:
+        """Return the signature length."""
+        return self._num_perm
+
+    def shingles(self, text: str) -> np.ndarray:
+        """
+        Distinct 32-bit hashes of the text's word shingles.
+
+        Words are hashed once with CRC-32 and combined into shingle hashes
+        with a vectorized polynomial roll.
+
+        Args:
+            text: Book text
+
+        Returns:
+            Sorted unique uint64 array of shingle hashes (empty if the text
+            has fewer words than a shingle)
+        """
+        words = _WORD_PATTERN.findall(text.lower())
+        n = len(words) - self._shingle_size + 1
+        if n <= 0:
+            return np.empty(0, dtype=np.uint64)
+
+        word_hashes = {w: zlib.crc32(w.encode("utf-8")) for w in dict.fromkeys(words)}
+        hashes = np.fromiter(map(word_hashes.__getitem__, words), dtype=np.uint64, count=len(words))
+        shingles = hashes[:n].copy()
+        for j in range(1, self._shingle_size):
+            shingles = shingles * np.uint64(1_000_003) + hashes[j : j + n]
+        return np.unique((shingles ^ (shingles >> np.uint64(32))) & _MAX_HASH)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        MinHash signature of a text.
+
+        Args:
+            text: Book text
+
+        Returns:
+            uint32 array of length num_perm, or None if the text is too
+            short to shingle
+        """
+        shingles = self.shingles(text)
+        if not len(shingles):
+            return None
+
+        signature = np.full(self._num_perm, _MAX_HASH, dtype=np.uint64)
+        a, b = self._a[:, None], self._b[:, None]
+        for start in range(0, len(shingles), _SHINGLE_BLOCK):
+            block = shingles[start : start + _SHINGLE_BLOCK][None, :]
+            np.minimum(signature, ((a * block + b) >> np.uint64(32)).min(axis=1), out=signature)
+        return signature.astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(a == b))
+
+
+class UnionFind:
+    """Disjoint sets over 0..n-1 with path halving and union by size."""
+
+    def __init__(self, n: int):
+        """
+        Initialize n singleton sets.
+
+        Args:
+            n: Number of elements
+        """
+        self._parent = list(range(n))
+        self._size = [1] * n
+
+    def find(self, x: int) -> int:
+        """Return the representative of x's set."""
+        parent = self._parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, x: int, y: int) -> None:
+        """Merge the sets containing x and y."""
+        x, y = self.find(x), self.find(y)
+        if x == y:
+            return
+        if self._size[x] < self._size[y]:
+            x, y = y, x
+        self._parent[y] = x
+        self._size[x] += self._size[y]
+
+    def groups(self) -> list[list[int]]:
+        """Sets with more than one element, each sorted."""
+        members: dict[int, list[int]] = {}
+        for x in range(len(self._parent)):
+            members.setdefault(self.find(x), []).append(x)
+        return [group for group in members.values() if len(group) > 1]
+
+
+def find_clusters(
+    signatures: list[np.ndarray],
+    bands: int = DEFAULT_BANDS,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[list[int]]:
+    """
+    Cluster near-duplicate signatures with LSH banding.
+
+    Signatures are cut into bands; documents sharing any band are
+    candidates. Each bucket member is verified against the bucket's first
+    member only, so the work stays linear in the number of documents even
+    for large buckets; clusters still chain through union-find.
+
+    Args:
+        signatures: Equal-length MinHash signatures
+        bands: Number of bands (must divide the signature length)
+        threshold: Minimum estimated Jaccard similarity to join a pair
+
+    Returns:
+        Clusters of signature indices (each with at least two members)
+    """
+    if not signatures:
+        return []
+    num_perm = len(signatures[0])
+    if num_perm % bands:
+        raise ValueError(f"{bands} bands do not divide {num_perm} permutations")
+    rows = num_perm // bands
+
+    matrix = np.stack(signatures)
+    sets = UnionFind(len(signatures))
+    for band in range(bands):
+        buckets: dict[bytes, int] = {}
+        band_rows = matrix[:, band * rows : (band + 1) * rows]
+        for i in range(len(signatures)):
+            first = buckets.setdefault(band_rows[i].tobytes(), i)
+            if first != i and sets.find(first) != sets.find(i):
+                if similarity(matrix[first], matrix[i]) >= threshold:
+                    sets.union(first, i)
+    return sets.groups()
+
+
+def build_dedup_map(
+    documents: list[DocumentSignature],
+    bands: int = DEFAULT_BANDS,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> dict:
+    """
+    Find near-duplicate clusters and choose which book of each to keep.
+
+    Args:
+        documents: Signatures of every book
+        bands: LSH bands
+        threshold: Minimum estimated Jaccard similarity
+
+    Returns:
+        Dict with the settings, the clusters (keep, duplicates and their
+        similarity to the keeper) and a flat duplicates map of
+        duplicate name -> kept name
+    """
+    clusters = []
+    duplicates: dict[str, str] = {}
+    for group in find_clusters([d.signature for d in documents], bands, threshold):
+        members = [documents[i] for i in group]
+        keep = max(members, key=lambda d: (d.size, d.work_id))
+        dropped = sorted((d for d in members if d is not keep), key=lambda d: d.name)
+        clusters.append({
+            "keep": keep.name,
+            "duplicates": [
+                {"name": d.name, "similarity": round(similarity(keep.signature, d.signature), 4)}
+                for d in dropped
+            ],
+        })
+        duplicates.update((d.name, keep.name) for d in dropped)
+
+    clusters.sort(key=lambda c: c["keep"])
+    return {
+        "num_perm": len(documents[0].signature) if documents else DEFAULT_NUM_PERM,
+        "bands": bands,
+        "threshold": threshold,
+        "documents": len(documents),
+        "clusters": clusters,
+        "duplicates": dict(sorted(duplicates.items())),
+    }
+
+
+def write_dedup_map(path: Path, dedup_map: dict) -> None:
+    """Write a dedup map as JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(dedup_map, indent=2), encoding="utf-8")
+
+
+def load_duplicates(path: Path) -> dict[str, str]:
+    """
+    Duplicate file names to leave out, from a dedup map.
+
+    Args:
+        path: dedup_map.json (may not exist)
+
+    Returns:
+        Dict of duplicate name -> kept name (empty if there is no map)
+    """
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8")).get("duplicates", {})
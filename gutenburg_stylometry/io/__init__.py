@@ -1,6 +1,28 @@
 """File I/O for stylometric analysis."""
 
-from gutenburg_stylometry.io.reader import NormalizedFileReader
-from gutenburg_stylometry.io.writer import JSONLWriter
+from typing import TYPE_CHECKING
 
-__all__ = ["NormalizedFileReader", "JSONLWriter"]
+from gutenburg_stylometry._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from gutenburg_stylometry.io.archive import ArchiveReader
+    from gutenburg_stylometry.io.catalog import CorpusCatalog
+    from gutenburg_stylometry.io.reader import NormalizedFileReader
+    from gutenburg_stylometry.io.sqlite_store import SQLiteMetricsStore
+    from gutenburg_stylometry.io.writer import JSONLWriter
+
+__all__ = [
+    "ArchiveReader",
+    "CorpusCatalog",
+    "NormalizedFileReader",
+    "JSONLWriter",
+    "SQLiteMetricsStore",
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "ArchiveReader": "gutenburg_stylometry.io.archive",
+    "CorpusCatalog": "gutenburg_stylometry.io.catalog",
+    "NormalizedFileReader": "gutenburg_stylometry.io.reader",
+    "JSONLWriter": "gutenburg_stylometry.io.writer",
+    "SQLiteMetricsStore": "gutenburg_stylometry.io.sqlite_store",
+})
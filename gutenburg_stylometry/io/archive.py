@@ -0,0 +1,364 @@
+"""
+Archive-native reader for Gutenberg bundles.
+
+Streams books straight out of .zip, .tar / .tar.gz / .tgz archives, or a
+directory of per-book .txt.gz files, without an extraction step. Reading
+is sequential in archive order, so millions of small-file opens become a
+few large sequential reads.
+
+A tar archive is indexed once per reader: one pass over a single open
+handle records every member's header, and later reads seek to members
+through that handle. For compressed tars, seeking forward decompresses
+only the gap, so reading authors in archive order (list_authors() order
+for a name-sorted archive) costs about two passes over the archive in
+total. Seeking backward has to restart decompression from the beginning.
+
+The reader is picklable (open handles are dropped and reopened lazily),
+so it can be shipped to worker processes; iter_books() takes a shard
+index/count so each worker streams its own slice of the members.
+"""
+
+import gzip
+import os
+import tarfile
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import Callable, Iterator, NamedTuple, Optional
+
+from gutenburg_stylometry.io.reader import BookContent, decode_text, parse_filename
+
+
+ZIP_SUFFIXES = (".zip",)
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+GZIP_SUFFIX = ".gz"
+
+
+class ArchiveMember(NamedTuple):
+    """A book inside an archive."""
+
+    name: str  # Path of the member inside the archive
+    size: int  # Uncompressed size if known, else stored size
+
+    @property
+    def file_name(self) -> str:
+        """Bare .txt file name (directories and .gz suffix removed)."""
+        name = PurePosixPath(self.name).name
+        return name[: -len(GZIP_SUFFIX)] if name.endswith(GZIP_SUFFIX) else name
+
+
+def is_archive(path: Path) -> bool:
+    """
+    Return True if path is a supported archive file or a .txt.gz directory.
+
+    A directory counts only if it holds .txt.gz files and no plain .txt
+    files, so a directory of raw texts with a stray compressed copy is
+    still read as plain files.
+    """
+    name = path.name.lower()
+    if path.is_file():
+        return name.endswith(ZIP_SUFFIXES + TAR_SUFFIXES)
+    if not path.is_dir():
+        return False
+    names = [p.name for p in path.iterdir() if ".txt" in p.name]
+    return bool(names) and all(n.endswith(".txt.gz") for n in names)
+
+
+class ArchiveReader:
+    """
+    Reader for books stored in an archive.
+
+    Mirrors NormalizedFileReader: iter_author_files() yields virtual paths
+    (archive path / member name) that read() accepts, and
+    iter_author_books() streams BookContent in archive order.
+    """
+
+    def __init__(self, source: Path, exclude: Optional[set[str]] = None):
+        """
+        Initialize reader.
+
+        Args:
+            source: .zip or tar archive, or a directory of .txt.gz files
+            exclude: Bare .txt file names to leave out (e.g. near-duplicates)
+        """
+        self._source = source
+        self._exclude = exclude or set()
+        name = source.name.lower()
+        if source.is_dir():
+            self._kind = "gzip"
+        elif name.endswith(ZIP_SUFFIXES):
+            self._kind = "zip"
+        elif name.endswith(TAR_SUFFIXES):
+            self._kind = "tar"
+        else:
+            raise ValueError(f"Unsupported archive: {source}")
+
+        self._members: Optional[list[ArchiveMember]] = None
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._tar: Optional[tarfile.TarFile] = None
+        self._tar_infos: Optional[dict[str, tarfile.TarInfo]] = None  # Member headers by name
+
+    def __getstate__(self) -> dict:
+        """Drop open handles so the reader can be sent to worker processes."""
+        state = self.__dict__.copy()
+        state["_zip"] = None
+        state["_tar"] = None
+        state["_tar_infos"] = None
+        return state
+
+    def close(self) -> None:
+        """Close any open archive handle."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        if self._tar is not None:
+            self._tar.close()
+            self._tar = None
+            self._tar_infos = None
+
+    def __enter__(self) -> "ArchiveReader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def source(self) -> Path:
+        """Return the archive path."""
+        return self._source
+
+    # -------------------------------------------------------------------------
+    # Members
+    # -------------------------------------------------------------------------
+
+    def members(self) -> list[ArchiveMember]:
+        """
+        List .txt members in archive order, leaving out excluded files.
+
+        Zip listings come from the central directory; tar archives need
+        one sequential pass, which also builds the member index (cached
+        for the lifetime of the reader).
+
+        Returns:
+            ArchiveMember list
+        """
+        if self._members is None:
+            if self._kind == "zip":
+                members = [
+                    ArchiveMember(info.filename, info.file_size)
+                    for info in self._open_zip().infolist()
+                    if not info.is_dir() and info.filename.endswith(".txt")
+                ]
+            elif self._kind == "tar":
+                members = [
+                    ArchiveMember(info.name, info.size) for info in self._index_tar().values()
+                ]
+            else:
+                with os.scandir(self._source) as it:
+                    members = sorted(
+                        (
+                            ArchiveMember(e.name, e.stat().st_size)
+                            for e in it
+                            if e.is_file() and e.name.endswith(".txt.gz")
+                        ),
+                        key=lambda m: m.name,
+                    )
+            self._members = [m for m in members if m.file_name not in self._exclude]
+        return self._members
+
+    def iter_texts(
+        self,
+        select: Optional[Callable[[ArchiveMember], bool]] = None,
+        shard_index: int = 0,
+        shard_count: int = 1,
+    ) -> Iterator[tuple[ArchiveMember, str]]:
+        """
+        Stream decoded member texts in archive order.
+
+        Args:
+            select: Only yield members for which this returns True (None: all)
+            shard_index: This worker's shard (0-based)
+            shard_count: Total number of shards; member i goes to i % count
+
+        Yields:
+            Tuples of (member, text)
+        """
+        if not 0 <= shard_index < shard_count:
+            raise ValueError(f"Invalid shard {shard_index} of {shard_count}")
+
+        if self._kind == "tar" and self._tar_infos is None:
+            # Not indexed: stream mode, strictly sequential with no seeking
+            position = 0
+            with tarfile.open(self._source, "r|*") as tar:
+                for info in tar:
+                    if not info.isfile() or not info.name.endswith(".txt"):
+                        continue
+                    member = ArchiveMember(info.name, info.size)
+                    if member.file_name in self._exclude:
+                        continue
+                    selected = position % shard_count == shard_index
+                    position += 1
+                    if not selected or (select is not None and not select(member)):
+                        continue
+                    yield member, decode_text(tar.extractfile(info).read())
+            return
+
+        for position, member in enumerate(self.members()):
+            if position % shard_count != shard_index:
+                continue
+            if select is not None and not select(member):
+                continue
+            yield member, self._read_member(member.name)
+
+    def _read_member(self, name: str) -> str:
+        """Random-access read of a single member."""
+        if self._kind == "zip":
+            return decode_text(self._open_zip().read(name))
+        if self._kind == "gzip":
+            with gzip.open(self._source / name, "rb") as f:
+                return decode_text(f.read())
+
+        info = self._index_tar().get(name)
+        if info is None:
+            raise FileNotFoundError(f"Not a file in archive: {name}")
+        return decode_text(self._tar.extractfile(info).read())
+
+    def _index_tar(self) -> dict[str, tarfile.TarInfo]:
+        """Open the tar handle for this process and index its .txt members."""
+        if self._tar_infos is None:
+            if self._tar is None:
+                self._tar = tarfile.open(self._source, "r:*")
+            self._tar_infos = {
+                info.name: info
+                for info in self._tar
+                if info.isfile() and info.name.endswith(".txt")
+            }
+        return self._tar_infos
+
+    def _open_zip(self) -> zipfile.ZipFile:
+        """Open (or reuse) the zip handle for this process."""
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self._source)
+        return self._zip
+
+    # -------------------------------------------------------------------------
+    # NormalizedFileReader-compatible interface
+    # -------------------------------------------------------------------------
+
+    def _book(self, member: ArchiveMember, text: str) -> BookContent:
+        """Wrap a member's text with metadata parsed from its file name."""
+        author, title, gutenberg_id = parse_filename(member.file_name)
+        return BookContent(
+            gutenberg_id=gutenberg_id,
+            title=title,
+            author=author,
+            text=text,
+            file_path=self._source / member.name,
+        )
+
+    def _member_author(self, member: ArchiveMember) -> Optional[str]:
+        """Author of a member, or None if its name does not parse."""
+        try:
+            return parse_filename(member.file_name)[0]
+        except ValueError:
+            return None
+
+    def read(self, file_path: Path) -> BookContent:
+        """
+        Read one book by its virtual path (archive path / member name).
+
+        Args:
+            file_path: Path yielded by iter_author_files()
+
+        Returns:
+            BookContent with metadata and text
+        """
+        name = file_path.relative_to(self._source).as_posix()
+        member = ArchiveMember(name, 0)
+        return self._book(member, self._read_member(name))
+
+    def iter_author_files(self, author: str) -> Iterator[Path]:
+        """
+        Iterate over virtual paths of an author's books.
+
+        Args:
+            author: Author identifier (e.g., 'dickens')
+
+        Yields:
+            Virtual paths accepted by read()
+        """
+        for member in self.members():
+            if member.file_name not in self._exclude and self._member_author(member) == author:
+                yield self._source / member.name
+
+    def iter_author_books(
+        self, author: str, exclude_ids: Optional[set[str]] = None
+    ) -> Iterator[BookContent]:
+        """
+        Stream an author's books sequentially.
+
+        Tar archives are indexed on the first call, so further authors
+        seek to their members instead of re-reading the archive.
+
+        Args:
+            author: Author identifier
+            exclude_ids: Gutenberg IDs to skip without decoding
+
+        Yields:
+            BookContent for each book, in archive order
+        """
+
+        def select(member: ArchiveMember) -> bool:
+            if member.file_name in self._exclude:
+                return False
+            try:
+                member_author, _, gutenberg_id = parse_filename(member.file_name)
+            except ValueError:
+                return False
+            return member_author == author and not (exclude_ids and gutenberg_id in exclude_ids)
+
+        if self._kind == "tar":
+            self._index_tar()
+        for member, text in self.iter_texts(select=select):
+            yield self._book(member, text)
+
+    def book_id(self, file_path: Path) -> Optional[str]:
+        """
+        Gutenberg ID of a virtual path, without reading it.
+
+        Args:
+            file_path: Path yielded by iter_author_files()
+
+        Returns:
+            The ID, or None if the member name does not parse
+        """
+        member = ArchiveMember(file_path.relative_to(self._source).as_posix(), 0)
+        try:
+            return parse_filename(member.file_name)[2]
+        except ValueError:
+            return None
+
+    def iter_books(self, shard_index: int = 0, shard_count: int = 1) -> Iterator[BookContent]:
+        """
+        Stream every parseable book, optionally one shard of them.
+
+        Args:
+            shard_index: This worker's shard (0-based)
+            shard_count: Total number of shards
+
+        Yields:
+            BookContent for each book, in archive order
+        """
+        for member, text in self.iter_texts(shard_index=shard_index, shard_count=shard_count):
+            if self._member_author(member) is not None:
+                yield self._book(member, text)
+
+    def list_authors(self) -> list[str]:
+        """
+        List all unique authors in the archive.
+
+        Returns:
+            Sorted list of author identifiers
+        """
+        authors = {self._member_author(m) for m in self.members()}
+        authors.discard(None)
+        return sorted(authors)
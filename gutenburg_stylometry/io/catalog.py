@@ -0,0 +1,256 @@
+"""
+Persistent catalog of the normalized corpus.
+
+Builds an author -> files / id -> file index with one os.scandir pass
+instead of re-globbing the directory for every author. Each entry keeps
+size, mtime and a content hash so that a refresh only re-hashes files
+that were added or changed since the last run. Hashing is I/O bound and
+runs on a thread pool.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+from gutenburg_stylometry.io.reader import parse_filename
+
+
+CATALOG_VERSION = 1
+DEFAULT_HASH_WORKERS = 8
+
+
+class CatalogEntry(NamedTuple):
+    """A single normalized file in the catalog."""
+
+    file_name: str
+    author: str
+    title: str
+    gutenberg_id: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+
+
+class RefreshStats(NamedTuple):
+    """Changes found by a catalog refresh."""
+
+    added: int
+    changed: int
+    removed: int
+    unchanged: int
+
+
+def hash_file(file_path: Path) -> str:
+    """
+    Hash file contents (BLAKE2b, 128-bit).
+
+    Args:
+        file_path: File to hash
+
+    Returns:
+        Hex digest
+    """
+    with open(file_path, "rb") as f:
+        return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+
+
+class CorpusCatalog:
+    """
+    Catalog of normalized .txt files keyed by author, ID and file name.
+
+    All lookups are dict-backed and O(1); the directory is only scanned
+    by build()/refresh().
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        index_path: Optional[Path] = None,
+        hash_workers: int = DEFAULT_HASH_WORKERS,
+    ):
+        """
+        Initialize an empty catalog.
+
+        Args:
+            root: Directory containing normalized .txt files
+            index_path: Where to persist the catalog (None: memory only)
+            hash_workers: Threads used to hash new or changed files
+        """
+        self._root = root
+        self._index_path = index_path
+        self._hash_workers = hash_workers
+        self._entries: dict[str, CatalogEntry] = {}
+        self._by_author: dict[str, list[CatalogEntry]] = {}
+        self._by_id: dict[str, CatalogEntry] = {}
+
+    @classmethod
+    def open(
+        cls,
+        root: Path,
+        index_path: Optional[Path] = None,
+        hash_workers: int = DEFAULT_HASH_WORKERS,
+    ) -> "CorpusCatalog":
+        """
+        Load a persisted catalog (if any) and bring it up to date.
+
+        Args:
+            root: Directory containing normalized .txt files
+            index_path: Persisted catalog location
+            hash_workers: Threads used to hash new or changed files
+
+        Returns:
+            Up-to-date catalog
+        """
+        catalog = cls(root, index_path, hash_workers)
+        if index_path is not None and index_path.exists():
+            catalog.load()
+        catalog.refresh()
+        return catalog
+
+    @property
+    def root(self) -> Path:
+        """Return the cataloged directory."""
+        return self._root
+
+    # -------------------------------------------------------------------------
+    # Scanning
+    # -------------------------------------------------------------------------
+
+    def build(self) -> RefreshStats:
+        """Rebuild the catalog from scratch."""
+        self._entries = {}
+        return self.refresh()
+
+    def refresh(self) -> RefreshStats:
+        """
+        Rescan the directory, re-hashing only new or changed files.
+
+        A file counts as unchanged when its size and mtime match the
+        cataloged entry. The catalog is saved if anything changed.
+
+        Returns:
+            RefreshStats summarizing the differences
+        """
+        if not self._root.exists():
+            raise FileNotFoundError(f"Normalized directory not found: {self._root}")
+
+        entries: dict[str, CatalogEntry] = {}
+        pending: list[tuple[str, str, str, str, int, int]] = []
+        added = changed = unchanged = 0
+
+        with os.scandir(self._root) as it:
+            for dir_entry in it:
+                name = dir_entry.name
+                if not name.endswith(".txt") or not dir_entry.is_file():
+                    continue
+                try:
+                    author, title, gutenberg_id = parse_filename(name)
+                except ValueError:
+                    continue
+
+                stat = dir_entry.stat()
+                previous = self._entries.get(name)
+                if (
+                    previous
+                    and previous.size == stat.st_size
+                    and previous.mtime_ns == stat.st_mtime_ns
+                ):
+                    entries[name] = previous
+                    unchanged += 1
+                    continue
+
+                if previous:
+                    changed += 1
+                else:
+                    added += 1
+                pending.append((name, author, title, gutenberg_id, stat.st_size, stat.st_mtime_ns))
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=self._hash_workers) as pool:
+                hashes = pool.map(hash_file, (self._root / p[0] for p in pending))
+                for fields, content_hash in zip(pending, hashes):
+                    entries[fields[0]] = CatalogEntry(*fields, content_hash)
+
+        removed = len(set(self._entries) - set(entries))
+        self._set_entries(entries)
+
+        stats = RefreshStats(added=added, changed=changed, removed=removed, unchanged=unchanged)
+        if self._index_path is not None and (added or changed or removed):
+            self.save()
+        return stats
+
+    def _set_entries(self, entries: dict[str, CatalogEntry]) -> None:
+        """Install entries and rebuild the lookup tables."""
+        self._entries = dict(sorted(entries.items()))
+        self._by_author = {}
+        self._by_id = {}
+        for entry in self._entries.values():
+            self._by_author.setdefault(entry.author, []).append(entry)
+            self._by_id[entry.gutenberg_id] = entry
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def save(self) -> None:
+        """Write the catalog to index_path."""
+        if self._index_path is None:
+            raise RuntimeError("Catalog has no index_path to save to")
+
+        self._index_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": CATALOG_VERSION,
+            "root": str(self._root),
+            "entries": [list(e) for e in self._entries.values()],
+        }
+        tmp_path = self._index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, self._index_path)
+
+    def load(self) -> None:
+        """Load the catalog from index_path (stale entries are fixed by refresh)."""
+        if self._index_path is None:
+            raise RuntimeError("Catalog has no index_path to load from")
+
+        data = json.loads(self._index_path.read_text(encoding="utf-8"))
+        if data.get("version") != CATALOG_VERSION:
+            self._set_entries({})
+            return
+        self._set_entries({row[0]: CatalogEntry(*row) for row in data["entries"]})
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[CatalogEntry]:
+        return iter(self._entries.values())
+
+    def authors(self) -> list[str]:
+        """Return sorted author identifiers."""
+        return sorted(self._by_author)
+
+    def entries_for(self, author: str) -> list[CatalogEntry]:
+        """Return catalog entries for an author (sorted by file name)."""
+        return self._by_author.get(author, [])
+
+    def files_for(self, author: str) -> list[Path]:
+        """Return file paths for an author (sorted by file name)."""
+        return [self._root / e.file_name for e in self.entries_for(author)]
+
+    def get(self, file_name: str) -> Optional[CatalogEntry]:
+        """Look up an entry by file name."""
+        return self._entries.get(file_name)
+
+    def by_id(self, gutenberg_id: str) -> Optional[CatalogEntry]:
+        """Look up an entry by Gutenberg ID."""
+        return self._by_id.get(gutenberg_id)
+
+    def path_for(self, entry: CatalogEntry) -> Path:
+        """Return the absolute path of an entry."""
+        return self._root / entry.file_name
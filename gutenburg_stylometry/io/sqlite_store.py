@@ -0,0 +1,361 @@
+"""
+SQLite store for per-book metrics and author aggregates.
+
+An alternative to the per-author JSONL/JSON outputs: every book lives in
+one indexed table, so cross-author queries (the 100 highest-STTR books,
+every book by a set of authors) are a single SELECT instead of a parse
+of every file. The scalar metrics are columns; nested optional records
+(sketches, sweeps, growth curves, chapters) are kept as JSON in `extra`.
+
+The database runs in WAL mode so readers are not blocked by a running
+pipeline, and writes are buffered and committed in executemany batches.
+"""
+
+import json
+import math
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from gutenburg_stylometry.models import TTRResult
+
+
+DEFAULT_BATCH_SIZE = 500
+
+# Scalar TTRResult fields stored as columns, in table order
+COLUMNS = (
+    "author",
+    "gutenberg_id",
+    "title",
+    "total_words",
+    "unique_words",
+    "ttr",
+    "root_ttr",
+    "log_ttr",
+    "sttr",
+    "sttr_std",
+    "chunk_count",
+    "delta_mean",
+    "delta_std",
+    "delta_min",
+    "delta_max",
+    "sampled_fraction",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    author TEXT NOT NULL,
+    gutenberg_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    total_words INTEGER NOT NULL,
+    unique_words INTEGER NOT NULL,
+    ttr REAL NOT NULL,
+    root_ttr REAL NOT NULL,
+    log_ttr REAL NOT NULL,
+    sttr REAL,
+    sttr_std REAL,
+    chunk_count INTEGER,
+    delta_mean REAL,
+    delta_std REAL,
+    delta_min REAL,
+    delta_max REAL,
+    sampled_fraction REAL,
+    extra TEXT,
+    PRIMARY KEY (author, gutenberg_id)
+);
+CREATE INDEX IF NOT EXISTS idx_books_gutenberg_id ON books (gutenberg_id);
+CREATE INDEX IF NOT EXISTS idx_books_ttr ON books (ttr);
+CREATE INDEX IF NOT EXISTS idx_books_sttr ON books (sttr);
+CREATE INDEX IF NOT EXISTS idx_books_delta_std ON books (delta_std);
+CREATE INDEX IF NOT EXISTS idx_books_total_words ON books (total_words);
+CREATE TABLE IF NOT EXISTS aggregates (
+    author TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+# Metrics whose mean and sample standard deviation aggregate() computes
+_SPREAD_METRICS = ("ttr", "root_ttr", "log_ttr", "sttr")
+
+
+class SQLiteMetricsStore:
+    """
+    Indexed SQLite storage for TTR results (a MetricWriter and a reader).
+
+    write() buffers rows and commits them batch_size at a time; flush()
+    commits whatever is buffered. A store may be written from a
+    BackgroundWriter thread: the connection is shared under a lock.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        journal_mode: str = "WAL",
+    ):
+        """
+        Open (and create if needed) a metrics database.
+
+        Args:
+            db_path: SQLite file path
+            batch_size: Rows buffered per executemany commit
+            journal_mode: SQLite journal mode ('WAL' or 'DELETE')
+        """
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db_path = db_path
+        self._batch_size = batch_size
+        self._pending: list[tuple] = []
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            db_path, timeout=60.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @property
+    def db_path(self) -> Path:
+        """Return the database path."""
+        return self._db_path
+
+    def close(self) -> None:
+        """Commit buffered rows and close the connection."""
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self) -> "SQLiteMetricsStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    # -------------------------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _row(result: TTRResult) -> tuple:
+        """Table row for a result (nested fields go to the extra JSON)."""
+        data = result.model_dump(mode="json", exclude_none=True)
+        extra = {k: v for k, v in data.items() if k not in COLUMNS}
+        return (
+            *(getattr(result, column) for column in COLUMNS),
+            json.dumps(extra) if extra else None,
+        )
+
+    def write(self, result: TTRResult) -> None:
+        """
+        Buffer a result, committing once batch_size rows are waiting.
+
+        A result for a book already in the store replaces it.
+
+        Args:
+            result: Per-book TTR result
+        """
+        with self._lock:
+            self._pending.append(self._row(result))
+            if len(self._pending) >= self._batch_size:
+                self._commit()
+
+    def write_many(self, results: Iterable[TTRResult]) -> None:
+        """Write results, committing in batches."""
+        for result in results:
+            self.write(result)
+        self.flush()
+
+    def flush(self) -> None:
+        """Commit buffered rows."""
+        with self._lock:
+            self._commit()
+
+    def _commit(self) -> None:
+        if not self._pending:
+            return
+        placeholders = ", ".join("?" * (len(COLUMNS) + 1))
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO books ({', '.join(COLUMNS)}, extra) "
+                f"VALUES ({placeholders})",
+                self._pending,
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._pending = []
+
+    def delete_author(self, author: str) -> None:
+        """Remove an author's books and aggregate."""
+        with self._lock:
+            self._commit()
+            self._conn.execute("DELETE FROM books WHERE author = ?", (author,))
+            self._conn.execute("DELETE FROM aggregates WHERE author = ?", (author,))
+
+    def write_aggregate(self, author: str, aggregate: dict) -> None:
+        """Store an author aggregate (as produced by TTRService.aggregate_author)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO aggregates (author, data) VALUES (?, ?)",
+                (author, json.dumps(aggregate, default=str)),
+            )
+
+    # -------------------------------------------------------------------------
+    # Reading
+    # -------------------------------------------------------------------------
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _result(row: tuple) -> TTRResult:
+        data = dict(zip(COLUMNS, row))
+        if row[len(COLUMNS)]:
+            data.update(json.loads(row[len(COLUMNS)]))
+        return TTRResult(**data)
+
+    def load_results(self, author: str) -> list[TTRResult]:
+        """
+        An author's per-book results.
+
+        Args:
+            author: Author identifier
+
+        Returns:
+            Results ordered by Gutenberg ID
+        """
+        rows = self._query(
+            f"SELECT {', '.join(COLUMNS)}, extra FROM books WHERE author = ? "
+            "ORDER BY gutenberg_id",
+            (author,),
+        )
+        return [self._result(row) for row in rows]
+
+    def top_books(
+        self, metric: str = "sttr", limit: int = 10, descending: bool = True
+    ) -> list[TTRResult]:
+        """
+        Books ranked by a metric column across every author.
+
+        Args:
+            metric: Scalar metric column (e.g. 'ttr', 'sttr', 'delta_std')
+            limit: Books to return
+            descending: Highest first
+
+        Returns:
+            Ranked results (books without the metric are left out)
+        """
+        if metric not in COLUMNS[3:]:
+            raise ValueError(f"Unknown metric column: {metric}")
+        order = "DESC" if descending else "ASC"
+        rows = self._query(
+            f"SELECT {', '.join(COLUMNS)}, extra FROM books WHERE {metric} IS NOT NULL "
+            f"ORDER BY {metric} {order} LIMIT ?",
+            (limit,),
+        )
+        return [self._result(row) for row in rows]
+
+    def book_ids(self, author: str) -> set[str]:
+        """Gutenberg IDs stored for an author."""
+        return {row[0] for row in self._query(
+            "SELECT gutenberg_id FROM books WHERE author = ?", (author,)
+        )}
+
+    def authors(self) -> list[str]:
+        """Authors with at least one stored book."""
+        return [row[0] for row in self._query("SELECT DISTINCT author FROM books ORDER BY author")]
+
+    def load_aggregate(self, author: str) -> Optional[dict]:
+        """A stored author aggregate, or None."""
+        rows = self._query("SELECT data FROM aggregates WHERE author = ?", (author,))
+        return json.loads(rows[0][0]) if rows else None
+
+    # -------------------------------------------------------------------------
+    # Aggregation in SQL
+    # -------------------------------------------------------------------------
+
+    def aggregate(self, author: str) -> Optional[dict[str, Any]]:
+        """
+        Author statistics computed by SQLite, without loading the books.
+
+        Produces the scalar keys of TTRAggregator.aggregate (same names and
+        rounding). Standard deviations are sample standard deviations from
+        a second pass of squared deviations about the SQL mean.
+
+        Args:
+            author: Author identifier
+
+        Returns:
+            Aggregate dict, or None if the author has no books
+        """
+        (row,) = self._query(
+            "SELECT COUNT(*), SUM(total_words), MIN(ttr), MAX(ttr), "
+            + ", ".join(f"COUNT({m}), AVG({m})" for m in _SPREAD_METRICS)
+            + ", COUNT(delta_std), AVG(delta_std) FROM books WHERE author = ?",
+            (author,),
+        )
+        n, total_words, ttr_min, ttr_max = row[:4]
+        if not n:
+            return None
+        counts = dict(zip(_SPREAD_METRICS, row[4:12:2]))
+        means = dict(zip(_SPREAD_METRICS, row[5:13:2]))
+        delta_std_count, delta_std_mean = row[12:14]
+
+        (squares,) = self._query(
+            "SELECT "
+            + ", ".join(f"SUM(({m} - ?) * ({m} - ?))" for m in _SPREAD_METRICS)
+            + " FROM books WHERE author = ?",
+            (*(v for m in _SPREAD_METRICS for v in (means[m] or 0.0,) * 2), author),
+        )
+        stds = {
+            m: math.sqrt(sq / (counts[m] - 1)) if counts[m] > 1 else None
+            for m, sq in zip(_SPREAD_METRICS, squares)
+        }
+
+        # Median: the middle one or two values of the ttr index
+        middle = self._query(
+            "SELECT ttr FROM books WHERE author = ? ORDER BY ttr LIMIT ? OFFSET ?",
+            (author, 2 - n % 2, (n - 1) // 2),
+        )
+        ttr_median = sum(v for (v,) in middle) / len(middle)
+
+        def rounded(value: Optional[float], digits: int = 6) -> Optional[float]:
+            return round(value, digits) if value is not None else None
+
+        return {
+            "author": author,
+            "book_count": n,
+            "total_words": total_words,
+            "ttr_mean": rounded(means["ttr"]),
+            "ttr_std": rounded(stds["ttr"]) if n > 1 else 0.0,
+            "ttr_min": rounded(ttr_min),
+            "ttr_max": rounded(ttr_max),
+            "ttr_median": rounded(ttr_median),
+            "root_ttr_mean": rounded(means["root_ttr"], 4),
+            "root_ttr_std": rounded(stds["root_ttr"], 4) if n > 1 else 0.0,
+            "log_ttr_mean": rounded(means["log_ttr"]),
+            "log_ttr_std": rounded(stds["log_ttr"]) if n > 1 else 0.0,
+            "sttr_mean": rounded(means["sttr"]),
+            "sttr_std": rounded(stds["sttr"]),
+            "delta_std_mean": rounded(delta_std_mean) if delta_std_count else None,
+        }
+
+    def heaps_beta_mean(self, author: str) -> Optional[float]:
+        """Mean Heaps' law exponent over an author's books that have one."""
+        (row,) = self._query(
+            "SELECT AVG(json_extract(extra, '$.vocabulary_growth.heaps_beta')) "
+            "FROM books WHERE author = ?",
+            (author,),
+        )
+        return round(row[0], 6) if row[0] is not None else None
+
+    def sketched_results(self, author: str) -> list[TTRResult]:
+        """An author's results that carry a vocabulary sketch."""
+        rows = self._query(
+            f"SELECT {', '.join(COLUMNS)}, extra FROM books WHERE author = ? "
+            "AND json_extract(extra, '$.vocabulary_sketch') IS NOT NULL",
+            (author,),
+        )
+        return [self._result(row) for row in rows]
@@ -6,7 +6,7 @@ Supports JSONL format for streaming/append-friendly output.
 
 import json
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 from pydantic import BaseModel
 
@@ -128,11 +128,15 @@ class JSONLReader:
 
     def __iter__(self):
         """Iterate over records in the file."""
+        return map(json.loads, self.lines())
+
+    def lines(self) -> Iterator[str]:
+        """Iterate over the non-empty lines, unparsed (for model_validate_json)."""
         with open(self._file_path, "r", encoding="utf-8") as f:
             for line in f:
                 line = line.strip()
                 if line:
-                    yield json.loads(line)
+                    yield line
 
     def read_all(self) -> list[dict]:
         """Read all records into a list."""
@@ -1,5 +1,14 @@
 """Stylometric metrics implementations."""
 
-from gutenburg_stylometry.metrics.ttr import TTRCalculator
+from typing import TYPE_CHECKING
+
+from gutenburg_stylometry._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from gutenburg_stylometry.metrics.ttr import TTRCalculator
 
 __all__ = ["TTRCalculator"]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "TTRCalculator": "gutenburg_stylometry.metrics.ttr",
+})
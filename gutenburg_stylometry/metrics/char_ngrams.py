@@ -0,0 +1,222 @@
+"""
+Character n-gram profiles with feature hashing.
+
+Character n-grams (n = 2..5) capture spelling, morphology and punctuation
+habits and are among the strongest authorship signals. Counting them in
+a dict grows with the vocabulary of n-grams, which runs to millions for a
+long book; instead each n-gram is hashed into one of a fixed number of
+buckets (the "hashing trick"), so a book's profile is a constant-size
+count vector whatever its length or vocabulary.
+
+Hashing is vectorized over a uint8 view of the UTF-8 text: n-gram hashes
+are built with a polynomial roll (the hash of every (n+1)-gram is the
+n-gram hash times a constant plus the next byte), mixed with a
+multiply-shift hash, and counted with np.bincount. The text is processed
+in fixed-size blocks so temporary arrays stay bounded too. n counts
+bytes, which for the tokenizer's ASCII-normalized text are characters.
+
+Profiles are stored sparsely: the top-k buckets by count (uint32 indices
+and counts), which covers nearly all of the n-gram mass at a fraction of
+the dense size. CharNgramProfile.dense() expands (and optionally folds) a
+profile into relative frequencies for FingerprintIndex.
+"""
+
+from pathlib import Path
+from typing import Mapping, NamedTuple, Optional
+
+import numpy as np
+
+
+DEFAULT_N_MIN = 2
+DEFAULT_N_MAX = 5
+DEFAULT_DIMS = 1 << 16  # Hash buckets (a power of two)
+DEFAULT_TOP_K = 4096  # Buckets kept per stored profile
+
+_BLOCK_BYTES = 1 << 20  # Text bytes hashed per block
+_ROLL = np.uint64(0x100000001B3)  # FNV-1a prime, for the polynomial roll
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)  # Multiply-shift mixing constant
+_SALT = 0xC2B2AE3D27D4EB4F  # Separates n-gram orders
+
+
+class CharNgramProfile(NamedTuple):
+    """Sparse top-k hashed character n-gram counts for one book."""
+
+    dims: int  # Hash buckets of the full profile
+    indices: np.ndarray  # uint32 bucket indices, ascending
+    counts: np.ndarray  # uint32 counts, aligned with indices
+    total: int  # All n-grams counted (including buckets beyond the top k)
+
+    def dense(self, dims: Optional[int] = None) -> np.ndarray:
+        """
+        Relative frequencies as a dense vector.
+
+        Args:
+            dims: Fold into this many buckets (a power of two no larger
+                than the profile's dims; default: the full dims). Folding
+                keeps the high bits of each bucket index, which is the
+                same as hashing into fewer buckets to begin with.
+
+        Returns:
+            float32 vector of length dims (count / total)
+        """
+        dims = dims or self.dims
+        if dims > self.dims or dims & (dims - 1):
+            raise ValueError(f"Cannot fold {self.dims} buckets into {dims}")
+        shift = (self.dims // dims).bit_length() - 1
+        vector = np.zeros(dims, dtype=np.float32)
+        np.add.at(vector, self.indices >> np.uint32(shift), self.counts.astype(np.float32))
+        return vector / self.total if self.total else vector
+
+
+class CharNgramProfiler:
+    """Builds hashed character n-gram profiles."""
+
+    def __init__(
+        self,
+        n_min: int = DEFAULT_N_MIN,
+        n_max: int = DEFAULT_N_MAX,
+        dims: int = DEFAULT_DIMS,
+        lowercase: bool = True,
+    ):
+        """
+        Initialize profiler.
+
+        Profiles are only comparable between profilers with the same
+        n range, dims and lowercase setting.
+
+        Args:
+            n_min: Shortest n-gram, in bytes
+            n_max: Longest n-gram, in bytes
+            dims: Hash buckets (a power of two)
+            lowercase: Lowercase text before counting
+        """
+        if not 1 <= n_min <= n_max:
+            raise ValueError(f"Invalid n-gram range: {n_min}..{n_max}")
+        if dims < 2 or dims & (dims - 1):
+            raise ValueError(f"dims must be a power of two: {dims}")
+        self._n_min = n_min
+        self._n_max = n_max
+        self._dims = dims
+        self._shift = np.uint64(64 - (dims.bit_length() - 1))
+        self._lowercase = lowercase
+
+    @property
+    def dims(self) -> int:
+        """Return the number of hash buckets."""
+        return self._dims
+
+    def _bytes(self, text: str) -> np.ndarray:
+        """uint8 view of the text with whitespace runs collapsed to one space."""
+        if self._lowercase:
+            text = text.lower()
+        data = " ".join(text.split()).encode("utf-8")
+        return np.frombuffer(data, dtype=np.uint8)
+
+    def _count_block(self, block: np.ndarray, starts: int, counts: np.ndarray) -> None:
+        """Add the n-grams starting at block[:starts] to counts."""
+        values = block.astype(np.uint64)
+        hashes = values.copy()
+        for n in range(1, self._n_max + 1):
+            if n > 1:
+                hashes = hashes[:-1] * _ROLL + values[n - 1 :]
+            if n < self._n_min:
+                continue
+            grams = hashes[: min(starts, len(hashes))]
+            salt = np.uint64(n * _SALT % (1 << 64))
+            buckets = ((grams + salt) * _GOLDEN) >> self._shift
+            counts += np.bincount(buckets.astype(np.intp), minlength=self._dims)
+
+    def counts(self, text: str) -> np.ndarray:
+        """
+        Hashed n-gram counts of a text.
+
+        Args:
+            text: Book text (normalized)
+
+        Returns:
+            int64 vector of length dims
+        """
+        data = self._bytes(text)
+        counts = np.zeros(self._dims, dtype=np.int64)
+        overlap = self._n_max - 1
+        for start in range(0, len(data), _BLOCK_BYTES):
+            # Include the next block's first bytes so n-grams spanning the
+            # boundary are counted (each exactly once, by its start)
+            block = data[start : start + _BLOCK_BYTES + overlap]
+            self._count_block(block, min(_BLOCK_BYTES, len(data) - start), counts)
+        return counts
+
+    def profile(self, text: str, top_k: int = DEFAULT_TOP_K) -> CharNgramProfile:
+        """
+        Sparse top-k profile of a text.
+
+        Args:
+            text: Book text (normalized)
+            top_k: Buckets to keep (0 keeps every non-empty bucket)
+
+        Returns:
+            CharNgramProfile
+        """
+        counts = self.counts(text)
+        indices = np.flatnonzero(counts)
+        if top_k and len(indices) > top_k:
+            keep = np.argpartition(counts[indices], -top_k)[-top_k:]
+            indices = np.sort(indices[keep])
+        return CharNgramProfile(
+            dims=self._dims,
+            indices=indices.astype(np.uint32),
+            counts=counts[indices].astype(np.uint32),
+            total=int(counts.sum()),
+        )
+
+
+def save_profiles(file_path: Path, profiles: Mapping[str, CharNgramProfile]) -> None:
+    """
+    Persist profiles to a single .npz file (CSR layout, no pickling).
+
+    Args:
+        file_path: Output path
+        profiles: Mapping of gutenberg_id to profile (all with the same dims)
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    items = list(profiles.values())
+    dims = {p.dims for p in items}
+    if len(dims) > 1:
+        raise ValueError(f"Profiles have different dims: {sorted(dims)}")
+    offsets = np.zeros(len(items) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(p.indices) for p in items])
+    with open(file_path, "wb") as f:
+        np.savez_compressed(
+            f,
+            ids=np.array(list(profiles), dtype=str),
+            dims=np.array(dims.pop() if dims else DEFAULT_DIMS),
+            offsets=offsets,
+            indices=np.concatenate([p.indices for p in items] or [np.empty(0, np.uint32)]),
+            counts=np.concatenate([p.counts for p in items] or [np.empty(0, np.uint32)]),
+            totals=np.array([p.total for p in items], dtype=np.int64),
+        )
+
+
+def load_profiles(file_path: Path) -> dict[str, CharNgramProfile]:
+    """
+    Load profiles written by save_profiles().
+
+    Args:
+        file_path: Path to .npz file
+
+    Returns:
+        Mapping of gutenberg_id to profile
+    """
+    with np.load(file_path, allow_pickle=False) as data:
+        dims = int(data["dims"])
+        offsets = data["offsets"]
+        indices, counts, totals = data["indices"], data["counts"], data["totals"]
+        return {
+            str(gutenberg_id): CharNgramProfile(
+                dims=dims,
+                indices=indices[offsets[row] : offsets[row + 1]],
+                counts=counts[offsets[row] : offsets[row + 1]],
+                total=int(totals[row]),
+            )
+            for row, gutenberg_id in enumerate(data["ids"])
+        }
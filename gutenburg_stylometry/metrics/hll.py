@@ -0,0 +1,190 @@
+"""
+HyperLogLog sketches for approximate vocabulary size.
+
+Exact type sets cannot be unioned across 60k books in memory, but
+HyperLogLog registers can: the union of two sketches is their
+element-wise maximum. With precision p = 12 (4096 one-byte registers) a
+sketch serializes to a few KB and estimates distinct counts with a
+relative standard error of about 1.04 / sqrt(4096) = 1.6%.
+
+Types are hashed with 64-bit BLAKE2b, which is stable across processes
+and Python versions (unlike hash()), so sketches built by different
+workers or runs can be merged.
+"""
+
+import base64
+import hashlib
+import math
+import zlib
+from typing import Iterable, Optional
+
+import numpy as np
+
+
+DEFAULT_PRECISION = 12
+
+
+def hash_tokens(tokens: Iterable[str]) -> np.ndarray:
+    """
+    Stable 64-bit hashes of tokens.
+
+    Args:
+        tokens: Tokens (pass unique types; duplicates only cost time)
+
+    Returns:
+        uint64 array of hashes
+    """
+    return np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest(), "little")
+            for t in tokens
+        ),
+        dtype=np.uint64,
+    )
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Exact bit length of each uint64 (binary search, no float rounding)."""
+    values = values.copy()
+    lengths = np.zeros(len(values), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = values >= np.uint64(1 << shift)
+        values[high] >>= np.uint64(shift)
+        lengths += high * shift
+    return lengths + (values > 0)
+
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch."""
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: Optional[np.ndarray] = None):
+        """
+        Initialize an empty sketch (or wrap existing registers).
+
+        Args:
+            precision: Index bits p; the sketch has 2**p registers
+            registers: uint8 registers to adopt (length 2**p)
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError(f"Precision must be between 4 and 18, got {precision}")
+        self._p = precision
+        self._m = 1 << precision
+        if registers is None:
+            registers = np.zeros(self._m, dtype=np.uint8)
+        elif len(registers) != self._m:
+            raise ValueError(f"Expected {self._m} registers, got {len(registers)}")
+        self._registers = registers
+
+    @property
+    def precision(self) -> int:
+        """Return the precision p."""
+        return self._p
+
+    @property
+    def registers(self) -> np.ndarray:
+        """Return the register array."""
+        return self._registers
+
+    @property
+    def relative_error(self) -> float:
+        """Relative standard error of estimate()."""
+        return 1.04 / math.sqrt(self._m)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        """
+        Add pre-computed 64-bit hashes.
+
+        Args:
+            hashes: uint64 array (see hash_tokens)
+        """
+        if not len(hashes):
+            return
+        width = 64 - self._p
+        index = (hashes >> np.uint64(width)).astype(np.int64)
+        rest = hashes & np.uint64((1 << width) - 1)
+        rank = (width - _bit_length(rest) + 1).astype(np.uint8)
+        np.maximum.at(self._registers, index, rank)
+
+    def add(self, tokens: Iterable[str]) -> None:
+        """
+        Add tokens to the sketch.
+
+        Args:
+            tokens: Tokens (a set of types is cheapest)
+        """
+        self.add_hashes(hash_tokens(tokens))
+
+    def update(self, other: "HyperLogLog") -> None:
+        """
+        Union another sketch into this one.
+
+        Args:
+            other: Sketch with the same precision
+        """
+        if other.precision != self._p:
+            raise ValueError(f"Cannot merge precision {other.precision} into {self._p}")
+        np.maximum(self._registers, other.registers, out=self._registers)
+
+    @classmethod
+    def union(
+        cls, sketches: Iterable["HyperLogLog"], precision: int = DEFAULT_PRECISION
+    ) -> "HyperLogLog":
+        """
+        Union of many sketches.
+
+        Args:
+            sketches: Sketches to merge
+            precision: Precision of the (possibly empty) result
+
+        Returns:
+            New sketch
+        """
+        result = cls(precision)
+        for sketch in sketches:
+            result.update(sketch)
+        return result
+
+    def estimate(self) -> float:
+        """
+        Estimated number of distinct items added.
+
+        Uses linear counting for small cardinalities; 64-bit hashes make a
+        large-range correction unnecessary.
+
+        Returns:
+            Cardinality estimate
+        """
+        m = self._m
+        alpha = 0.7213 / (1.0 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.ldexp(1.0, -self._registers.astype(np.int64))))
+        zeros = int(np.count_nonzero(self._registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return raw
+
+    def __len__(self) -> int:
+        return round(self.estimate())
+
+    # -------------------------------------------------------------------------
+    # Serialization
+    # -------------------------------------------------------------------------
+
+    def to_base64(self) -> str:
+        """Serialize as 'p:base64(zlib(registers))'."""
+        packed = base64.b64encode(zlib.compress(self._registers.tobytes(), 6)).decode("ascii")
+        return f"{self._p}:{packed}"
+
+    @classmethod
+    def from_base64(cls, data: str) -> "HyperLogLog":
+        """
+        Deserialize a sketch written by to_base64().
+
+        Args:
+            data: Serialized sketch
+
+        Returns:
+            HyperLogLog
+        """
+        precision, _, packed = data.partition(":")
+        raw = zlib.decompress(base64.b64decode(packed))
+        return cls(int(precision), np.frombuffer(raw, dtype=np.uint8).copy())
@@ -8,14 +8,41 @@ to total words (tokens). This module provides four variants:
 2. Root TTR: unique / sqrt(total) (normalizes for length)
 3. Log TTR: log(unique) / log(total) (normalizes for length)
 4. STTR: Mean TTR across fixed-size chunks (standardized)
+
+STTR depends on the chunk size, so a sweep over several sizes can be
+computed from one token list (see TTRCalculator.compute_sweep).
+
+Optionally, the type set is built incrementally so the vocabulary growth
+curve can be recorded at log-spaced checkpoints and fitted with Heaps'
+law (types = K * tokens^beta), and chapter token offsets found during
+tokenization yield per-chapter metrics without re-tokenizing.
+
+Author aggregation runs over ResultColumns, a struct-of-arrays view of
+per-book results. It can be filled from validated TTRResults or, for
+re-reading the pipeline's own JSONL output, straight from the parsed
+records without building a pydantic model per book.
 """
 
 import math
 import statistics
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
 
-from gutenburg_stylometry.models import TTRResult
+from gutenburg_stylometry.metrics.hll import DEFAULT_PRECISION, HyperLogLog
+from gutenburg_stylometry.models import ChapterMetrics, STTRSweep, TTRResult, VocabularyGrowth
+
+# (mean, std, chunk_count, delta_mean, delta_std, delta_min, delta_max)
+ChunkStats = tuple[
+    Optional[float],
+    Optional[float],
+    Optional[int],
+    Optional[float],
+    Optional[float],
+    Optional[float],
+    Optional[float],
+]
 
 
 @dataclass
@@ -24,6 +51,79 @@ class TTRConfig:
 
     sttr_chunk_size: int = 1000  # Words per chunk for STTR
     min_words_for_sttr: int = 2000  # Minimum words to compute STTR
+    vocabulary_sketch: bool = False  # Attach a HyperLogLog sketch of the types
+    sketch_precision: int = DEFAULT_PRECISION  # HyperLogLog index bits
+    sttr_sweep: tuple[int, ...] = ()  # Extra chunk sizes to compute STTR at (opt-in)
+    vocabulary_growth: bool = False  # Record the types-vs-tokens curve (opt-in)
+    growth_checkpoints: int = 32  # Log-spaced checkpoints on the growth curve
+    heaps_min_tokens: int = 100  # Checkpoints below this are left out of the Heaps fit
+    chapters: bool = False  # Segment books at chapter headings (opt-in)
+
+    def __post_init__(self):
+        _check_chunk_sizes([self.sttr_chunk_size, *self.sttr_sweep])
+
+
+def _check_chunk_sizes(sizes) -> None:
+    """
+    Reject chunk sizes that cannot split a book.
+
+    Args:
+        sizes: Chunk sizes in words
+
+    Raises:
+        ValueError: If any size is not a positive integer
+    """
+    for size in sizes:
+        if isinstance(size, bool) or not isinstance(size, (int, np.integer)) or size < 1:
+            raise ValueError(f"Chunk sizes must be positive integers, got {size!r}")
+
+
+def _previous_occurrence(tokens: list[str]) -> np.ndarray:
+    """
+    Index of each token's previous occurrence (-1 for the first).
+
+    Args:
+        tokens: List of tokens
+
+    Returns:
+        int64 array aligned with tokens
+    """
+    type_ids = {t: i for i, t in enumerate(dict.fromkeys(tokens))}
+    ids = np.fromiter(map(type_ids.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+    order = np.argsort(ids, kind="stable")
+    previous = np.full(len(tokens), -1, dtype=np.int64)
+    same_type = ids[order[1:]] == ids[order[:-1]]
+    previous[order[1:][same_type]] = order[:-1][same_type]
+    return previous
+
+
+def fit_heaps(
+    tokens: np.ndarray, types: np.ndarray, min_tokens: int = 100
+) -> tuple[Optional[float], Optional[float], Optional[float]]:
+    """
+    Least-squares fit of Heaps' law, log(types) = log(K) + beta * log(tokens).
+
+    Args:
+        tokens: Token counts (checkpoints)
+        types: Type counts at those checkpoints
+        min_tokens: Ignore checkpoints below this many tokens, where the
+            curve is dominated by the first few words
+
+    Returns:
+        Tuple of (K, beta, R^2); all None with fewer than two usable points
+    """
+    keep = tokens >= min_tokens
+    if np.count_nonzero(keep) < 2:
+        return None, None, None
+    x = np.log(tokens[keep])
+    y = np.log(types[keep])
+    design = np.column_stack([np.ones_like(x), x])
+    (log_k, beta), *_ = np.linalg.lstsq(design, y, rcond=None)
+
+    residual = y - (log_k + beta * x)
+    total = float(np.sum((y - y.mean()) ** 2))
+    r2 = 1.0 - float(np.sum(residual**2)) / total if total > 0 else 1.0
+    return float(np.exp(log_k)), float(beta), r2
 
 
 class TTRCalculator:
@@ -42,12 +142,20 @@ class TTRCalculator:
         """
         self._config = config or TTRConfig()
 
+    @property
+    def config(self) -> TTRConfig:
+        """Return the configuration."""
+        return self._config
+
     def compute(
         self,
         tokens: list[str],
         gutenberg_id: str,
         title: str,
         author: str,
+        chapter_offsets: Optional[list[int]] = None,
+        chapter_headings: Optional[list[str]] = None,
+        chapter_ends: Optional[list[int]] = None,
     ) -> TTRResult:
         """
         Compute all TTR variants for a token list.
@@ -57,6 +165,9 @@ class TTRCalculator:
             gutenberg_id: Gutenberg catalog ID
             title: Book title
             author: Author identifier
+            chapter_offsets: Token index where each chapter starts, if segmented
+            chapter_headings: Heading of each chapter (aligned with chapter_offsets)
+            chapter_ends: Token index where each chapter ends (see compute_chapters)
 
         Returns:
             TTRResult with all computed metrics
@@ -82,8 +193,13 @@ class TTRCalculator:
                 delta_max=None,
             )
 
-        # Count unique words
-        unique_words = len(set(tokens))
+        # Count unique words (recording the growth curve on the way, if enabled)
+        growth = None
+        if self._config.vocabulary_growth:
+            types, growth = self._grow_vocabulary(tokens)
+        else:
+            types = set(tokens)
+        unique_words = len(types)
 
         # Raw TTR
         ttr = unique_words / total_words
@@ -113,11 +229,151 @@ class TTRCalculator:
             delta_std=round(delta_std, 6) if delta_std is not None else None,
             delta_min=round(delta_min, 6) if delta_min is not None else None,
             delta_max=round(delta_max, 6) if delta_max is not None else None,
+            vocabulary_sketch=self._sketch(types) if self._config.vocabulary_sketch else None,
+            sttr_sweep=self.compute_sweep(tokens) if self._config.sttr_sweep else None,
+            vocabulary_growth=growth,
+            chapters=(
+                self.compute_chapters(tokens, chapter_offsets, chapter_headings, chapter_ends)
+                if chapter_offsets
+                else None
+            ),
         )
 
-    def _compute_sttr(
-        self, tokens: list[str]
-    ) -> tuple[Optional[float], Optional[float], Optional[int], Optional[float], Optional[float], Optional[float], Optional[float]]:
+    def compute_chapters(
+        self,
+        tokens: list[str],
+        offsets: list[int],
+        headings: Optional[list[str]] = None,
+        ends: Optional[list[int]] = None,
+    ) -> ChapterMetrics:
+        """
+        Compute per-chapter metrics from chapter token offsets.
+
+        Args:
+            tokens: The book's tokens
+            offsets: Ascending token index where each chapter starts; the
+                last chapter runs to the end of the book
+            headings: Heading of each chapter (default: empty strings)
+            ends: Token index where each chapter ends (default: the next
+                chapter's offset, so anything between chapters is included)
+
+        Returns:
+            ChapterMetrics with one entry per chapter
+        """
+        if ends is None:
+            ends = [*offsets[1:], len(tokens)]
+        sizes: list[int] = []
+        types: list[int] = []
+        sttrs: list[Optional[float]] = []
+        for start, end in zip(offsets, ends):
+            chapter = tokens[start:end]
+            sizes.append(len(chapter))
+            types.append(len(set(chapter)))
+            sttr = self._compute_sttr(chapter)[0]
+            sttrs.append(round(sttr, 6) if sttr is not None else None)
+
+        return ChapterMetrics(
+            headings=list(headings) if headings is not None else [""] * len(offsets),
+            token_offsets=list(offsets),
+            tokens=sizes,
+            types=types,
+            ttr=[round(t / n, 6) if n else 0.0 for t, n in zip(types, sizes)],
+            sttr=sttrs,
+        )
+
+    def _grow_vocabulary(self, tokens: list[str]) -> tuple[set[str], VocabularyGrowth]:
+        """
+        Build the type set in segments, recording its size at each checkpoint.
+
+        Each segment is added with set.update, so this costs the same as
+        set(tokens) plus one len() per checkpoint.
+
+        Args:
+            tokens: List of tokens (non-empty)
+
+        Returns:
+            Tuple of (type set, VocabularyGrowth)
+        """
+        checkpoints = np.unique(
+            np.geomspace(1, len(tokens), self._config.growth_checkpoints).round().astype(np.int64)
+        ).tolist()
+        types: set[str] = set()
+        type_counts: list[int] = []
+        start = 0
+        for end in checkpoints:
+            types.update(tokens[start:end])
+            type_counts.append(len(types))
+            start = end
+
+        k, beta, r2 = fit_heaps(
+            np.asarray(checkpoints), np.asarray(type_counts), self._config.heaps_min_tokens
+        )
+        growth = VocabularyGrowth(
+            tokens=checkpoints,
+            types=type_counts,
+            heaps_k=round(k, 6) if k is not None else None,
+            heaps_beta=round(beta, 6) if beta is not None else None,
+            heaps_r2=round(r2, 6) if r2 is not None else None,
+        )
+        return types, growth
+
+    def _sketch(self, types: set[str]) -> str:
+        """Serialized HyperLogLog sketch of a book's types."""
+        sketch = HyperLogLog(self._config.sketch_precision)
+        sketch.add(types)
+        return sketch.to_base64()
+
+    def compute_sweep(
+        self, tokens: list[str], chunk_sizes: Optional[list[int]] = None
+    ) -> STTRSweep:
+        """
+        Compute STTR and delta metrics at several chunk sizes in one pass.
+
+        Each token's previous occurrence is found once; a token is new to
+        its chunk exactly when that occurrence precedes the chunk start.
+        Every chunk size then reuses the same array, so the per-size work
+        is a vectorized count rather than building a set per chunk.
+
+        Args:
+            tokens: List of tokens
+            chunk_sizes: Chunk sizes (default: TTRConfig.sttr_sweep)
+
+        Returns:
+            STTRSweep with one entry per chunk size, ascending
+
+        Raises:
+            ValueError: If a chunk size is not a positive integer
+        """
+        sizes = sorted(set(chunk_sizes or self._config.sttr_sweep))
+        _check_chunk_sizes(sizes)
+        total_words = len(tokens)
+        previous = _previous_occurrence(tokens)
+        positions = np.arange(total_words)
+
+        stats: list[ChunkStats] = []
+        for size in sizes:
+            n_chunks = total_words // size
+            if total_words < self._config.min_words_for_sttr or n_chunks == 0:
+                stats.append((None, None, 0, None, None, None, None))
+                continue
+            end = n_chunks * size
+            first_in_chunk = previous[:end] < positions[:end] - positions[:end] % size
+            chunk_unique = first_in_chunk.reshape(n_chunks, size).sum(axis=1)
+            stats.append(self._chunk_stats([int(u) / size for u in chunk_unique]))
+
+        def rounded(value: Optional[float]) -> Optional[float]:
+            return round(value, 6) if value is not None else None
+
+        return STTRSweep(
+            chunk_sizes=sizes,
+            sttr=[rounded(s[0]) for s in stats],
+            sttr_std=[rounded(s[1]) for s in stats],
+            chunk_count=[s[2] or 0 for s in stats],
+            delta_mean=[rounded(s[3]) for s in stats],
+            delta_std=[rounded(s[4]) for s in stats],
+        )
+
+    def _compute_sttr(self, tokens: list[str]) -> ChunkStats:
         """
         Compute Standardized TTR and delta metrics using fixed-size chunks.
 
@@ -148,6 +404,19 @@ class TTRCalculator:
             chunk_ttr = chunk_unique / chunk_size
             chunk_ttrs.append(chunk_ttr)
 
+        return self._chunk_stats(chunk_ttrs)
+
+    @staticmethod
+    def _chunk_stats(chunk_ttrs: list[float]) -> ChunkStats:
+        """
+        Mean, spread and delta metrics of per-chunk TTRs.
+
+        Args:
+            chunk_ttrs: TTR of each chunk, in text order
+
+        Returns:
+            Tuple of (mean_sttr, std_sttr, chunk_count, delta_mean, delta_std, delta_min, delta_max)
+        """
         if not chunk_ttrs:
             return None, None, None, None, None, None, None
 
@@ -167,6 +436,114 @@ class TTRCalculator:
         return mean_sttr, std_sttr, len(chunk_ttrs), delta_mean, delta_std, delta_min, delta_max
 
 
+class ResultColumns(NamedTuple):
+    """
+    Struct-of-arrays view of the per-book results aggregation needs.
+
+    Optional metrics are NaN where a book has none. Sketches are kept
+    only for books that carry one, with those books' word counts.
+    """
+
+    gutenberg_ids: list[str]
+    total_words: np.ndarray  # int64
+    ttr: np.ndarray
+    root_ttr: np.ndarray
+    log_ttr: np.ndarray
+    sttr: np.ndarray
+    delta_std: np.ndarray
+    heaps_beta: np.ndarray
+    sketches: list[str]
+    sketched_words: list[int]
+
+    def __len__(self) -> int:
+        return len(self.gutenberg_ids)
+
+    @classmethod
+    def from_results(cls, results: Iterable[TTRResult]) -> "ResultColumns":
+        """Columns of validated results."""
+        return cls.from_records(
+            {
+                "gutenberg_id": r.gutenberg_id,
+                "total_words": r.total_words,
+                "ttr": r.ttr,
+                "root_ttr": r.root_ttr,
+                "log_ttr": r.log_ttr,
+                "sttr": r.sttr,
+                "delta_std": r.delta_std,
+                "heaps_beta": r.vocabulary_growth.heaps_beta if r.vocabulary_growth else None,
+                "vocabulary_sketch": r.vocabulary_sketch,
+            }
+            for r in results
+        )
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "ResultColumns":
+        """
+        Columns of TTRResult-shaped dicts, trusted without validation.
+
+        Meant for re-reading the pipeline's own output. Every record is a
+        row, even when IDs repeat (files without an ID in their name all
+        share "0"); dropping duplicates written by resumed runs is up to
+        the caller. A flat "heaps_beta" key is accepted in place of the
+        nested vocabulary_growth record.
+
+        Args:
+            records: Parsed per-book JSON objects
+
+        Returns:
+            ResultColumns in record order
+        """
+        ids: list[str] = []
+        rows: list[tuple] = []
+        sketches: list[str] = []
+        sketched_words: list[int] = []
+        for record in records:
+            growth = record.get("vocabulary_growth")
+            heaps_beta = growth.get("heaps_beta") if growth else record.get("heaps_beta")
+            ids.append(record["gutenberg_id"])
+            rows.append((
+                record["total_words"],
+                record["ttr"],
+                record["root_ttr"],
+                record["log_ttr"],
+                record.get("sttr"),
+                record.get("delta_std"),
+                heaps_beta,
+            ))
+            if record.get("vocabulary_sketch"):
+                sketches.append(record["vocabulary_sketch"])
+                sketched_words.append(record["total_words"])
+
+        # None becomes NaN in a float array
+        values = np.array(rows, dtype=np.float64).reshape(len(rows), 7)
+        return cls(
+            gutenberg_ids=ids,
+            total_words=values[:, 0].astype(np.int64),
+            ttr=values[:, 1],
+            root_ttr=values[:, 2],
+            log_ttr=values[:, 3],
+            sttr=values[:, 4],
+            delta_std=values[:, 5],
+            heaps_beta=values[:, 6],
+            sketches=sketches,
+            sketched_words=sketched_words,
+        )
+
+
+def _present(values: np.ndarray) -> np.ndarray:
+    """Values of an optional-metric column, without the missing ones."""
+    return values[~np.isnan(values)]
+
+
+def _mean(values: np.ndarray, digits: int = 6) -> Optional[float]:
+    return round(float(values.mean()), digits) if len(values) else None
+
+
+def _stdev(values: np.ndarray, digits: int = 6) -> Optional[float]:
+    """Sample standard deviation (None for fewer than two values)."""
+    return round(float(values.std(ddof=1)), digits) if len(values) > 1 else None
+
+
 class TTRAggregator:
     """Aggregates per-book TTR results into author-level statistics."""
 
@@ -181,29 +558,115 @@ class TTRAggregator:
         Returns:
             Dictionary with aggregate statistics
         """
-        if not results:
-            raise ValueError("Cannot aggregate empty results list")
+        return self.aggregate_columns(ResultColumns.from_results(results), author)
+
+    def aggregate_columns(self, columns: ResultColumns, author: str) -> dict:
+        """
+        Compute aggregate statistics from columnar book results.
+
+        Args:
+            columns: Per-book results as columns
+            author: Author identifier
 
-        ttrs = [r.ttr for r in results]
-        root_ttrs = [r.root_ttr for r in results]
-        log_ttrs = [r.log_ttr for r in results]
-        sttrs = [r.sttr for r in results if r.sttr is not None]
-        delta_stds = [r.delta_std for r in results if r.delta_std is not None]
+        Returns:
+            Dictionary with aggregate statistics (as aggregate())
+        """
+        n = len(columns)
+        if not n:
+            raise ValueError("Cannot aggregate empty results list")
 
+        sttrs = _present(columns.sttr)
         return {
             "author": author,
-            "book_count": len(results),
-            "total_words": sum(r.total_words for r in results),
-            "ttr_mean": round(statistics.mean(ttrs), 6),
-            "ttr_std": round(statistics.stdev(ttrs), 6) if len(ttrs) > 1 else 0.0,
-            "ttr_min": round(min(ttrs), 6),
-            "ttr_max": round(max(ttrs), 6),
-            "ttr_median": round(statistics.median(ttrs), 6),
-            "root_ttr_mean": round(statistics.mean(root_ttrs), 4),
-            "root_ttr_std": round(statistics.stdev(root_ttrs), 4) if len(root_ttrs) > 1 else 0.0,
-            "log_ttr_mean": round(statistics.mean(log_ttrs), 6),
-            "log_ttr_std": round(statistics.stdev(log_ttrs), 6) if len(log_ttrs) > 1 else 0.0,
-            "sttr_mean": round(statistics.mean(sttrs), 6) if sttrs else None,
-            "sttr_std": round(statistics.stdev(sttrs), 6) if len(sttrs) > 1 else None,
-            "delta_std_mean": round(statistics.mean(delta_stds), 6) if delta_stds else None,
+            "book_count": n,
+            "total_words": int(columns.total_words.sum()),
+            "ttr_mean": _mean(columns.ttr),
+            "ttr_std": _stdev(columns.ttr) if n > 1 else 0.0,
+            "ttr_min": round(float(columns.ttr.min()), 6),
+            "ttr_max": round(float(columns.ttr.max()), 6),
+            "ttr_median": round(float(np.median(columns.ttr)), 6),
+            "root_ttr_mean": _mean(columns.root_ttr, 4),
+            "root_ttr_std": _stdev(columns.root_ttr, 4) if n > 1 else 0.0,
+            "log_ttr_mean": _mean(columns.log_ttr),
+            "log_ttr_std": _stdev(columns.log_ttr) if n > 1 else 0.0,
+            "sttr_mean": _mean(sttrs),
+            "sttr_std": _stdev(sttrs),
+            "delta_std_mean": _mean(_present(columns.delta_std)),
+            "heaps_beta_mean": _mean(_present(columns.heaps_beta)),
+            **self.sketch_vocabulary(columns.sketches, columns.sketched_words),
+        }
+
+    @staticmethod
+    def vocabulary(results: list[TTRResult]) -> dict:
+        """
+        Approximate vocabulary across books from their HyperLogLog sketches.
+
+        Only results that carry a vocabulary_sketch are included.
+
+        Args:
+            results: Per-book TTR results
+
+        Returns:
+            Dict with vocabulary_books, vocabulary_estimate, vocabulary_error
+            (relative standard error) and author_ttr (estimate / words);
+            values are None when no result has a sketch
+        """
+        sketched = [r for r in results if r.vocabulary_sketch]
+        return TTRAggregator.sketch_vocabulary(
+            [r.vocabulary_sketch for r in sketched], [r.total_words for r in sketched]
+        )
+
+    @staticmethod
+    def sketch_vocabulary(sketches: list[str], words: list[int]) -> dict:
+        """
+        Approximate vocabulary from serialized sketches (see vocabulary()).
+
+        Args:
+            sketches: Base64 HyperLogLog sketches, one per book
+            words: Total words of each sketched book
+
+        Returns:
+            Dict as returned by vocabulary()
+        """
+        union = TTRAggregator._union(sketches)
+        if union is None:
+            return {
+                "vocabulary_books": 0,
+                "vocabulary_estimate": None,
+                "vocabulary_error": None,
+                "author_ttr": None,
+            }
+
+        estimate = round(union.estimate())
+        total_words = sum(words)
+        return {
+            "vocabulary_books": len(sketches),
+            "vocabulary_estimate": estimate,
+            "vocabulary_error": round(union.relative_error, 6),
+            "author_ttr": round(estimate / total_words, 6) if total_words else None,
         }
+
+    @staticmethod
+    def union_sketch(results: list[TTRResult]) -> Optional[HyperLogLog]:
+        """
+        Union of the vocabulary sketches carried by results.
+
+        Args:
+            results: Per-book TTR results
+
+        Returns:
+            Merged sketch, or None if no result has one
+        """
+        return TTRAggregator._union(r.vocabulary_sketch for r in results if r.vocabulary_sketch)
+
+    @staticmethod
+    def _union(sketches: Iterable[str]) -> Optional[HyperLogLog]:
+        """Merge base64 sketches (None if there are none)."""
+        union: Optional[HyperLogLog] = None
+        for encoded in sketches:
+            sketch = HyperLogLog.from_base64(encoded)
+            if union is None:
+                union = sketch
+            else:
+                union.update(sketch)
+        return union
@@ -0,0 +1,427 @@
+"""
+Word n-gram and collocation counting with bounded memory.
+
+A Counter of tuple n-grams over the corpus grows with every distinct
+bigram and trigram, tens of millions of Python objects. Counting here
+works in two layers:
+
+1. Per book, exactly. Tokens become integer IDs (the book's types in
+   first-seen order), bigram and trigram IDs are packed into 64-bit keys,
+   and np.unique counts them in one sort.
+2. Per author or corpus, approximately. Each n-gram is keyed by a stable
+   64-bit hash of its words, and its count is added to a count-min sketch
+   (fixed width x depth counters). The most frequent n-grams are tracked
+   as heavy-hitter candidates: after each book the candidates and the
+   book's n-grams are re-estimated from the sketch, and only the top
+   capacity are kept with their text.
+
+Estimates never undercount, and overcount by at most e/width of the
+total with probability 1 - exp(-depth). The sketch and candidates are
+fixed size per counter. Counters built in different processes merge
+exactly as if one had seen every book: the sketches are added element
+wise and the candidate sets re-ranked. This holds because the keys are
+stable hashes of the words, not process-local IDs.
+
+Collocations rank the bigram candidates by pointwise mutual information
+against unigram counts kept in another sketch.
+"""
+
+import math
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+
+from gutenburg_stylometry.metrics.hll import hash_tokens
+
+
+DEFAULT_ORDERS = (2, 3)
+DEFAULT_WIDTH = 1 << 18  # Counters per sketch row (a power of two)
+DEFAULT_DEPTH = 4  # Sketch rows (independent hashes)
+DEFAULT_CAPACITY = 5000  # Heavy-hitter candidates kept per order
+
+_ROLL = np.uint64(0x100000001B3)  # Combines word hashes into n-gram keys
+_ID_BITS = {2: 32, 3: 21}  # Bits per word ID in a packed 64-bit key
+
+
+class NgramCount(NamedTuple):
+    """An n-gram with its (estimated) count."""
+
+    ngram: str  # Words joined by single spaces
+    count: int
+
+
+class Collocation(NamedTuple):
+    """A bigram ranked by pointwise mutual information."""
+
+    ngram: str
+    count: int
+    pmi: float  # log2(P(xy) / (P(x) P(y)))
+
+
+def pack_ngrams(ids: np.ndarray, n: int) -> np.ndarray:
+    """
+    Pack consecutive word IDs into one uint64 key per n-gram.
+
+    Args:
+        ids: Word IDs in text order (each below 2^(64 // n))
+        n: N-gram order (2 or 3)
+
+    Returns:
+        uint64 array of len(ids) - n + 1 keys
+    """
+    bits = _ID_BITS[n]
+    if len(ids) < n:
+        return np.empty(0, dtype=np.uint64)
+    if len(ids) and int(ids.max()) >> bits:
+        raise ValueError(f"Word IDs exceed {bits} bits for {n}-grams")
+    ids = ids.astype(np.uint64)
+    keys = ids[: len(ids) - n + 1].copy()
+    for j in range(1, n):
+        keys = (keys << np.uint64(bits)) | ids[j : len(ids) - n + 1 + j]
+    return keys
+
+
+def unpack_ngrams(keys: np.ndarray, n: int) -> np.ndarray:
+    """
+    Inverse of pack_ngrams.
+
+    Returns:
+        (len(keys) x n) int64 array of word IDs
+    """
+    bits = np.uint64(_ID_BITS[n])
+    mask = np.uint64((1 << _ID_BITS[n]) - 1)
+    columns = [(keys >> (bits * np.uint64(n - 1 - j))) & mask for j in range(n)]
+    return np.stack(columns, axis=1).astype(np.int64)
+
+
+class CountMinSketch:
+    """Fixed-size, mergeable frequency sketch over uint64 keys."""
+
+    def __init__(
+        self,
+        width: int = DEFAULT_WIDTH,
+        depth: int = DEFAULT_DEPTH,
+        seed: int = 1,
+        table: Optional[np.ndarray] = None,
+    ):
+        """
+        Initialize sketch.
+
+        Sketches only merge with sketches of the same width, depth and seed.
+
+        Args:
+            width: Counters per row (a power of two)
+            depth: Rows
+            seed: Seed for the row hash parameters
+            table: Existing (depth x width) counters, e.g. when loading
+        """
+        if width < 2 or width & (width - 1):
+            raise ValueError(f"width must be a power of two: {width}")
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing per row: ((a * key + b) mod 2^64) >> (64 - log2 width)
+        self._a = (rng.integers(1, 2**63, depth, dtype=np.uint64) | np.uint64(1))[:, None]
+        self._b = rng.integers(0, 2**63, depth, dtype=np.uint64)[:, None]
+        self._shift = np.uint64(64 - (width.bit_length() - 1))
+        self._rows = np.arange(depth)[:, None]
+        self._seed = seed
+        self.table = table if table is not None else np.zeros((depth, width), dtype=np.int64)
+
+    @property
+    def width(self) -> int:
+        """Return counters per row."""
+        return self.table.shape[1]
+
+    @property
+    def depth(self) -> int:
+        """Return the number of rows."""
+        return self.table.shape[0]
+
+    @property
+    def seed(self) -> int:
+        """Return the hash seed."""
+        return self._seed
+
+    def _cells(self, keys: np.ndarray) -> np.ndarray:
+        return ((self._a * keys[None, :] + self._b) >> self._shift).astype(np.intp)
+
+    def add(self, keys: np.ndarray, counts: np.ndarray) -> None:
+        """Add counts for keys (keys may repeat)."""
+        cells = self._cells(keys)
+        np.add.at(self.table, (np.broadcast_to(self._rows, cells.shape), cells), counts)
+
+    def estimate(self, keys: np.ndarray) -> np.ndarray:
+        """Estimated count of each key (never below the true count)."""
+        if not len(keys):
+            return np.empty(0, dtype=np.int64)
+        return self.table[self._rows, self._cells(keys)].min(axis=0)
+
+    def merge(self, other: "CountMinSketch") -> None:
+        """Add another sketch's counts into this one."""
+        if self.table.shape != other.table.shape or self._seed != other._seed:
+            raise ValueError("Cannot merge sketches with different shapes or seeds")
+        self.table += other.table
+
+
+class NgramSketch:
+    """Count-min sketch plus heavy-hitter candidates for one n-gram order."""
+
+    def __init__(
+        self,
+        width: int = DEFAULT_WIDTH,
+        depth: int = DEFAULT_DEPTH,
+        capacity: int = DEFAULT_CAPACITY,
+        seed: int = 1,
+    ):
+        """
+        Initialize sketch.
+
+        Args:
+            width: Counters per sketch row
+            depth: Sketch rows
+            capacity: Heavy-hitter candidates kept
+            seed: Seed for the sketch hashes
+        """
+        self.sketch = CountMinSketch(width, depth, seed)
+        self.capacity = capacity
+        self.total = 0
+        self.keys = np.empty(0, dtype=np.uint64)  # Candidate keys, ascending
+        self.labels: dict[int, str] = {}  # Candidate key -> n-gram text
+
+    def add(
+        self,
+        keys: np.ndarray,
+        counts: np.ndarray,
+        label: Callable[[np.ndarray], list[str]],
+    ) -> None:
+        """
+        Add one batch of distinct n-grams.
+
+        Args:
+            keys: Distinct stable n-gram keys
+            counts: Count of each key
+            label: Text of the keys at given positions (only called for
+                keys that become candidates)
+        """
+        self.sketch.add(keys, counts)
+        self.total += int(counts.sum())
+        self._rerank(keys, label)
+
+    def merge(self, other: "NgramSketch") -> None:
+        """Fold in another sketch of the same order and parameters."""
+        self.sketch.merge(other.sketch)
+        self.total += other.total
+        self._rerank(
+            other.keys, lambda positions: [other.labels[k] for k in other.keys[positions].tolist()]
+        )
+
+    def _rerank(self, new_keys: np.ndarray, label: Callable[[np.ndarray], list[str]]) -> None:
+        """Keep the capacity candidates with the highest estimates."""
+        keys = np.union1d(self.keys, new_keys)
+        if len(keys) > self.capacity:
+            estimates = self.sketch.estimate(keys)
+            keys = np.sort(keys[np.argpartition(estimates, -self.capacity)[-self.capacity :]])
+
+        # Label the new arrivals, and forget the candidates that dropped out
+        arrivals = np.flatnonzero(np.isin(new_keys, keys) & ~np.isin(new_keys, self.keys))
+        self.labels.update(zip(new_keys[arrivals].tolist(), label(arrivals)))
+        if len(self.labels) > len(keys):
+            kept = set(keys.tolist())
+            self.labels = {k: v for k, v in self.labels.items() if k in kept}
+        self.keys = keys
+
+    def top(self, k: int = 50) -> list[NgramCount]:
+        """
+        The most frequent n-grams.
+
+        Args:
+            k: N-grams to return
+
+        Returns:
+            NgramCounts by estimated count, highest first
+        """
+        estimates = self.sketch.estimate(self.keys)
+        order = np.lexsort((self.keys, -estimates))[:k]
+        return [NgramCount(self.labels[int(self.keys[i])], int(estimates[i])) for i in order]
+
+
+class WordNgramCounter:
+    """
+    Streaming, mergeable word n-gram counts for a set of books.
+
+    Feed each book's tokens to add_tokens(); read top() and
+    collocations() at any point; merge() counters of other books.
+    """
+
+    def __init__(
+        self,
+        orders: tuple[int, ...] = DEFAULT_ORDERS,
+        width: int = DEFAULT_WIDTH,
+        depth: int = DEFAULT_DEPTH,
+        capacity: int = DEFAULT_CAPACITY,
+        seed: int = 1,
+    ):
+        """
+        Initialize counter.
+
+        Args:
+            orders: N-gram orders to count (2 and/or 3)
+            width: Counters per sketch row
+            depth: Sketch rows
+            capacity: Heavy-hitter candidates kept per order
+            seed: Seed for the sketch hashes
+        """
+        unsupported = set(orders) - set(_ID_BITS)
+        if unsupported:
+            raise ValueError(f"Unsupported n-gram orders: {sorted(unsupported)}")
+        self.orders = tuple(sorted(orders))
+        self.unigrams = CountMinSketch(width, depth, seed)
+        self.unigram_total = 0
+        self.ngrams = {n: NgramSketch(width, depth, capacity, seed) for n in self.orders}
+        self.books = 0
+
+    def add_tokens(self, tokens: list[str]) -> None:
+        """
+        Count one book's n-grams.
+
+        Args:
+            tokens: The book's tokens (VictorianTokenizer output)
+        """
+        if not tokens:
+            return
+        type_ids = {t: i for i, t in enumerate(dict.fromkeys(tokens))}
+        types = list(type_ids)
+        ids = np.fromiter(map(type_ids.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        type_hashes = hash_tokens(types)
+
+        self.unigrams.add(type_hashes, np.bincount(ids, minlength=len(types)))
+        self.unigram_total += len(tokens)
+        self.books += 1
+
+        for n, ngram_sketch in self.ngrams.items():
+            keys, counts = np.unique(pack_ngrams(ids, n), return_counts=True)
+            if not len(keys):
+                continue
+            grams = unpack_ngrams(keys, n)
+            stable = type_hashes[grams[:, 0]]
+            for j in range(1, n):
+                stable = stable * _ROLL + type_hashes[grams[:, j]]
+            ngram_sketch.add(
+                stable,
+                counts,
+                lambda positions, grams=grams: [
+                    " ".join(types[i] for i in row) for row in grams[positions].tolist()
+                ],
+            )
+
+    def merge(self, other: "WordNgramCounter") -> None:
+        """
+        Add another counter's books to this one.
+
+        Raises:
+            ValueError: If the counters' orders or sketch parameters differ
+        """
+        if other.orders != self.orders:
+            raise ValueError("Cannot merge counters with different n-gram orders")
+        self.unigrams.merge(other.unigrams)
+        self.unigram_total += other.unigram_total
+        self.books += other.books
+        for n, ngram_sketch in self.ngrams.items():
+            ngram_sketch.merge(other.ngrams[n])
+
+    def top(self, n: int = 2, k: int = 50) -> list[NgramCount]:
+        """Most frequent n-grams of one order (see NgramSketch.top)."""
+        return self.ngrams[n].top(k)
+
+    def collocations(self, k: int = 50, min_count: int = 5) -> list[Collocation]:
+        """
+        Bigram candidates with the highest pointwise mutual information.
+
+        PMI favours rare pairs, so candidates seen fewer than min_count
+        times are left out.
+
+        Args:
+            k: Collocations to return
+            min_count: Minimum estimated bigram count
+
+        Returns:
+            Collocations, highest PMI first
+        """
+        if 2 not in self.ngrams:
+            raise ValueError("Collocations need bigram counts (order 2)")
+        bigrams = self.ngrams[2]
+        candidates = [c for c in bigrams.top(bigrams.capacity) if c.count >= min_count]
+        if not candidates:
+            return []
+
+        words = hash_tokens(w for c in candidates for w in c.ngram.split(" "))
+        unigram_counts = self.unigrams.estimate(words).reshape(-1, 2)
+        scale = self.unigram_total**2 / bigrams.total
+        collocations = [
+            Collocation(c.ngram, c.count, round(math.log2(c.count * scale / (x * y)), 6))
+            for c, (x, y) in zip(candidates, unigram_counts.tolist())
+        ]
+        collocations.sort(key=lambda c: (-c.pmi, c.ngram))
+        return collocations[:k]
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def save(self, file_path: Path) -> None:
+        """
+        Persist the counter to a single .npz file.
+
+        Args:
+            file_path: Output path
+        """
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            "orders": np.array(self.orders),
+            "seed": np.array(self.unigrams.seed),
+            "books": np.array(self.books),
+            "capacity": np.array(next(iter(self.ngrams.values())).capacity),
+            "unigrams": self.unigrams.table,
+            "unigram_total": np.array(self.unigram_total),
+        }
+        for n, ngram_sketch in self.ngrams.items():
+            arrays[f"sketch_{n}"] = ngram_sketch.sketch.table
+            arrays[f"total_{n}"] = np.array(ngram_sketch.total)
+            arrays[f"keys_{n}"] = ngram_sketch.keys
+            arrays[f"labels_{n}"] = np.array(
+                [ngram_sketch.labels[int(k)] for k in ngram_sketch.keys], dtype=str
+            )
+        with open(file_path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+
+    @classmethod
+    def load(cls, file_path: Path) -> "WordNgramCounter":
+        """
+        Load a counter written by save().
+
+        Args:
+            file_path: Path to .npz file
+
+        Returns:
+            WordNgramCounter that can keep counting and merging
+        """
+        with np.load(file_path, allow_pickle=False) as data:
+            depth, width = data["unigrams"].shape
+            counter = cls(
+                orders=tuple(int(n) for n in data["orders"]),
+                width=width,
+                depth=depth,
+                capacity=int(data["capacity"]),
+                seed=int(data["seed"]),
+            )
+            counter.books = int(data["books"])
+            counter.unigrams.table = data["unigrams"]
+            counter.unigram_total = int(data["unigram_total"])
+            for n, ngram_sketch in counter.ngrams.items():
+                ngram_sketch.sketch.table = data[f"sketch_{n}"]
+                ngram_sketch.total = int(data[f"total_{n}"])
+                ngram_sketch.keys = data[f"keys_{n}"]
+                ngram_sketch.labels = dict(
+                    zip(ngram_sketch.keys.tolist(), data[f"labels_{n}"].tolist())
+                )
+        return counter
@@ -33,6 +33,66 @@ class BookMetadata(BaseModel):
 # =============================================================================
 
 
+class STTRSweep(BaseModel):
+    """
+    STTR at several chunk sizes for one book.
+
+    Stored column-wise (one list per statistic, aligned with chunk_sizes)
+    to keep per-book records compact. Entries are None for chunk sizes the
+    book is too short for.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    chunk_sizes: list[int] = Field(..., description="Chunk sizes, ascending")
+    sttr: list[Optional[float]] = Field(..., description="Mean chunk TTR per chunk size")
+    sttr_std: list[Optional[float]] = Field(..., description="Chunk TTR std dev per chunk size")
+    chunk_count: list[int] = Field(..., description="Full chunks per chunk size")
+    delta_mean: list[Optional[float]] = Field(..., description="Mean chunk-to-chunk delta")
+    delta_std: list[Optional[float]] = Field(..., description="Std dev of chunk-to-chunk deltas")
+
+
+class VocabularyGrowth(BaseModel):
+    """
+    Types-vs-tokens curve for one book, with its Heaps' law fit.
+
+    The curve is sampled at log-spaced token counts; Heaps' law models it
+    as types = K * tokens^beta.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    tokens: list[int] = Field(..., description="Token counts at each checkpoint")
+    types: list[int] = Field(..., description="Distinct types seen by each checkpoint")
+    heaps_k: Optional[float] = Field(None, gt=0.0, description="Heaps' law coefficient K")
+    heaps_beta: Optional[float] = Field(None, description="Heaps' law exponent beta")
+    heaps_r2: Optional[float] = Field(None, description="R^2 of the log-log fit")
+
+
+class ChapterMetrics(BaseModel):
+    """
+    Per-chapter TTR for one book, stored column-wise.
+
+    Each list has one entry per chapter heading, in text order. A chapter
+    runs from just after its heading line to the next heading; the heading
+    words themselves, and text before the first heading, belong to no
+    chapter (they still count toward the book's totals).
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    headings: list[str] = Field(..., description="Heading line of each chapter")
+    token_offsets: list[int] = Field(
+        ..., description="Index of each chapter's first token after its heading"
+    )
+    tokens: list[int] = Field(..., description="Tokens per chapter")
+    types: list[int] = Field(..., description="Distinct types per chapter")
+    ttr: list[float] = Field(..., description="Raw TTR per chapter")
+    sttr: list[Optional[float]] = Field(
+        ..., description="STTR per chapter (None below min_words_for_sttr)"
+    )
+
+
 class TTRResult(BaseModel):
     """Type-Token Ratio results for a single book."""
 
@@ -58,6 +118,22 @@ class TTRResult(BaseModel):
     delta_min: Optional[float] = Field(None, description="Largest negative swing")
     delta_max: Optional[float] = Field(None, description="Largest positive swing")
 
+    sampled_fraction: Optional[float] = Field(
+        None, gt=0.0, le=1.0, description="Share of the text analysed when a size budget sampled it"
+    )
+    vocabulary_sketch: Optional[str] = Field(
+        None, description="Serialized HyperLogLog sketch of the book's types (opt-in)"
+    )
+    sttr_sweep: Optional[STTRSweep] = Field(
+        None, description="STTR at each TTRConfig.sttr_sweep chunk size (opt-in)"
+    )
+    vocabulary_growth: Optional[VocabularyGrowth] = Field(
+        None, description="Vocabulary growth curve and Heaps' law fit (opt-in)"
+    )
+    chapters: Optional[ChapterMetrics] = Field(
+        None, description="Per-chapter metrics, when chapter offsets were supplied"
+    )
+
 
 class TTRAggregate(BaseModel):
     """Aggregated TTR statistics for an author."""
@@ -98,13 +174,123 @@ class TTRComparison(BaseModel):
     author_b_ttr_mean: float
     ttr_delta: float = Field(..., description="author_a - author_b")
 
+    ttr_effect_size: Optional[float] = Field(None, description="Cohen's d (pooled std)")
+    ttr_delta_ci_low: Optional[float] = Field(None, description="Bootstrap CI lower bound")
+    ttr_delta_ci_high: Optional[float] = Field(None, description="Bootstrap CI upper bound")
+
     author_a_sttr_mean: Optional[float] = None
     author_b_sttr_mean: Optional[float] = None
     sttr_delta: Optional[float] = None
+    sttr_effect_size: Optional[float] = None
+    sttr_delta_ci_low: Optional[float] = None
+    sttr_delta_ci_high: Optional[float] = None
+
+    generated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+# =============================================================================
+# SIGNIFICANCE TESTING
+# =============================================================================
+
+
+class SignificanceResult(BaseModel):
+    """Two-sample significance test of a per-book metric between two authors."""
+
+    model_config = ConfigDict(frozen=True)
+
+    author_a: str
+    author_b: str
+    metric: str = Field(..., description="TTRResult field tested (e.g. 'sttr')")
+    method: str = Field(..., description="'permutation' or 'bootstrap'")
+
+    n_a: int = Field(..., ge=0, description="Books by author_a")
+    n_b: int = Field(..., ge=0, description="Books by author_b")
+    observed_delta: Optional[float] = Field(None, description="mean(a) - mean(b)")
+    p_value: Optional[float] = Field(None, ge=0.0, le=1.0, description="Two-sided p-value")
+    p_adjusted: Optional[float] = Field(
+        None, ge=0.0, le=1.0, description="Benjamini-Hochberg adjusted p-value"
+    )
+    ci_low: Optional[float] = Field(None, description="Bootstrap CI lower bound of delta")
+    ci_high: Optional[float] = Field(None, description="Bootstrap CI upper bound of delta")
+    n_resamples: int = Field(..., ge=0)
+
+
+# =============================================================================
+# SAMPLED ESTIMATES
+# =============================================================================
+
 
+class STTREstimate(BaseModel):
+    """Author STTR estimated from randomly sampled chunks."""
+
+    model_config = ConfigDict(frozen=True)
+
+    author: str
+    rank: int = Field(..., ge=1, description="1 = highest estimated STTR")
+    books: int = Field(..., ge=0, description="Books with at least one sampled chunk")
+    chunks: int = Field(..., ge=0, description="Chunks sampled in total")
+    chunk_size: int = Field(..., ge=1)
+    sttr: float = Field(..., ge=0.0, le=1.0, description="Mean of per-book sampled STTR")
+    ci_low: Optional[float] = Field(None, description="Bootstrap CI lower bound (over books)")
+    ci_high: Optional[float] = Field(None, description="Bootstrap CI upper bound (over books)")
     generated_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+# =============================================================================
+# PROFILING
+# =============================================================================
+
+
+class StageTiming(BaseModel):
+    """Accumulated time spent in one pipeline stage."""
+
+    model_config = ConfigDict(frozen=True)
+
+    wall_seconds: float = Field(..., ge=0.0)
+    cpu_seconds: float = Field(..., ge=0.0, description="CPU time of the thread running the stage")
+    calls: int = Field(..., ge=0)
+
+
+class SlowBook(BaseModel):
+    """Timing of one book, as listed in a slowest-books report."""
+
+    model_config = ConfigDict(frozen=True)
+
+    file_path: str
+    author: str
+    gutenberg_id: str
+    chars: int = Field(..., ge=0, description="Characters in the book as read")
+    tokens: int = Field(..., ge=0)
+    seconds: float = Field(..., ge=0.0, description="Normalize + tokenize + compute wall time")
+    status: str = Field(..., description="'ok', 'sampled', 'skipped', 'timeout' or 'error'")
+    rss_growth_bytes: Optional[int] = Field(
+        None, ge=0, description="How far the book raised its process's peak RSS"
+    )
+
+
+class ProfileSummary(BaseModel):
+    """Per-stage timings and throughput of a processing run."""
+
+    model_config = ConfigDict(frozen=True)
+
+    stages: dict[str, StageTiming] = Field(default_factory=dict)
+    books: int = Field(0, ge=0)
+    tokens: int = Field(0, ge=0)
+    bytes_read: int = Field(0, ge=0)
+    wall_seconds: float = Field(0.0, ge=0.0, description="Elapsed time of the whole run")
+    tokens_per_second: float = Field(0.0, ge=0.0)
+    bytes_per_second: float = Field(0.0, ge=0.0)
+    peak_rss_bytes: Optional[int] = Field(
+        None, ge=0, description="Process high-water mark RSS (largest over processes), not per book"
+    )
+    slowest: list[SlowBook] = Field(
+        default_factory=list, description="Slowest books, slowest first"
+    )
+    largest_rss_growth: Optional[SlowBook] = Field(
+        None, description="Book that raised its process's peak RSS the most"
+    )
+
+
 # =============================================================================
 # PROCESSING STATUS
 # =============================================================================
@@ -126,7 +312,9 @@ class BatchProcessingStats(BaseModel):
     files_processed: int
     files_succeeded: int
     files_failed: int
+    files_resumed: int = Field(0, ge=0, description="Books skipped as already completed")
     total_words: int
     started_at: datetime
     completed_at: datetime
     errors: list[tuple[str, str]] = Field(default_factory=list)
+    profile: Optional[ProfileSummary] = Field(None, description="Set when run with a Profiler")
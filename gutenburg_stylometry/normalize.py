@@ -6,11 +6,49 @@ This module handles:
 2. Boilerplate removal - stripping Gutenberg headers/footers
 3. Front matter removal - TOCs, character lists, illustration lists
 4. Clean text output - pure authorial prose
+5. Near-duplicate detection (optional) - MinHash/LSH across titles (see dedup)
 """
 
+import heapq
 import re
+import time
 from pathlib import Path
 from collections import defaultdict
+from typing import NamedTuple
+
+from gutenburg_stylometry.dedup import (
+    DEDUP_MAP_NAME,
+    DEFAULT_THRESHOLD,
+    DocumentSignature,
+    MinHasher,
+    build_dedup_map,
+    load_duplicates,
+    write_dedup_map,
+)
+from gutenburg_stylometry.io.archive import ArchiveMember, ArchiveReader, is_archive
+from gutenburg_stylometry.io.reader import read_text
+
+
+# Chapter/section heading keyword followed by a numeral (matched against upper-cased lines)
+CHAPTER_PATTERN = r'^(CHAPTER|STAVE|BOOK|PART|VOLUME)\s+[IVXLC\d]'
+
+# A heading line in normalized text: blank line before and after, keyword in
+# upper or title case, then a roman/arabic/spelled numeral and an optional title
+CHAPTER_HEADING = re.compile(
+    r'(?:\A|(?<=\n\n))[ \t]*'
+    r'(?:CHAPTER|STAVE|BOOK|PART|VOLUME|Chapter|Stave|Book|Part|Volume)[ \t]+'
+    r'(?:[IVXLC]+|\d+|ONE|TWO|THREE|FOUR|FIVE|SIX|SEVEN|EIGHT|NINE|TEN|'
+    r'One|Two|Three|Four|Five|Six|Seven|Eight|Nine|Ten)\b[^\n]{0,80}'
+    r'(?=\n[ \t]*\n|\s*\Z)'
+)
+
+
+class ChapterHeading(NamedTuple):
+    """A chapter heading found in normalized text."""
+
+    start: int  # Character offset of the heading line
+    end: int  # Character offset just past the heading
+    heading: str
 
 
 def extract_work_id(filename: str) -> int:
@@ -44,6 +82,11 @@ def select_best_version(files: list[Path]) -> Path:
     return scored[0][2]
 
 
+def select_best_member(members: list[ArchiveMember]) -> ArchiveMember:
+    """Archive counterpart of select_best_version (sizes come from the listing)."""
+    return max(members, key=lambda m: (m.size, extract_work_id(m.file_name)))
+
+
 def find_content_boundaries(text: str) -> tuple[int, int]:
     """Find start and end of actual content (between Gutenberg markers)."""
     lines = text.split('\n')
@@ -105,7 +148,7 @@ def is_front_matter_section(lines: list[str], start_idx: int) -> tuple[bool, int
         while end_idx < len(lines):
             next_line = lines[end_idx].strip()
             # Check for chapter/section start
-            if re.match(r'^(CHAPTER|STAVE|BOOK|PART|VOLUME)\s+[IVXLC\d]', next_line, re.IGNORECASE):
+            if re.match(CHAPTER_PATTERN, next_line, re.IGNORECASE):
                 return True, end_idx
             # Check for two consecutive blank lines followed by content (new section)
             if end_idx + 2 < len(lines):
@@ -115,7 +158,7 @@ def is_front_matter_section(lines: list[str], start_idx: int) -> tuple[bool, int
                     re.match(r'^[A-Z]', lines[end_idx + 2].strip())):
                     # Potential new section, check if it's a chapter
                     potential = lines[end_idx + 2].strip().upper()
-                    if re.match(r'^(CHAPTER|STAVE|BOOK|PART|VOLUME)\s+[IVXLC\d]', potential):
+                    if re.match(CHAPTER_PATTERN, potential):
                         return True, end_idx + 2
             end_idx += 1
         return True, end_idx
@@ -139,8 +182,7 @@ def is_toc_entry(line: str, next_lines: list[str] = None) -> bool:
     # A real chapter is followed by prose content (substantial text)
     # A TOC entry is followed by another chapter or more TOC entries
     if next_lines:
-        chapter_pattern = r'^(CHAPTER|STAVE|BOOK|PART|VOLUME)\s+[IVXLC\d]'
-        if re.match(chapter_pattern, stripped.upper()):
+        if re.match(CHAPTER_PATTERN, stripped.upper()):
             # Look ahead to find what kind of content follows
             # Skip blanks and short lines (like [Illustration]) to find the next substantial content
             chapter_count = 0
@@ -153,11 +195,11 @@ def is_toc_entry(line: str, next_lines: list[str] = None) -> bool:
 
                 # Skip short decorative lines like [Illustration], dividers, etc.
                 if len(next_stripped) < 40:
-                    if re.match(chapter_pattern, next_stripped.upper()):
+                    if re.match(CHAPTER_PATTERN, next_stripped.upper()):
                         chapter_count += 1
                     continue
 
-                if re.match(chapter_pattern, next_stripped.upper()):
+                if re.match(CHAPTER_PATTERN, next_stripped.upper()):
                     chapter_count += 1
                     continue
 
@@ -178,7 +220,7 @@ def find_prose_start(lines: list[str], content_start: int) -> int:
 
     # First, try to find a chapter/section marker (NOT in TOC)
     chapter_patterns = [
-        r'^(CHAPTER|STAVE|BOOK|PART|VOLUME)\s+[IVXLC\d]',
+        CHAPTER_PATTERN,
         r'^(CHAPTER|STAVE|BOOK|PART|VOLUME)\s+(ONE|TWO|THREE|FOUR|FIVE|SIX|SEVEN|EIGHT|NINE|TEN)',
         r'^I\.\s+',  # Roman numeral chapter
         r'^1\.\s+',  # Numeric chapter
@@ -243,6 +285,20 @@ def find_prose_start(lines: list[str], content_start: int) -> int:
     return content_start
 
 
+def find_chapter_headings(text: str) -> list[ChapterHeading]:
+    """
+    Find chapter headings in normalized prose.
+
+    Uses the same heading keywords as find_prose_start, but only accepts
+    a heading that stands alone between blank lines, so a paragraph that
+    happens to open with "Part I..." is not taken for one.
+    """
+    return [
+        ChapterHeading(m.start(), m.end(), m.group(0).strip())
+        for m in CHAPTER_HEADING.finditer(text)
+    ]
+
+
 def remove_trailing_notes(lines: list[str]) -> list[str]:
     """Remove transcriber's notes and other trailing content."""
     # Look for common trailing note patterns from the end
@@ -306,13 +362,94 @@ def clean_text(text: str) -> str:
     return result
 
 
-def normalize_files(input_dir: Path, output_dir: Path, author: str = None) -> dict:
+def timed_clean_text(text: str, name: str, slowest: list, keep: int) -> str:
+    """
+    Run clean_text, keeping the keep slowest files in the min-heap slowest.
+
+    Heap entries are (seconds, name, chars).
+    """
+    started = time.perf_counter()
+    cleaned = clean_text(text)
+    entry = (round(time.perf_counter() - started, 6), name, len(text))
+    if len(slowest) < keep:
+        heapq.heappush(slowest, entry)
+    elif keep and entry > slowest[0]:
+        heapq.heapreplace(slowest, entry)
+    return cleaned
+
+
+class NearDuplicates:
+    """Near-duplicate bookkeeping shared by normalize_files and normalize_archive."""
+
+    def __init__(self, output_dir: Path, dedup: bool, threshold: float):
+        """
+        Initialize for one normalization run.
+
+        Args:
+            output_dir: Normalized output directory (holds the dedup map)
+            dedup: Recompute the dedup map from this run's books; otherwise
+                an existing map is honoured and its duplicates are skipped
+            threshold: Estimated Jaccard similarity for duplicates
+        """
+        self._path = output_dir / DEDUP_MAP_NAME
+        self._threshold = threshold
+        self._hasher = MinHasher() if dedup else None
+        self._skip = {} if dedup else load_duplicates(self._path)
+        self._documents: list[DocumentSignature] = []
+
+    def skip(self, output_name: str) -> bool:
+        """Whether an existing dedup map marks this output as a duplicate."""
+        return output_name in self._skip
+
+    def add(self, output_name: str, source_name: str, cleaned: str) -> None:
+        """Record the signature of a cleaned book (when recomputing)."""
+        if self._hasher is None:
+            return
+        signature = self._hasher.signature(cleaned)
+        if signature is not None:
+            work_id = extract_work_id(source_name)
+            self._documents.append(
+                DocumentSignature(output_name, len(cleaned), work_id, signature)
+            )
+
+    def finish(self, stats: dict) -> None:
+        """Write the dedup map (when recomputing) and count its duplicates."""
+        if self._hasher is None:
+            return
+        dedup_map = build_dedup_map(self._documents, threshold=self._threshold)
+        write_dedup_map(self._path, dedup_map)
+        stats['near_duplicates'] = len(dedup_map['duplicates'])
+
+
+def normalize_files(
+    input_dir: Path,
+    output_dir: Path,
+    author: str = None,
+    use_mmap: bool = False,
+    report_slowest: int = 10,
+    dedup: bool = False,
+    dedup_threshold: float = DEFAULT_THRESHOLD,
+) -> dict:
     """
     Normalize all text files in input_dir, writing clean versions to output_dir.
 
+    With use_mmap, source files are memory-mapped and decoded in place.
+    If input_dir is an archive (see normalize_archive), it is read directly.
+    clean_text is timed per file; stats['slowest'] lists the report_slowest
+    slowest files as (name, chars, seconds), slowest first.
+
+    With dedup, a MinHash signature of each cleaned book is taken as it is
+    written, and output_dir/dedup_map.json is rebuilt from them; all books
+    are still written. Without it, works listed as duplicates in an
+    existing map are not written.
+
     Returns dict with stats about processing.
     """
+    if is_archive(input_dir):
+        return normalize_archive(input_dir, output_dir, report_slowest, dedup, dedup_threshold)
+
     output_dir.mkdir(parents=True, exist_ok=True)
+    near_duplicates = NearDuplicates(output_dir, dedup, dedup_threshold)
 
     # Group files by canonical work
     groups = group_by_work(input_dir)
@@ -321,29 +458,100 @@ def normalize_files(input_dir: Path, output_dir: Path, author: str = None) -> di
         'total_input': sum(len(v) for v in groups.values()),
         'unique_works': len(groups),
         'duplicates_removed': 0,
+        'near_duplicates': 0,
+        'near_duplicates_skipped': 0,
         'files_written': 0,
         'errors': []
     }
+    slowest: list = []
 
     for canonical_name, files in groups.items():
         # Select best version
         best_file = select_best_version(files)
         stats['duplicates_removed'] += len(files) - 1
 
+        output_name = canonical_name + '.txt'
+        if near_duplicates.skip(output_name):
+            stats['near_duplicates_skipped'] += 1
+            continue
+
         try:
             # Read and clean
-            text = best_file.read_text(encoding='utf-8', errors='replace')
-            cleaned = clean_text(text)
+            text = read_text(best_file, use_mmap=use_mmap)
+            cleaned = timed_clean_text(text, best_file.name, slowest, report_slowest)
 
             # Write output
-            output_name = canonical_name + '.txt'
             output_path = output_dir / output_name
             output_path.write_text(cleaned, encoding='utf-8')
             stats['files_written'] += 1
+            near_duplicates.add(output_name, best_file.name, cleaned)
 
         except Exception as e:
             stats['errors'].append((best_file.name, str(e)))
 
+    near_duplicates.finish(stats)
+    stats['slowest'] = [
+        (name, chars, seconds) for seconds, name, chars in sorted(slowest, reverse=True)
+    ]
+    return stats
+
+
+def normalize_archive(
+    archive_path: Path,
+    output_dir: Path,
+    report_slowest: int = 10,
+    dedup: bool = False,
+    dedup_threshold: float = DEFAULT_THRESHOLD,
+) -> dict:
+    """
+    Normalize books straight out of a zip/tar archive or .txt.gz directory.
+
+    Versions are selected from the archive listing, then the selected
+    members are streamed in archive order in a single sequential pass.
+    dedup and dedup_threshold are as for normalize_files.
+
+    Returns dict with stats about processing (same keys as normalize_files).
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    near_duplicates = NearDuplicates(output_dir, dedup, dedup_threshold)
+
+    with ArchiveReader(archive_path) as reader:
+        groups = defaultdict(list)
+        for member in reader.members():
+            groups[extract_canonical_name(member.file_name)].append(member)
+
+        stats = {
+            'total_input': sum(len(v) for v in groups.values()),
+            'unique_works': len(groups),
+            'duplicates_removed': sum(len(v) - 1 for v in groups.values()),
+            'near_duplicates': 0,
+            'near_duplicates_skipped': 0,
+            'files_written': 0,
+            'errors': []
+        }
+
+        slowest: list = []
+        selected = set()
+        for canonical_name, members in groups.items():
+            if near_duplicates.skip(canonical_name + '.txt'):
+                stats['near_duplicates_skipped'] += 1
+            else:
+                selected.add(select_best_member(members).name)
+
+        for member, text in reader.iter_texts(select=lambda m: m.name in selected):
+            try:
+                cleaned = timed_clean_text(text, member.file_name, slowest, report_slowest)
+                output_name = extract_canonical_name(member.file_name) + '.txt'
+                (output_dir / output_name).write_text(cleaned, encoding='utf-8')
+                stats['files_written'] += 1
+                near_duplicates.add(output_name, member.file_name, cleaned)
+            except Exception as e:
+                stats['errors'].append((member.file_name, str(e)))
+
+    near_duplicates.finish(stats)
+    stats['slowest'] = [
+        (name, chars, seconds) for seconds, name, chars in sorted(slowest, reverse=True)
+    ]
     return stats
 
 
@@ -352,19 +560,50 @@ def main():
     import argparse
 
     parser = argparse.ArgumentParser(description='Normalize Gutenberg texts for stylometry')
-    parser.add_argument('input_dir', type=Path, help='Directory containing raw Gutenberg texts')
+    parser.add_argument(
+        'input_dir', type=Path,
+        help='Directory (or zip/tar archive) containing raw Gutenberg texts'
+    )
     parser.add_argument('output_dir', type=Path, help='Directory for cleaned output')
     parser.add_argument('--author', type=str, help='Author name for output filenames')
+    parser.add_argument('--mmap', action='store_true', help='Memory-map input files')
+    parser.add_argument(
+        '--slowest', type=int, default=10,
+        help='Report the N files that took longest to clean (default: 10)'
+    )
+    parser.add_argument(
+        '--dedup', action='store_true',
+        help=f'Find near-duplicate works across titles and write {DEDUP_MAP_NAME}'
+    )
+    parser.add_argument(
+        '--dedup-threshold', type=float, default=DEFAULT_THRESHOLD,
+        help=f'Estimated Jaccard similarity for near-duplicates (default: {DEFAULT_THRESHOLD})'
+    )
 
     args = parser.parse_args()
 
-    stats = normalize_files(args.input_dir, args.output_dir, args.author)
+    stats = normalize_files(
+        args.input_dir, args.output_dir, args.author,
+        use_mmap=args.mmap, report_slowest=args.slowest,
+        dedup=args.dedup, dedup_threshold=args.dedup_threshold,
+    )
 
     print(f"Processed {stats['total_input']} input files")
     print(f"Found {stats['unique_works']} unique works")
     print(f"Removed {stats['duplicates_removed']} duplicates")
+    if args.dedup:
+        print(f"Found {stats['near_duplicates']} near-duplicates "
+              f"(see {args.output_dir / DEDUP_MAP_NAME})")
+    if stats['near_duplicates_skipped']:
+        print(f"Skipped {stats['near_duplicates_skipped']} near-duplicates "
+              f"listed in the dedup map")
     print(f"Wrote {stats['files_written']} clean files")
 
+    if stats['slowest']:
+        print("\nSlowest files:")
+        for fname, chars, seconds in stats['slowest']:
+            print(f"  {seconds:8.3f}s  {chars:>12,} chars  {fname}")
+
     if stats['errors']:
         print(f"\nErrors ({len(stats['errors'])}):")
         for fname, err in stats['errors']:
@@ -0,0 +1,391 @@
+"""
+Opt-in per-stage profiling for the processing pipeline.
+
+A Profiler accumulates wall and CPU time per stage (read, normalize,
+tokenize, compute, write), bytes read, tokens, and the peak resident set
+size sampled after each book. CPU time is per thread, so stages running
+on background threads are attributed correctly.
+
+The peak RSS is the process's high-water mark, which never falls: after
+the largest book every later sample repeats it. Memory per book is
+therefore recorded as how far the book raised that mark (zero when it
+fit in memory the process had already used), and the summary names the
+book that raised it the most.
+
+Pass NULL_PROFILER (the default everywhere) to disable profiling: its
+stage() returns a shared no-op context manager, so the disabled cost is
+a method call per stage per book.
+
+Summaries are ProfileSummary models (JSON via model_dump_json) and can
+be rendered in the Prometheus text exposition format with to_prometheus().
+The models are imported only when summarizing, so importing the
+profiler (e.g. for a CLI's --help) does not load pydantic.
+"""
+
+import heapq
+import itertools
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from gutenburg_stylometry.models import ProfileSummary, SlowBook
+
+
+STAGES = ("read", "normalize", "tokenize", "compute", "write")
+DEFAULT_SLOWEST = 20
+
+_NULL_CONTEXT = nullcontext()
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Peak resident set size of this process so far (its high-water mark
+    over the whole process lifetime, not of any one book).
+
+    Returns:
+        Bytes, or None where the resource module is unavailable
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def content_bytes(content) -> int:
+    """
+    Size of a book on disk, falling back to its UTF-8 length.
+
+    Args:
+        content: BookContent (file_path may be a virtual archive path)
+
+    Returns:
+        Size in bytes
+    """
+    try:
+        return content.file_path.stat().st_size
+    except (OSError, AttributeError):
+        return len(content.text.encode("utf-8"))
+
+
+class BookTiming(NamedTuple):
+    """Per-book timing kept for the slowest-books report."""
+
+    seconds: float
+    file_path: str
+    author: str
+    gutenberg_id: str
+    chars: int
+    tokens: int
+    status: str
+    rss_growth_bytes: Optional[int] = None  # How far the book raised the process peak RSS
+
+
+class Profiler:
+    """
+    Accumulates per-stage timings and throughput counters.
+
+    Per-book timings are kept in a bounded min-heap, so only the slowest
+    books are held in memory however large the run.
+    """
+
+    enabled = True
+
+    def __init__(self, slowest: int = DEFAULT_SLOWEST):
+        """
+        Initialize an empty profile; the run clock starts now.
+
+        Args:
+            slowest: Books kept for the slowest-books report
+        """
+        self._wall: dict[str, float] = {}
+        self._cpu: dict[str, float] = {}
+        self._calls: dict[str, int] = {}
+        self.books = 0
+        self.tokens = 0
+        self.bytes_read = 0
+        self.peak_rss: Optional[int] = None  # Process high-water mark
+        self._largest_growth: Optional[BookTiming] = None
+        self._slowest_n = slowest
+        self._slowest: list[tuple[float, int, BookTiming]] = []
+        self._sequence = itertools.count()
+        self._started = time.perf_counter()
+
+    # -------------------------------------------------------------------------
+    # Recording
+    # -------------------------------------------------------------------------
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time the enclosed block as one call of a stage.
+
+        Args:
+            name: Stage name (see STAGES)
+        """
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - wall, time.thread_time() - cpu)
+
+    def add(self, name: str, wall: float, cpu: float, calls: int = 1) -> None:
+        """
+        Add time to a stage.
+
+        Args:
+            name: Stage name
+            wall: Wall-clock seconds
+            cpu: CPU seconds
+            calls: Number of calls the time covers
+        """
+        self._wall[name] = self._wall.get(name, 0.0) + wall
+        self._cpu[name] = self._cpu.get(name, 0.0) + cpu
+        self._calls[name] = self._calls.get(name, 0) + calls
+
+    def count_book(self, tokens: int) -> None:
+        """
+        Record a processed book and sample peak memory.
+
+        Args:
+            tokens: Tokens in the book
+        """
+        self.books += 1
+        self.tokens += tokens
+        rss = peak_rss_bytes()
+        if rss is not None and (self.peak_rss is None or rss > self.peak_rss):
+            self.peak_rss = rss
+
+    def record_book(self, timing: BookTiming) -> None:
+        """
+        Offer a book to the slowest-books report.
+
+        Args:
+            timing: The book's timing
+        """
+        self._offer_growth(timing)
+        entry = (timing.seconds, next(self._sequence), timing)
+        if len(self._slowest) < self._slowest_n:
+            heapq.heappush(self._slowest, entry)
+        elif self._slowest_n and entry[0] > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def _offer_growth(self, timing: BookTiming) -> None:
+        """Keep the book that raised the peak RSS the most."""
+        growth = timing.rss_growth_bytes
+        if growth and (
+            self._largest_growth is None or growth > self._largest_growth.rss_growth_bytes
+        ):
+            self._largest_growth = timing
+
+    def slowest(self) -> list[BookTiming]:
+        """Return the recorded slowest books, slowest first."""
+        return [entry[2] for entry in sorted(self._slowest, key=lambda e: e[0], reverse=True)]
+
+    def count_bytes(self, n_bytes: int) -> None:
+        """
+        Record bytes read.
+
+        Args:
+            n_bytes: Bytes read from storage
+        """
+        self.bytes_read += n_bytes
+
+    def iter_read(self, contents: Iterable) -> Iterator:
+        """
+        Time the read stage of a BookContent iterator and count bytes.
+
+        With read-ahead the measured wall time is the time the consumer
+        waited for the next book, which is what slows the pipeline down.
+
+        Args:
+            contents: BookContent iterator
+
+        Yields:
+            The same BookContent items
+        """
+        iterator = iter(contents)
+        while True:
+            wall, cpu = time.perf_counter(), time.thread_time()
+            try:
+                content = next(iterator)
+            except StopIteration:
+                return
+            self.add("read", time.perf_counter() - wall, time.thread_time() - cpu)
+            self.count_bytes(content_bytes(content))
+            yield content
+
+    # -------------------------------------------------------------------------
+    # Merging (process pools) and reporting
+    # -------------------------------------------------------------------------
+
+    def totals(self) -> dict:
+        """Picklable snapshot of the counters (for returning from workers)."""
+        return {
+            "wall": dict(self._wall),
+            "cpu": dict(self._cpu),
+            "calls": dict(self._calls),
+            "books": self.books,
+            "tokens": self.tokens,
+            "bytes_read": self.bytes_read,
+            "peak_rss": self.peak_rss,
+            "slowest": [tuple(timing) for timing in self.slowest()],
+            "largest_rss_growth": tuple(self._largest_growth) if self._largest_growth else None,
+        }
+
+    def merge(self, totals: dict) -> None:
+        """
+        Add counters from another profiler's totals().
+
+        Args:
+            totals: Snapshot returned by Profiler.totals()
+        """
+        for name, wall in totals["wall"].items():
+            self.add(name, wall, totals["cpu"][name], totals["calls"][name])
+        self.books += totals["books"]
+        self.tokens += totals["tokens"]
+        self.bytes_read += totals["bytes_read"]
+        peak = totals["peak_rss"]
+        if peak is not None and (self.peak_rss is None or peak > self.peak_rss):
+            self.peak_rss = peak
+        for timing in totals["slowest"]:
+            self.record_book(BookTiming(*timing))
+        if totals["largest_rss_growth"]:
+            self._offer_growth(BookTiming(*totals["largest_rss_growth"]))
+
+    def summary(self) -> "ProfileSummary":
+        """
+        Summarize the run so far.
+
+        Returns:
+            ProfileSummary with stages in pipeline order
+        """
+        from gutenburg_stylometry.models import ProfileSummary, StageTiming
+
+        elapsed = time.perf_counter() - self._started
+        names = [s for s in STAGES if s in self._wall] + sorted(set(self._wall) - set(STAGES))
+        return ProfileSummary(
+            stages={
+                name: StageTiming(
+                    wall_seconds=round(self._wall[name], 6),
+                    cpu_seconds=round(max(self._cpu[name], 0.0), 6),
+                    calls=self._calls[name],
+                )
+                for name in names
+            },
+            books=self.books,
+            tokens=self.tokens,
+            bytes_read=self.bytes_read,
+            wall_seconds=round(elapsed, 6),
+            tokens_per_second=round(self.tokens / elapsed, 3) if elapsed > 0 else 0.0,
+            bytes_per_second=round(self.bytes_read / elapsed, 3) if elapsed > 0 else 0.0,
+            peak_rss_bytes=self.peak_rss,
+            slowest=[_slow_book(timing) for timing in self.slowest()],
+            largest_rss_growth=(
+                _slow_book(self._largest_growth) if self._largest_growth else None
+            ),
+        )
+
+
+def _slow_book(timing: BookTiming) -> "SlowBook":
+    """Report model of a book's timing."""
+    from gutenburg_stylometry.models import SlowBook
+
+    return SlowBook(**{**timing._asdict(), "seconds": round(timing.seconds, 6)})
+
+
+class NullProfiler(Profiler):
+    """Profiler that records nothing."""
+
+    enabled = False
+
+    def stage(self, name: str):  # type: ignore[override]
+        """Return a shared no-op context manager."""
+        return _NULL_CONTEXT
+
+    def add(self, name: str, wall: float, cpu: float, calls: int = 1) -> None:
+        """Discard the timing."""
+
+    def count_book(self, tokens: int) -> None:
+        """Discard the count."""
+
+    def count_bytes(self, n_bytes: int) -> None:
+        """Discard the count."""
+
+    def record_book(self, timing: BookTiming) -> None:
+        """Discard the timing."""
+
+    def iter_read(self, contents: Iterable) -> Iterable:
+        """Return contents unchanged."""
+        return contents
+
+
+NULL_PROFILER = NullProfiler()
+
+
+def to_prometheus(
+    summary: "ProfileSummary",
+    labels: Optional[dict[str, str]] = None,
+    prefix: str = "gutenberg_ttr",
+) -> str:
+    """
+    Render a profile in the Prometheus text exposition format.
+
+    Args:
+        summary: Profile to render
+        labels: Extra labels added to every sample (e.g. {"author": "dickens"})
+        prefix: Metric name prefix
+
+    Returns:
+        Exposition text (newline terminated)
+    """
+    base = ",".join(f'{k}="{v}"' for k, v in sorted((labels or {}).items()))
+
+    def sample(name: str, value: float, extra: str = "") -> str:
+        label_text = ",".join(part for part in (extra, base) if part)
+        if not label_text:
+            return f"{prefix}_{name} {value}"
+        return f"{prefix}_{name}{{{label_text}}} {value}"
+
+    lines: list[str] = []
+    stage_metrics = (
+        ("stage_wall_seconds_total", "wall_seconds", "Wall-clock seconds spent per stage"),
+        ("stage_cpu_seconds_total", "cpu_seconds", "CPU seconds spent per stage"),
+        ("stage_calls_total", "calls", "Calls per stage"),
+    )
+    for name, field, help_text in stage_metrics:
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} counter")
+        for stage, timing in summary.stages.items():
+            lines.append(sample(name, getattr(timing, field), f'stage="{stage}"'))
+
+    scalars = (
+        ("books_total", "counter", summary.books, "Books processed"),
+        ("tokens_total", "counter", summary.tokens, "Tokens produced"),
+        ("bytes_read_total", "counter", summary.bytes_read, "Bytes read"),
+        ("run_seconds", "gauge", summary.wall_seconds, "Elapsed run time"),
+        ("tokens_per_second", "gauge", summary.tokens_per_second, "Token throughput"),
+        ("bytes_per_second", "gauge", summary.bytes_per_second, "Read throughput"),
+    )
+    if summary.peak_rss_bytes is not None:
+        scalars += (
+            ("peak_rss_bytes", "gauge", summary.peak_rss_bytes, "Process peak resident set size"),
+        )
+    if summary.largest_rss_growth is not None:
+        growth = summary.largest_rss_growth.rss_growth_bytes
+        scalars += (
+            ("book_rss_growth_bytes_max", "gauge", growth, "Most one book raised the peak RSS"),
+        )
+    for name, kind, value, help_text in scalars:
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        lines.append(sample(name, value))
+
+    return "\n".join(lines) + "\n"
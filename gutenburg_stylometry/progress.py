@@ -0,0 +1,153 @@
+"""
+Progress and throughput tracking for long corpus runs.
+
+ProgressTracker counts files, tokens, bytes and errors as results come
+in, per worker and in total, and derives rates and an ETA. Rates are
+reported both over the whole run and over a recent sliding window, so
+the effect of a tuning change shows up within seconds instead of being
+averaged away. snapshot() returns a plain dict that is safe to serialize
+as one line of a machine-readable progress stream.
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+DEFAULT_WINDOW_SECONDS = 10.0
+
+
+@dataclass
+class WorkerStatus:
+    """Running totals for one worker."""
+
+    worker: str
+    books: int = 0
+    tokens: int = 0
+    errors: int = 0
+    last_file: Optional[str] = None
+    last_seen: float = 0.0
+
+
+class ProgressTracker:
+    """Thread-safe counters, rates and ETA for a run over a known file count."""
+
+    def __init__(
+        self,
+        total_files: int,
+        window_seconds: float = DEFAULT_WINDOW_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize tracker; the run clock starts now.
+
+        Args:
+            total_files: Files the run will process
+            window_seconds: Span of the recent-rate window
+            clock: Monotonic time source (injectable for tests)
+        """
+        self._total_files = total_files
+        self._window_seconds = window_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._started = clock()
+
+        self.files = 0
+        self.errors = 0
+        self.tokens = 0
+        self.bytes = 0
+        self._workers: dict[str, WorkerStatus] = {}
+        # Cumulative (time, files, tokens, bytes) samples inside the window
+        self._samples: deque[tuple[float, int, int, int]] = deque([(self._started, 0, 0, 0)])
+
+    def update(
+        self,
+        file_name: str,
+        ok: bool,
+        tokens: int = 0,
+        n_bytes: int = 0,
+        worker: str = "main",
+    ) -> None:
+        """
+        Record one finished file.
+
+        Args:
+            file_name: File that finished
+            ok: Whether it succeeded
+            tokens: Tokens produced
+            n_bytes: Bytes read
+            worker: Worker that processed it
+        """
+        now = self._clock()
+        with self._lock:
+            self.files += 1
+            self.tokens += tokens
+            self.bytes += n_bytes
+            status = self._workers.get(worker)
+            if status is None:
+                status = self._workers[worker] = WorkerStatus(worker)
+            status.books += 1
+            status.tokens += tokens
+            status.last_file = file_name
+            status.last_seen = now
+            if not ok:
+                self.errors += 1
+                status.errors += 1
+
+            self._samples.append((now, self.files, self.tokens, self.bytes))
+            while len(self._samples) > 1 and self._samples[0][0] < now - self._window_seconds:
+                self._samples.popleft()
+
+    def snapshot(self) -> dict:
+        """
+        Current progress, rates and ETA.
+
+        Returns:
+            Dict with totals, overall and recent rates (per second),
+            eta_seconds (None until a rate is known) and per-worker status
+        """
+        now = self._clock()
+        with self._lock:
+            elapsed = now - self._started
+            since, files0, tokens0, bytes0 = self._samples[0]
+            span = now - since
+
+            def rate(value: float, seconds: float) -> float:
+                return round(value / seconds, 3) if seconds > 0 else 0.0
+
+            recent_files_per_sec = rate(self.files - files0, span)
+            remaining = self._total_files - self.files
+            eta = None
+            if remaining <= 0:
+                eta = 0.0
+            elif recent_files_per_sec > 0:
+                eta = round(remaining / recent_files_per_sec, 1)
+
+            return {
+                "elapsed_seconds": round(elapsed, 3),
+                "files_done": self.files,
+                "files_total": self._total_files,
+                "errors": self.errors,
+                "tokens": self.tokens,
+                "bytes": self.bytes,
+                "files_per_sec": rate(self.files, elapsed),
+                "tokens_per_sec": rate(self.tokens, elapsed),
+                "mb_per_sec": rate(self.bytes / 1e6, elapsed),
+                "recent_files_per_sec": recent_files_per_sec,
+                "recent_tokens_per_sec": rate(self.tokens - tokens0, span),
+                "recent_mb_per_sec": rate((self.bytes - bytes0) / 1e6, span),
+                "eta_seconds": eta,
+                "workers": [
+                    {
+                        "worker": s.worker,
+                        "books": s.books,
+                        "tokens": s.tokens,
+                        "errors": s.errors,
+                        "last_file": s.last_file,
+                        "idle_seconds": round(now - s.last_seen, 3),
+                    }
+                    for s in sorted(self._workers.values(), key=lambda s: s.worker)
+                ],
+            }
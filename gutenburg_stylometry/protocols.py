@@ -6,9 +6,11 @@ Using protocols enables dependency injection and easier testing.
 """
 
 from pathlib import Path
-from typing import Iterator, Protocol, runtime_checkable
+from typing import TYPE_CHECKING, Iterator, Optional, Protocol, runtime_checkable
 
-from gutenburg_stylometry.models import TTRResult, TTRAggregate
+if TYPE_CHECKING:
+    from gutenburg_stylometry.io.reader import BookContent
+    from gutenburg_stylometry.models import TTRResult, TTRAggregate
 
 
 # =============================================================================
@@ -66,12 +68,27 @@ class NormalizedFileReader(Protocol):
         """
         ...
 
+    def iter_author_books(
+        self, author: str, exclude_ids: Optional[set[str]] = None
+    ) -> Iterator["BookContent"]:
+        """
+        Read all books by an author, in the reader's preferred order.
+
+        Args:
+            author: Author identifier (e.g., 'dickens')
+            exclude_ids: Gutenberg IDs to skip without reading
+
+        Yields:
+            BookContent for each book
+        """
+        ...
+
 
 @runtime_checkable
 class MetricWriter(Protocol):
     """Protocol for writing metric results."""
 
-    def write(self, result: TTRResult) -> None:
+    def write(self, result: "TTRResult") -> None:
         """
         Write a single metric result.
 
@@ -94,7 +111,7 @@ class MetricWriter(Protocol):
 class TTRCalculator(Protocol):
     """Protocol for TTR calculation."""
 
-    def compute(self, tokens: list[str]) -> TTRResult:
+    def compute(self, tokens: list[str]) -> "TTRResult":
         """
         Compute TTR metrics from a list of tokens.
 
@@ -111,7 +128,7 @@ class TTRCalculator(Protocol):
 class Aggregator(Protocol):
     """Protocol for aggregating per-book metrics into author summaries."""
 
-    def aggregate(self, results: list[TTRResult]) -> TTRAggregate:
+    def aggregate(self, results: list["TTRResult"]) -> "TTRAggregate":
         """
         Aggregate multiple book results into an author summary.
 
@@ -1,5 +1,16 @@
 """Service layer for stylometric analysis."""
 
-from gutenburg_stylometry.services.ttr_service import TTRService
+from typing import TYPE_CHECKING
 
-__all__ = ["TTRService"]
+from gutenburg_stylometry._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from gutenburg_stylometry.services.comparison_service import ComparisonService
+    from gutenburg_stylometry.services.ttr_service import TTRService
+
+__all__ = ["ComparisonService", "TTRService"]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "ComparisonService": "gutenburg_stylometry.services.comparison_service",
+    "TTRService": "gutenburg_stylometry.services.ttr_service",
+})
@@ -0,0 +1,92 @@
+"""
+Per-book resource budgets.
+
+A few Gutenberg files (dictionaries, tables, anthologies) are orders of
+magnitude larger or slower than a typical novel. A BookBudget caps the
+characters and time spent on any one book so an outlier cannot stall a
+worker: oversize books are either skipped or analysed on evenly spaced
+windows, and a book is abandoned once the time budget runs out.
+
+The time budget is checked after normalization, every few thousand
+tokens during tokenization, and before computing metrics. Normalization
+and the metric computation are single linear passes that cannot stop
+part-way, so their length is bounded by max_chars rather than by the
+clock: set both limits to bound the worst case.
+"""
+
+from dataclasses import dataclass
+from typing import Literal, Optional
+
+
+class OversizeBook(ValueError):
+    """Raised for a book over the size budget when the policy is 'skip'."""
+
+
+def sample_text(text: str, max_chars: int, windows: int) -> str:
+    """
+    Take evenly spaced windows from text, totalling about max_chars.
+
+    Window edges are moved forward to the next whitespace so that no
+    word is cut in half.
+
+    Args:
+        text: Full text
+        max_chars: Character budget
+        windows: Number of windows
+
+    Returns:
+        Windows joined by newlines
+    """
+    window = max(max_chars // windows, 1)
+    stride = (len(text) - window) / max(windows - 1, 1)
+    pieces: list[str] = []
+    for i in range(windows):
+        start = int(i * stride)
+        if start:
+            space = text.find(" ", start, start + window)
+            start = space + 1 if space >= 0 else start
+        end = text.find(" ", start + window)
+        pieces.append(text[start: end if end >= 0 else len(text)])
+    return "\n".join(pieces)
+
+
+@dataclass(frozen=True)
+class BookBudget:
+    """Limits applied to each book in process_content."""
+
+    max_chars: Optional[int] = None  # Characters before the oversize policy applies
+    max_seconds: Optional[float] = None  # Wall time before metrics are computed
+    oversize: Literal["sample", "skip"] = "sample"
+    sample_windows: int = 16  # Windows taken from an oversize book
+
+    def fit(self, text: str) -> tuple[str, Optional[float]]:
+        """
+        Apply the size budget.
+
+        Args:
+            text: Book text
+
+        Returns:
+            Tuple of (text to analyse, sampled fraction or None if untouched)
+
+        Raises:
+            OversizeBook: If the book is too large and the policy is 'skip'
+        """
+        if self.max_chars is None or len(text) <= self.max_chars:
+            return text, None
+        if self.oversize == "skip":
+            raise OversizeBook(f"{len(text):,} characters exceeds budget of {self.max_chars:,}")
+        sample = sample_text(text, self.max_chars, self.sample_windows)
+        return sample, round(len(sample) / len(text), 6)
+
+    def deadline(self, started: float) -> Optional[float]:
+        """
+        Deadline for a book that started at a time.perf_counter() value.
+
+        Args:
+            started: Start time of the book
+
+        Returns:
+            Deadline, or None without a time budget
+        """
+        return None if self.max_seconds is None else started + self.max_seconds
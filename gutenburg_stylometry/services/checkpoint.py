@@ -0,0 +1,224 @@
+"""
+Checkpointing for resumable corpus runs.
+
+A run for one author keeps an append-only progress journal next to its
+per-book output. The first line records the configuration hash; each
+following line records one completed gutenberg_id and is only written
+after that book's result line has been flushed to the output JSONL.
+
+On resume the journal decides what is done: the output file is repaired
+(a torn final line is dropped, duplicate IDs keep their first record) and
+records the journal does not list are dropped from it as well, so the
+skip set is exactly the journal's IDs that are present in the output.
+A book written but not yet journaled when the run stopped is redone
+rather than duplicated.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from gutenburg_stylometry.metrics.ttr import TTRConfig
+from gutenburg_stylometry.services.budget import BookBudget
+
+
+def config_hash(
+    ttr_config: Optional[TTRConfig],
+    lowercase: bool,
+    budget: Optional[BookBudget] = None,
+) -> str:
+    """
+    Fingerprint the settings that affect per-book results.
+
+    Args:
+        ttr_config: TTR configuration (None means defaults)
+        lowercase: Tokenizer lowercase setting
+        budget: BookBudget in effect, if any
+
+    Returns:
+        Short hex digest
+    """
+    settings = {"ttr": asdict(ttr_config or TTRConfig()), "lowercase": lowercase}
+    if budget is not None:
+        settings["budget"] = asdict(budget)
+    payload = json.dumps(settings, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def repair_jsonl(
+    file_path: Path,
+    key: str = "gutenberg_id",
+    keep: Optional[set[str]] = None,
+) -> set[str]:
+    """
+    Make a possibly interrupted JSONL output safe to append to.
+
+    Drops a torn trailing line and any line that does not parse, and keeps
+    only the first record per key. The file is rewritten (atomically) only
+    when something had to change.
+
+    Args:
+        file_path: JSONL file to repair
+        key: Record field that identifies a book
+        keep: If given, also drop records whose key is not in it
+
+    Returns:
+        Keys of the records kept
+    """
+    if not file_path.exists():
+        return set()
+
+    kept_lines: list[str] = []
+    seen: set[str] = set()
+    dirty = False
+
+    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                dirty = True  # Torn write at the end of the file
+                break
+            try:
+                record_key = str(json.loads(line)[key])
+            except (ValueError, KeyError, TypeError):
+                dirty = True
+                continue
+            if record_key in seen or (keep is not None and record_key not in keep):
+                dirty = True
+                continue
+            seen.add(record_key)
+            kept_lines.append(line)
+
+    if dirty:
+        tmp_path = file_path.with_suffix(file_path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(kept_lines)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+
+    return seen
+
+
+class ProgressJournal:
+    """Append-only record of completed books for one author run."""
+
+    def __init__(self, file_path: Path, fsync: bool = False):
+        """
+        Initialize journal.
+
+        Args:
+            file_path: Path of the journal file
+            fsync: fsync after every record (survives power loss, slower)
+        """
+        self._file_path = file_path
+        self._fsync = fsync
+        self._handle: Optional[Any] = None
+
+    @property
+    def file_path(self) -> Path:
+        """Return the journal path."""
+        return self._file_path
+
+    def read(self) -> tuple[Optional[str], set[str]]:
+        """
+        Read the journal.
+
+        Returns:
+            Tuple of (config hash or None if no valid header, completed IDs)
+        """
+        if not self._file_path.exists():
+            return None, set()
+
+        config: Optional[str] = None
+        completed: set[str] = set()
+        with open(self._file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("_type") == "run":
+                    config = entry.get("config_hash")
+                elif "gutenberg_id" in entry:
+                    completed.add(str(entry["gutenberg_id"]))
+        return config, completed
+
+    def start(self, config: str, completed: Optional[set[str]] = None) -> None:
+        """
+        Begin (or restart) the journal with a header and known completions.
+
+        Args:
+            config: Configuration hash of this run
+            completed: IDs already present in the output
+        """
+        self.close()
+        self._file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = open(self._file_path, "w", encoding="utf-8")
+        header = {
+            "_type": "run",
+            "config_hash": config,
+            "started_at": datetime.utcnow().isoformat(),
+        }
+        self._handle.write(json.dumps(header) + "\n")
+        for gutenberg_id in sorted(completed or ()):
+            self._handle.write(json.dumps({"gutenberg_id": gutenberg_id}) + "\n")
+        self._sync()
+
+    def record(self, gutenberg_id: str) -> None:
+        """
+        Record a completed book.
+
+        Args:
+            gutenberg_id: ID whose result has already been flushed
+        """
+        if self._handle is None:
+            raise RuntimeError("Journal not started")
+        self._handle.write(json.dumps({"gutenberg_id": gutenberg_id}) + "\n")
+        self._sync()
+
+    def _sync(self) -> None:
+        self._handle.flush()
+        if self._fsync:
+            os.fsync(self._handle.fileno())
+
+    def close(self) -> None:
+        """Close the journal file."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+class JournaledWriter:
+    """
+    MetricWriter that journals each result after it is flushed.
+
+    Wraps an opened JSONLWriter; safe to put behind BackgroundWriter since
+    the write/flush/journal sequence runs on whichever thread calls write().
+    """
+
+    def __init__(self, writer: Any, journal: ProgressJournal):
+        """
+        Initialize writer.
+
+        Args:
+            writer: Opened JSONLWriter
+            journal: Started ProgressJournal
+        """
+        self._writer = writer
+        self._journal = journal
+
+    def write(self, result: Any) -> None:
+        """Write a result, flush it, then journal its ID."""
+        self._writer.write(result)
+        self._writer.flush()
+        self._journal.record(result.gutenberg_id)
+
+    def flush(self) -> None:
+        """Flush the wrapped writer."""
+        self._writer.flush()
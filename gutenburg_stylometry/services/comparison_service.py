@@ -0,0 +1,372 @@
+"""
+Cross-author TTR comparison service.
+
+Loads every author's per-book results once and computes the full
+author x author matrix of TTR/STTR deltas, Cohen's d effect sizes and
+bootstrap confidence intervals in vectorized form. The matrix is written
+as a single compact JSON artifact that the report can load in one go.
+"""
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+
+from gutenburg_stylometry.io.writer import JSONLWriter
+from gutenburg_stylometry.metrics.ttr import ResultColumns
+from gutenburg_stylometry.models import SignificanceResult, TTRComparison
+from gutenburg_stylometry.services.ttr_service import TTRService
+from gutenburg_stylometry.stats.resampling import (
+    bootstrap_group_means,
+    cohens_d_matrix,
+    pairwise_difference_intervals,
+)
+from gutenburg_stylometry.stats.significance import pairwise_tests
+
+
+# Per-book TTRResult fields (ResultColumns columns) compared across authors
+COMPARISON_METRICS: tuple[str, ...] = ("ttr", "sttr")
+
+
+@dataclass
+class MetricComparison:
+    """Pairwise comparison matrices for a single metric."""
+
+    means: np.ndarray  # (authors,)
+    stds: np.ndarray  # (authors,)
+    counts: np.ndarray  # (authors,)
+    delta: np.ndarray  # (authors x authors), row - column
+    effect_size: np.ndarray  # (authors x authors), Cohen's d
+    ci_low: np.ndarray  # (authors x authors)
+    ci_high: np.ndarray  # (authors x authors)
+
+
+@dataclass
+class ComparisonMatrix:
+    """Full author x author comparison for all metrics."""
+
+    authors: list[str]
+    metrics: dict[str, MetricComparison]
+    n_bootstrap: int
+    confidence: float
+    generated_at: datetime = field(default_factory=datetime.utcnow)
+
+    def __post_init__(self):
+        self._positions = {author: i for i, author in enumerate(self.authors)}
+
+    def comparison(self, author_a: str, author_b: str) -> TTRComparison:
+        """
+        Extract a single pairwise comparison.
+
+        Args:
+            author_a: First author (deltas are author_a - author_b)
+            author_b: Second author
+
+        Returns:
+            TTRComparison for the pair
+        """
+        try:
+            i, j = self._positions[author_a], self._positions[author_b]
+        except KeyError as e:
+            raise KeyError(f"Author not in comparison matrix: {e.args[0]}") from None
+
+        ttr = self.metrics["ttr"]
+        sttr = self.metrics["sttr"]
+        return TTRComparison(
+            author_a=author_a,
+            author_b=author_b,
+            author_a_ttr_mean=_value(ttr.means[i]),
+            author_b_ttr_mean=_value(ttr.means[j]),
+            ttr_delta=_value(ttr.delta[i, j]),
+            ttr_effect_size=_value(ttr.effect_size[i, j]),
+            ttr_delta_ci_low=_value(ttr.ci_low[i, j]),
+            ttr_delta_ci_high=_value(ttr.ci_high[i, j]),
+            author_a_sttr_mean=_value(sttr.means[i]),
+            author_b_sttr_mean=_value(sttr.means[j]),
+            sttr_delta=_value(sttr.delta[i, j]),
+            sttr_effect_size=_value(sttr.effect_size[i, j]),
+            sttr_delta_ci_low=_value(sttr.ci_low[i, j]),
+            sttr_delta_ci_high=_value(sttr.ci_high[i, j]),
+            generated_at=self.generated_at,
+        )
+
+    def iter_comparisons(self) -> Iterator[TTRComparison]:
+        """Yield a TTRComparison for every unordered author pair."""
+        for i, author_a in enumerate(self.authors):
+            for author_b in self.authors[i + 1 :]:
+                yield self.comparison(author_a, author_b)
+
+    def to_dict(self) -> dict:
+        """Serialize to a JSON-ready dict (NaN becomes null)."""
+        return {
+            "authors": self.authors,
+            "n_bootstrap": self.n_bootstrap,
+            "confidence": self.confidence,
+            "generated_at": self.generated_at.isoformat(),
+            "metrics": {
+                name: {
+                    "mean": _to_list(m.means),
+                    "std": _to_list(m.stds),
+                    "count": m.counts.astype(int).tolist(),
+                    "delta": _to_list(m.delta),
+                    "effect_size": _to_list(m.effect_size),
+                    "ci_low": _to_list(m.ci_low),
+                    "ci_high": _to_list(m.ci_high),
+                }
+                for name, m in self.metrics.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ComparisonMatrix":
+        """Rebuild a matrix from to_dict() output."""
+        metrics = {
+            name: MetricComparison(
+                means=_from_list(m["mean"]),
+                stds=_from_list(m["std"]),
+                counts=np.array(m["count"], dtype=np.int64),
+                delta=_from_list(m["delta"]),
+                effect_size=_from_list(m["effect_size"]),
+                ci_low=_from_list(m["ci_low"]),
+                ci_high=_from_list(m["ci_high"]),
+            )
+            for name, m in data["metrics"].items()
+        }
+        return cls(
+            authors=list(data["authors"]),
+            metrics=metrics,
+            n_bootstrap=data["n_bootstrap"],
+            confidence=data["confidence"],
+            generated_at=datetime.fromisoformat(data["generated_at"]),
+        )
+
+
+def metric_samples(columns: ResultColumns) -> dict[str, np.ndarray]:
+    """
+    Per-book values of each compared metric for one author.
+
+    Args:
+        columns: The author's per-book results
+
+    Returns:
+        Mapping of metric name -> 1-D array (books without the metric are
+        left out)
+    """
+    samples = {}
+    for metric in COMPARISON_METRICS:
+        values = getattr(columns, metric)
+        samples[metric] = values[~np.isnan(values)]
+    return samples
+
+
+class ComparisonService:
+    """
+    Service producing TTRComparison data for every author pair.
+
+    Reads per-book results written by TTRService.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        n_bootstrap: int = 2000,
+        confidence: float = 0.95,
+        seed: Optional[int] = 0,
+    ):
+        """
+        Initialize comparison service.
+
+        Args:
+            base_dir: Project base directory (contains data/)
+            n_bootstrap: Bootstrap replicates per author
+            confidence: Two-sided CI coverage
+            seed: RNG seed for reproducible intervals (None for random)
+        """
+        self._base_dir = base_dir
+        self._ttr_service = TTRService(base_dir)
+        self._n_bootstrap = n_bootstrap
+        self._confidence = confidence
+        self._seed = seed
+
+    @property
+    def comparisons_dir(self) -> Path:
+        """Directory for comparison outputs."""
+        return self._base_dir / "data" / "comparisons" / "ttr"
+
+    @property
+    def matrix_path(self) -> Path:
+        """Path of the author x author comparison artifact."""
+        return self.comparisons_dir / "matrix.json"
+
+    def load_samples(self, authors: Optional[list[str]] = None) -> dict[str, dict[str, np.ndarray]]:
+        """
+        Load per-book metric arrays for each author.
+
+        Args:
+            authors: Authors to load (default: every processed author)
+
+        Returns:
+            Mapping of author -> metric name -> 1-D array of per-book values
+        """
+        return {
+            author: metric_samples(self._ttr_service.load_columns(author))
+            for author in authors or self._ttr_service.list_processed_authors()
+        }
+
+    def compute(self, authors: Optional[list[str]] = None) -> ComparisonMatrix:
+        """
+        Compute the full comparison matrix.
+
+        Args:
+            authors: Authors to compare (default: every processed author)
+
+        Returns:
+            ComparisonMatrix covering all author pairs
+        """
+        return self.compare_samples(self.load_samples(authors))
+
+    def compare_samples(self, samples: dict[str, dict[str, np.ndarray]]) -> ComparisonMatrix:
+        """
+        Compute the comparison matrix for samples already in memory.
+
+        Args:
+            samples: Mapping of author -> metric name -> per-book values
+                (as returned by load_samples)
+
+        Returns:
+            ComparisonMatrix covering all author pairs
+        """
+        if not samples:
+            raise ValueError("No processed authors to compare")
+
+        names = sorted(samples)
+        rng = np.random.default_rng(self._seed)
+        metrics = {
+            metric: self._compare_metric([samples[a][metric] for a in names], rng)
+            for metric in COMPARISON_METRICS
+        }
+
+        return ComparisonMatrix(
+            authors=names,
+            metrics=metrics,
+            n_bootstrap=self._n_bootstrap,
+            confidence=self._confidence,
+        )
+
+    def _compare_metric(
+        self, groups: list[np.ndarray], rng: np.random.Generator
+    ) -> MetricComparison:
+        """Vectorized deltas, effect sizes and bootstrap CIs for one metric."""
+        counts = np.array([len(g) for g in groups], dtype=np.int64)
+        means = np.array([g.mean() if len(g) else np.nan for g in groups])
+        stds = np.array([g.std(ddof=1) if len(g) > 1 else np.nan for g in groups])
+
+        boot = bootstrap_group_means(groups, self._n_bootstrap, rng)
+        ci_low, ci_high = pairwise_difference_intervals(boot, self._confidence)
+
+        return MetricComparison(
+            means=means,
+            stds=stds,
+            counts=counts,
+            delta=means[:, None] - means[None, :],
+            effect_size=cohens_d_matrix(means, stds, counts),
+            ci_low=ci_low,
+            ci_high=ci_high,
+        )
+
+    def write(self, matrix: ComparisonMatrix) -> Path:
+        """
+        Write the comparison matrix as one compact JSON file.
+
+        Args:
+            matrix: Matrix from compute()
+
+        Returns:
+            Path written
+        """
+        self.comparisons_dir.mkdir(parents=True, exist_ok=True)
+        content = json.dumps(matrix.to_dict(), separators=(",", ":"), allow_nan=False)
+        self.matrix_path.write_text(content, encoding="utf-8")
+        return self.matrix_path
+
+    def load(self) -> ComparisonMatrix:
+        """Load the comparison artifact written by write()."""
+        return ComparisonMatrix.from_dict(json.loads(self.matrix_path.read_text(encoding="utf-8")))
+
+    def test_significance(
+        self,
+        metric: str = "sttr",
+        method: str = "permutation",
+        n_resamples: int = 5000,
+        authors: Optional[list[str]] = None,
+        workers: int = 1,
+    ) -> list[SignificanceResult]:
+        """
+        Test every author pair for a significant difference in a metric.
+
+        Results are written to significance_{metric}_{method}.jsonl.
+
+        Args:
+            metric: Per-book metric to test ('ttr' or 'sttr')
+            method: 'permutation' or 'bootstrap'
+            n_resamples: Replicates per pair
+            authors: Authors to include (default: every processed author)
+            workers: Processes to fan pairs out over
+
+        Returns:
+            One SignificanceResult per author pair
+        """
+        if metric not in COMPARISON_METRICS:
+            raise ValueError(f"Unknown metric: {metric} (expected one of {COMPARISON_METRICS})")
+
+        samples = {author: s[metric] for author, s in self.load_samples(authors).items()}
+        results = pairwise_tests(
+            samples,
+            metric=metric,
+            method=method,
+            n_resamples=n_resamples,
+            confidence=self._confidence,
+            seed=self._seed,
+            workers=workers,
+        )
+
+        output_path = self.comparisons_dir / f"significance_{metric}_{method}.jsonl"
+        with JSONLWriter(output_path) as writer:
+            for result in results:
+                writer.write(result)
+
+        return results
+
+    def compute_and_write(self, authors: Optional[list[str]] = None) -> ComparisonMatrix:
+        """
+        Full pipeline: compute all comparisons and persist the artifact.
+
+        Args:
+            authors: Authors to compare (default: every processed author)
+
+        Returns:
+            The computed ComparisonMatrix
+        """
+        matrix = self.compute(authors)
+        self.write(matrix)
+        return matrix
+
+
+def _value(x: float) -> Optional[float]:
+    """Round a numpy scalar for output, mapping NaN to None."""
+    return None if np.isnan(x) else round(float(x), 6)
+
+
+def _to_list(array: np.ndarray) -> list:
+    """Round and convert an array to nested lists with NaN as None."""
+    rounded = np.round(array, 6).astype(object)
+    rounded[np.isnan(array)] = None
+    return rounded.tolist()
+
+
+def _from_list(values: list) -> np.ndarray:
+    """Inverse of _to_list."""
+    return np.array(values, dtype=np.float64)
@@ -0,0 +1,192 @@
+"""
+Pipeline stages for overlapping I/O with CPU work.
+
+On network storage per-file latency dominates, so a strictly serial
+read -> tokenize -> compute -> write loop leaves the CPU idle most of
+the time. These helpers keep a bounded number of reads in flight ahead
+of the consumer, fan CPU work out to a process pool, and drain output
+records on a background thread. Every stage preserves input order and
+re-raises worker exceptions in the consumer.
+"""
+
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_DONE = object()  # Sentinel marking the end of a queue
+
+
+def iter_prefetched(items: Iterable[T], load: Callable[[T], R], depth: int) -> Iterator[R]:
+    """
+    Load items on a thread pool, keeping up to depth loads in flight.
+
+    Args:
+        items: Inputs (e.g. file paths)
+        load: Blocking loader (e.g. reader.read)
+        depth: Maximum concurrent loads
+
+    Yields:
+        Loaded values, in input order
+    """
+    with ThreadPoolExecutor(max_workers=depth, thread_name_prefix="prefetch") as pool:
+        yield from iter_bounded_map(load, items, pool, depth)
+
+
+def iter_bounded_map(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    executor: Executor,
+    depth: int,
+) -> Iterator[R]:
+    """
+    Ordered executor.map with at most depth tasks outstanding.
+
+    Unlike Executor.map, inputs are consumed lazily, so a 60k-book
+    iterator is never materialized up front.
+
+    Args:
+        func: Function to run (must be picklable for process pools)
+        items: Inputs
+        executor: Thread or process pool
+        depth: Maximum outstanding tasks
+
+    Yields:
+        Results in input order
+    """
+    pending: deque[Future] = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= depth:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def iter_ahead(iterator: Iterable[T], depth: int) -> Iterator[T]:
+    """
+    Run a sequential iterator on a background thread, buffering ahead.
+
+    Used for sources that must be read in order (e.g. tar streams),
+    where parallel loads are not possible but latency can still be hidden.
+
+    Args:
+        iterator: Source iterator
+        depth: Maximum buffered items
+
+    Yields:
+        Items from the source, in order
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(entry: tuple) -> bool:
+        """Block until there is room, unless the consumer has gone away."""
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    return
+            put((_DONE, None))
+        except BaseException as e:  # re-raised in the consumer
+            put((_DONE, e))
+
+    thread = threading.Thread(target=produce, name="read-ahead", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+class BackgroundWriter:
+    """
+    Drains write() calls to a wrapped writer on a background thread.
+
+    Satisfies the MetricWriter protocol. Errors raised by the wrapped
+    writer are re-raised on the next write(), flush() or on exit.
+    """
+
+    def __init__(self, writer: Any, max_pending: int = 1024):
+        """
+        Initialize background writer.
+
+        Args:
+            writer: Opened writer with write()/flush() (e.g. JSONLWriter)
+            max_pending: Records buffered before write() blocks
+        """
+        self._writer = writer
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def __enter__(self) -> "BackgroundWriter":
+        """Start the drain thread."""
+        self._thread = threading.Thread(target=self._drain, name="writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Write everything still queued, then stop the drain thread."""
+        self._queue.put(_DONE)
+        self._thread.join()
+        self._thread = None
+        if exc_type is None:
+            self._raise_if_failed()
+
+    def _drain(self) -> None:
+        while True:
+            record = self._queue.get()
+            try:
+                if record is _DONE:
+                    return
+                if self._error is None:
+                    self._writer.write(record)
+            except BaseException as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"Background write failed: {self._error}") from self._error
+
+    def write(self, record: Any) -> None:
+        """
+        Queue a record for writing.
+
+        Args:
+            record: Anything the wrapped writer accepts
+        """
+        if self._thread is None:
+            raise RuntimeError("Writer not started. Use 'with' context manager.")
+        self._raise_if_failed()
+        self._queue.put(record)
+
+    def flush(self) -> None:
+        """Wait for queued records to be written, then flush the wrapped writer."""
+        self._queue.join()
+        self._raise_if_failed()
+        self._writer.flush()
@@ -0,0 +1,580 @@
+"""
+Long-running local analysis server.
+
+The CLI scripts pay for interpreter start-up, imports, tokenizer
+construction and a corpus scan on every invocation, which dominates
+short interactive queries. AnalysisService keeps that state warm in one
+process:
+
+- a tokenizer and TTR calculator (and optionally a worker pool whose
+  processes build their own once, at start-up)
+- per-author results, reloaded only when the author's metrics file
+  changes
+- the fingerprint index, loaded (or built) on first use
+- the corpus catalog, when requested
+
+Concurrent "score this text" requests are coalesced by a MicroBatcher:
+requests arriving within a short window are scored as one batch, split
+across the worker pool, so many small requests cost a handful of
+inter-process round trips rather than one each.
+
+The HTTP front end (stdlib http.server) listens on localhost or a Unix
+socket and speaks JSON:
+
+    GET  /health                      Cache and pool state
+    POST /score                       {"text": ...} or {"documents": [...]}
+    GET  /compare?a=AUTHOR&b=AUTHOR   TTRComparison for one pair
+    GET  /nearest?id=ID&k=10          Books closest to an indexed book
+    GET  /nearest?author=AUTHOR&k=10  Authors closest to an author
+    POST /nearest                     {"text": ..., "k": 10}
+    POST /reload                      Drop cached results and the index
+"""
+
+import json
+import os
+import queue
+import socketserver
+import stat
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Generic, Optional, TypeVar
+from urllib.parse import parse_qs, urlsplit
+
+from gutenburg_stylometry.io.reader import BookContent
+from gutenburg_stylometry.metrics.char_ngrams import CharNgramProfiler
+from gutenburg_stylometry.metrics.ttr import ResultColumns, TTRCalculator, TTRConfig
+from gutenburg_stylometry.models import ProcessingResult, TTRComparison
+from gutenburg_stylometry.services.budget import BookBudget
+from gutenburg_stylometry.services.comparison_service import ComparisonService, metric_samples
+from gutenburg_stylometry.services.ttr_service import (
+    TTRService,
+    _init_worker,
+    _process_batch_in_worker,
+    process_content,
+)
+from gutenburg_stylometry.similarity.fingerprint import FINGERPRINT_FIELDS
+from gutenburg_stylometry.similarity.index import FingerprintIndex, Neighbor
+from gutenburg_stylometry.tokenizer import VictorianTokenizer
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_BATCH_SIZE = 32  # Requests scored per batch
+DEFAULT_BATCH_WAIT_MS = 5.0  # How long a batch waits for company
+DEFAULT_COMPARISON_BOOTSTRAP = 1000
+MAX_REQUEST_BYTES = 64 << 20
+QUERY_PATH = Path("-")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Coalesces concurrent single-item calls into batched calls.
+
+    submit() enqueues an item and returns a Future. A background thread
+    takes the first waiting item, then keeps collecting until batch_size
+    items are waiting or max_wait has passed since that first item, and
+    hands the batch to process_batch (which returns one result per item).
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[list[T]], list[R]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_BATCH_WAIT_MS,
+    ):
+        """
+        Initialize and start the batching thread.
+
+        Args:
+            process_batch: Computes results for a batch, in order
+            batch_size: Most items per batch
+            max_wait_ms: Longest an item waits for a batch to fill
+        """
+        self._process_batch = process_batch
+        self._batch_size = batch_size
+        self._max_wait = max_wait_ms / 1000
+        self._queue: queue.Queue[Optional[tuple[T, Future]]] = queue.Queue()
+        self._batches = 0
+        self._items = 0
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, item: T) -> "Future[R]":
+        """Queue an item; the future resolves when its batch is processed."""
+        future: Future[R] = Future()
+        self._queue.put((item, future))
+        return future
+
+    def __call__(self, items: list[T]) -> list[R]:
+        """Submit several items and wait for all of their results."""
+        futures = [self.submit(item) for item in items]
+        return [future.result() for future in futures]
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Batches and items processed so far."""
+        return {"batches": self._batches, "items": self._items}
+
+    def close(self) -> None:
+        """Process what is queued, then stop the thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self._max_wait
+            stopping = False
+            while len(batch) < self._batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = self._queue.get(timeout=max(remaining, 0.0))
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            self._dispatch(batch)
+            if stopping:
+                return
+
+    def _dispatch(self, batch: list[tuple[T, Future]]) -> None:
+        # Requests whose futures were cancelled while waiting are dropped
+        live = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        items = [item for item, _ in live]
+        if not items:
+            return
+        try:
+            results = self._process_batch(items)
+        except Exception as e:
+            for _, future in live:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(live, results):
+            future.set_result(result)
+        self._batches += 1
+        self._items += len(items)
+
+
+class AnalysisService:
+    """
+    Warm, thread-safe state behind the analysis server.
+
+    Every method may be called from many request threads at once.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        ttr_config: Optional[TTRConfig] = None,
+        workers: int = 1,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_wait_ms: float = DEFAULT_BATCH_WAIT_MS,
+        budget: Optional[BookBudget] = None,
+        use_catalog: bool = False,
+        n_bootstrap: int = DEFAULT_COMPARISON_BOOTSTRAP,
+    ):
+        """
+        Initialize service, starting the worker pool and batcher.
+
+        Args:
+            base_dir: Project base directory (contains data/)
+            ttr_config: Configuration for scoring texts
+            workers: Processes that score batches (1 scores in the batching
+                thread)
+            batch_size: Most score requests per batch
+            batch_wait_ms: Longest a score request waits for a batch to fill
+            budget: Per-text size/time limits
+            use_catalog: Keep the corpus catalog open (refreshed on start)
+            n_bootstrap: Bootstrap replicates for author comparisons
+        """
+        self._ttr_service = TTRService(
+            base_dir, ttr_config=ttr_config, use_catalog=use_catalog, budget=budget
+        )
+        self._comparison_service = ComparisonService(base_dir, n_bootstrap=n_bootstrap)
+        self._tokenizer = VictorianTokenizer()
+        self._calculator = TTRCalculator(config=ttr_config)
+        self._char_ngrams = CharNgramProfiler()
+        self._budget = budget
+        self._workers = workers
+        self._lock = threading.Lock()
+        self._results: dict[str, tuple[Optional[float], ResultColumns]] = {}
+        self._comparisons: dict[tuple, TTRComparison] = {}
+        self._index: Optional[FingerprintIndex] = None
+        self._started = time.time()
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        if workers > 1:
+            self._pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(True, ttr_config, budget),
+            )
+            # Start every worker now rather than on the first request
+            for future in [self._pool.submit(_process_batch_in_worker, []) for _ in range(workers)]:
+                future.result()
+        self._batcher: MicroBatcher[BookContent, ProcessingResult] = MicroBatcher(
+            self._score_batch, batch_size, batch_wait_ms
+        )
+
+    def close(self) -> None:
+        """Stop the batcher and the worker pool."""
+        self._batcher.close()
+        if self._pool is not None:
+            self._pool.shutdown()
+
+    def __enter__(self) -> "AnalysisService":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    # -------------------------------------------------------------------------
+    # Scoring
+    # -------------------------------------------------------------------------
+
+    def _score_batch(self, contents: list[BookContent]) -> list[ProcessingResult]:
+        """Score a batch inline, or as one pool task per worker."""
+        if self._pool is None:
+            return [
+                process_content(content, self._tokenizer, self._calculator, budget=self._budget)
+                for content in contents
+            ]
+        size = -(-len(contents) // self._workers)
+        futures = [
+            self._pool.submit(_process_batch_in_worker, contents[i : i + size])
+            for i in range(0, len(contents), size)
+        ]
+        return [result for future in futures for result in future.result()]
+
+    def score(self, documents: list[dict[str, Any]]) -> list[ProcessingResult]:
+        """
+        Score raw texts.
+
+        Args:
+            documents: Dicts with "text" and optional "id", "title", "author"
+
+        Returns:
+            One ProcessingResult per document, in order
+
+        Raises:
+            ValueError: If a document has no text
+        """
+        contents = []
+        for i, document in enumerate(documents):
+            text = document.get("text")
+            if not isinstance(text, str):
+                raise ValueError(f"Document {i} has no text")
+            doc_id = str(document.get("id", i))
+            contents.append(BookContent(
+                gutenberg_id=doc_id,
+                title=str(document.get("title", doc_id)),
+                author=str(document.get("author", "unknown")),
+                text=text,
+                file_path=QUERY_PATH,
+            ))
+        return self._batcher(contents)
+
+    # -------------------------------------------------------------------------
+    # Cached corpus state
+    # -------------------------------------------------------------------------
+
+    def _version(self, author: str) -> Optional[float]:
+        """Modification time of an author's metrics file (None with a store)."""
+        try:
+            return os.stat(self._ttr_service.metrics_dir / f"{author}.jsonl").st_mtime
+        except OSError:
+            return None
+
+    def results(self, author: str) -> ResultColumns:
+        """
+        An author's per-book results as columns, reloaded only when they change.
+
+        Raises:
+            KeyError: If the author has not been processed
+        """
+        version = self._version(author)
+        with self._lock:
+            cached = self._results.get(author)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        try:
+            results = self._ttr_service.load_columns(author)
+        except FileNotFoundError:
+            raise KeyError(f"No metrics found for author: {author}") from None
+        with self._lock:
+            self._results[author] = (version, results)
+        return results
+
+    def compare(self, author_a: str, author_b: str) -> TTRComparison:
+        """
+        Compare two authors' TTR and STTR distributions.
+
+        Raises:
+            KeyError: If either author has not been processed
+        """
+        key = (author_a, author_b, self._version(author_a), self._version(author_b))
+        with self._lock:
+            cached = self._comparisons.get(key)
+        if cached is not None:
+            return cached
+        samples = {author: metric_samples(self.results(author)) for author in (author_a, author_b)}
+        comparison = self._comparison_service.compare_samples(samples).comparison(
+            author_a, author_b
+        )
+        with self._lock:
+            self._comparisons[key] = comparison
+        return comparison
+
+    @property
+    def index(self) -> FingerprintIndex:
+        """The fingerprint index, loaded from disk or built on first use."""
+        with self._lock:
+            if self._index is None:
+                path = self._ttr_service.index_path
+                if path.exists():
+                    self._index = FingerprintIndex.load(path)
+                else:
+                    self._index = self._ttr_service.build_fingerprint_index()
+            return self._index
+
+    def nearest(
+        self,
+        k: int = 10,
+        gutenberg_id: Optional[str] = None,
+        author: Optional[str] = None,
+        text: Optional[str] = None,
+    ) -> list[Neighbor]:
+        """
+        Nearest books to an indexed book or a text, or nearest authors.
+
+        Exactly one of gutenberg_id, author and text must be given.
+
+        Raises:
+            ValueError: If the query is not exactly one of the three, or the
+                text cannot be scored
+            KeyError: If the book or author is not indexed
+        """
+        if sum(q is not None for q in (gutenberg_id, author, text)) != 1:
+            raise ValueError("Give exactly one of id, author and text")
+        if gutenberg_id is not None:
+            return self.index.query(gutenberg_id, k=k)
+        if author is not None:
+            return self.index.nearest_authors(author, k=k)
+        (processed,) = self.score([{"text": text}])
+        if not processed.success:
+            raise ValueError(processed.error)
+        index = self.index
+        profile = None
+        profile_dims = index.dims - len(FINGERPRINT_FIELDS)
+        if profile_dims:
+            # Index built with character n-gram profiles: profile the query too
+            profile = self._char_ngrams.profile(self._tokenizer.normalize(text))
+            profile = profile.dense(profile_dims)
+        return index.query_result(processed.result, k=k, profile=profile)
+
+    def reload(self) -> None:
+        """Forget cached results, comparisons and the index."""
+        with self._lock:
+            self._results.clear()
+            self._comparisons.clear()
+            self._index = None
+
+    def health(self) -> dict[str, Any]:
+        """Uptime, cache sizes and batching counters."""
+        catalog = self._ttr_service.catalog
+        with self._lock:
+            return {
+                "status": "ok",
+                "uptime_seconds": round(time.time() - self._started, 3),
+                "workers": self._workers,
+                "cached_authors": len(self._results),
+                "cached_comparisons": len(self._comparisons),
+                "index_loaded": self._index is not None,
+                "catalog_books": len(catalog) if catalog is not None else None,
+                **self._batcher.stats,
+            }
+
+
+# =============================================================================
+# HTTP front end
+# =============================================================================
+
+
+def _neighbors(neighbors: list[Neighbor]) -> list[dict]:
+    return [neighbor._asdict() for neighbor in neighbors]
+
+
+def _processed(result: ProcessingResult) -> dict:
+    if result.success:
+        return result.result.model_dump(mode="json", exclude_none=True)
+    return {"error": result.error}
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """JSON request handler; the AnalysisService is server.service."""
+
+    server_version = "GutenbergStylometry/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self) -> AnalysisService:
+        return self.server.service  # type: ignore[attr-defined]
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+    def _send(self, status: HTTPStatus, payload: Any) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_REQUEST_BYTES:
+            raise ValueError(f"Request body exceeds {MAX_REQUEST_BYTES:,} bytes")
+        data = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(data, dict):
+            raise ValueError("Request body must be a JSON object")
+        return data
+
+    def _handle(self, method: str) -> None:
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            body = self._body() if method == "POST" else {}
+            route = self._routes.get((method, url.path))
+            if route is None:
+                self._send(HTTPStatus.NOT_FOUND, {"error": f"No route: {method} {url.path}"})
+                return
+            self._send(HTTPStatus.OK, route(self, {**query, **body}))
+        except KeyError as e:
+            self._send(HTTPStatus.NOT_FOUND, {"error": str(e.args[0]) if e.args else str(e)})
+        except ValueError as e:
+            self._send(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+        except Exception as e:
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"})
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    # -------------------------------------------------------------------------
+    # Routes (params are the query string merged with the JSON body)
+    # -------------------------------------------------------------------------
+
+    def _health(self, params: dict) -> dict:
+        return self.service.health()
+
+    def _score(self, params: dict) -> dict:
+        if "documents" in params:
+            results = self.service.score(list(params["documents"]))
+            return {"results": [_processed(r) for r in results]}
+        (result,) = self.service.score([params])
+        return _processed(result)
+
+    def _compare(self, params: dict) -> dict:
+        if "a" not in params or "b" not in params:
+            raise ValueError("compare needs authors a and b")
+        comparison = self.service.compare(params["a"], params["b"])
+        return comparison.model_dump(mode="json")
+
+    def _nearest(self, params: dict) -> dict:
+        neighbors = self.service.nearest(
+            k=int(params.get("k", 10)),
+            gutenberg_id=params.get("id"),
+            author=params.get("author"),
+            text=params.get("text"),
+        )
+        return {"neighbors": _neighbors(neighbors)}
+
+    def _reload(self, params: dict) -> dict:
+        self.service.reload()
+        return {"status": "reloaded"}
+
+    _routes: dict[tuple[str, str], Callable[["AnalysisRequestHandler", dict], Any]] = {
+        ("GET", "/health"): _health,
+        ("POST", "/score"): _score,
+        ("GET", "/compare"): _compare,
+        ("GET", "/nearest"): _nearest,
+        ("POST", "/nearest"): _nearest,
+        ("POST", "/reload"): _reload,
+    }
+
+
+class AnalysisHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server on a TCP port, holding the AnalysisService."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: AnalysisService, verbose: bool = False):
+        super().__init__(address, AnalysisRequestHandler)
+        self.service = service
+        self.verbose = verbose
+
+
+class AnalysisUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded HTTP server on a Unix domain socket, holding the AnalysisService."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, service: AnalysisService, verbose: bool = False):
+        # Only a stale socket from an earlier run may be replaced
+        if socket_path.exists() or socket_path.is_symlink():
+            if not stat.S_ISSOCK(socket_path.lstat().st_mode):
+                raise FileExistsError(f"Not a socket, refusing to replace: {socket_path}")
+            socket_path.unlink()
+        super().__init__(str(socket_path), AnalysisRequestHandler)
+        self.service = service
+        self.verbose = verbose
+
+    def server_close(self) -> None:
+        super().server_close()
+        Path(self.server_address).unlink(missing_ok=True)
+
+
+def make_server(
+    service: AnalysisService,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Optional[Path] = None,
+    verbose: bool = False,
+) -> socketserver.BaseServer:
+    """
+    Create (but do not start) an HTTP server for an AnalysisService.
+
+    Args:
+        service: Warm analysis state
+        host: Interface to listen on (ignored with socket_path)
+        port: TCP port (0 picks a free one)
+        socket_path: Listen on this Unix socket instead of TCP
+        verbose: Log each request to stderr
+
+    Returns:
+        Server ready for serve_forever()
+    """
+    if socket_path is not None:
+        return AnalysisUnixServer(socket_path, service, verbose)
+    return AnalysisHTTPServer((host, port), service, verbose)
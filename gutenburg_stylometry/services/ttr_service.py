@@ -9,15 +9,223 @@ Orchestrates the full pipeline:
 5. Aggregate per-author statistics
 """
 
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
+import numpy as np
+
+from gutenburg_stylometry.dedup import DEDUP_MAP_NAME, load_duplicates
+from gutenburg_stylometry.io.archive import ArchiveReader
+from gutenburg_stylometry.io.catalog import CorpusCatalog
 from gutenburg_stylometry.io.reader import NormalizedFileReader, BookContent
-from gutenburg_stylometry.io.writer import JSONLWriter, JSONWriter
-from gutenburg_stylometry.metrics.ttr import TTRCalculator, TTRAggregator, TTRConfig
-from gutenburg_stylometry.models import TTRResult, ProcessingResult, BatchProcessingStats
-from gutenburg_stylometry.tokenizer import VictorianTokenizer
+from gutenburg_stylometry.io.sqlite_store import SQLiteMetricsStore
+from gutenburg_stylometry.io.writer import JSONLReader, JSONLWriter, JSONWriter
+from gutenburg_stylometry.metrics.char_ngrams import (
+    DEFAULT_TOP_K,
+    CharNgramProfile,
+    CharNgramProfiler,
+    load_profiles,
+    save_profiles,
+)
+from gutenburg_stylometry.metrics.hll import HyperLogLog
+from gutenburg_stylometry.metrics.sampling import (
+    DEFAULT_SAMPLES,
+    ChunkSampler,
+    estimate_with_interval,
+)
+from gutenburg_stylometry.metrics.ttr import (
+    ResultColumns,
+    TTRCalculator,
+    TTRAggregator,
+    TTRConfig,
+)
+from gutenburg_stylometry.metrics.word_ngrams import WordNgramCounter
+from gutenburg_stylometry.models import (
+    BatchProcessingStats,
+    ProcessingResult,
+    STTREstimate,
+    TTRResult,
+)
+from gutenburg_stylometry.profiling import NULL_PROFILER, BookTiming, Profiler, peak_rss_bytes
+from gutenburg_stylometry.services.budget import BookBudget, OversizeBook
+from gutenburg_stylometry.services.checkpoint import (
+    JournaledWriter,
+    ProgressJournal,
+    config_hash,
+    repair_jsonl,
+)
+from gutenburg_stylometry.services.pipeline import (
+    BackgroundWriter,
+    iter_ahead,
+    iter_bounded_map,
+    iter_prefetched,
+)
+from gutenburg_stylometry.services.work_queue import TaskQueue
+from gutenburg_stylometry.similarity.index import FingerprintIndex
+from gutenburg_stylometry.tokenizer import (
+    DeadlineExceeded,
+    VictorianTokenizer,
+    check_deadline,
+    tokenize_book,
+)
+
+
+def _first_per_book(records: Iterable[dict]) -> Iterator[dict]:
+    """The first record per gutenberg_id (a resumed run may write a book twice)."""
+    seen: set[str] = set()
+    for record in records:
+        if record["gutenberg_id"] not in seen:
+            seen.add(record["gutenberg_id"])
+            yield record
+
+
+def process_content(
+    content: BookContent,
+    tokenizer: VictorianTokenizer,
+    calculator: TTRCalculator,
+    profiler: Profiler = NULL_PROFILER,
+    budget: Optional[BookBudget] = None,
+) -> ProcessingResult:
+    """
+    Tokenize a book and compute its TTR metrics.
+
+    Args:
+        content: Book content and metadata
+        tokenizer: Tokenizer instance
+        calculator: TTR calculator instance
+        profiler: Records stage and per-book timings (default: off)
+        budget: Size and time limits for the book (default: none)
+
+    Returns:
+        ProcessingResult with success status and result
+    """
+    started = time.perf_counter()
+    rss_before = peak_rss_bytes() if profiler.enabled else None
+    status = "ok"
+    tokens: list[str] = []
+    try:
+        text, sampled_fraction = budget.fit(content.text) if budget else (content.text, None)
+        deadline = budget.deadline(started) if budget else None
+
+        # Tokenize
+        with profiler.stage("normalize"):
+            text = tokenizer.normalize(text)
+        check_deadline(deadline, "normalize")
+        with profiler.stage("tokenize"):
+            tokens, chapter_offsets, chapter_ends, chapter_headings = tokenize_book(
+                text, tokenizer, calculator.config.chapters, deadline
+            )
+        check_deadline(deadline, "tokenize")
+
+        # Compute TTR
+        with profiler.stage("compute"):
+            result = calculator.compute(
+                tokens=tokens,
+                gutenberg_id=content.gutenberg_id,
+                title=content.title,
+                author=content.author,
+                chapter_offsets=chapter_offsets,
+                chapter_ends=chapter_ends,
+                chapter_headings=chapter_headings,
+            )
+        if sampled_fraction is not None:
+            result = result.model_copy(update={"sampled_fraction": sampled_fraction})
+            status = "sampled"
+        profiler.count_book(len(tokens))
+
+        return ProcessingResult(
+            file_path=str(content.file_path),
+            success=True,
+            error=None,
+            result=result,
+        )
+
+    except Exception as e:
+        if isinstance(e, OversizeBook):
+            status = "skipped"
+        elif isinstance(e, DeadlineExceeded):
+            status = "timeout"
+        else:
+            status = "error"
+        return ProcessingResult(
+            file_path=str(content.file_path),
+            success=False,
+            error=str(e),
+            result=None,
+        )
+
+    finally:
+        if profiler.enabled:
+            rss_after = peak_rss_bytes()
+            profiler.record_book(
+                BookTiming(
+                    seconds=time.perf_counter() - started,
+                    file_path=str(content.file_path),
+                    author=content.author,
+                    gutenberg_id=content.gutenberg_id,
+                    chars=len(content.text),
+                    tokens=len(tokens),
+                    status=status,
+                    rss_growth_bytes=(
+                        rss_after - rss_before if rss_before is not None else None
+                    ),
+                )
+            )
+
+
+# Per-process tokenizer and calculator for pool workers (set by _init_worker)
+_worker_tokenizer: Optional[VictorianTokenizer] = None
+_worker_calculator: Optional[TTRCalculator] = None
+_worker_budget: Optional[BookBudget] = None
+
+
+def _init_worker(
+    lowercase: bool, ttr_config: Optional[TTRConfig], budget: Optional[BookBudget] = None
+) -> None:
+    """Process pool initializer: build the tokenizer and calculator once."""
+    global _worker_tokenizer, _worker_calculator, _worker_budget
+    _worker_tokenizer = VictorianTokenizer(lowercase=lowercase)
+    _worker_calculator = TTRCalculator(config=ttr_config)
+    _worker_budget = budget
+
+
+def _process_in_worker(content: BookContent) -> ProcessingResult:
+    """Process pool task: process one book with the worker's instances."""
+    return process_content(
+        content, _worker_tokenizer, _worker_calculator, budget=_worker_budget
+    )
+
+
+def _process_batch_in_worker(contents: list[BookContent]) -> list[ProcessingResult]:
+    """Process pool task: process several books in one round trip."""
+    return [_process_in_worker(content) for content in contents]
+
+
+def _profile_in_worker(content: BookContent) -> tuple[ProcessingResult, dict]:
+    """Process pool task: process one book and return its profile totals."""
+    profiler = Profiler()
+    result = process_content(
+        content, _worker_tokenizer, _worker_calculator, profiler, _worker_budget
+    )
+    return result, profiler.totals()
+
+
+def _shard_config(shard_path: Path) -> Optional[str]:
+    """Configuration hash in a queue shard's header (None if absent or unreadable)."""
+    try:
+        with open(shard_path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(header, dict) or header.get("_type") != "run":
+        return None
+    return header.get("config_hash")
 
 
 class TTRService:
@@ -32,6 +240,12 @@ class TTRService:
         base_dir: Path,
         ttr_config: Optional[TTRConfig] = None,
         lowercase: bool = True,
+        use_catalog: bool = False,
+        use_mmap: bool = False,
+        archive: Optional[Path] = None,
+        budget: Optional[BookBudget] = None,
+        honour_dedup: bool = True,
+        store: Optional[SQLiteMetricsStore] = None,
     ):
         """
         Initialize TTR service.
@@ -40,13 +254,74 @@ class TTRService:
             base_dir: Project base directory (contains data/)
             ttr_config: Configuration for TTR computation
             lowercase: Whether to lowercase tokens
+            use_catalog: Look up files through the persisted corpus catalog
+                (refreshed incrementally on startup) instead of globbing
+            use_mmap: Memory-map book files when reading
+            archive: Read books straight from this zip/tar archive (or
+                .txt.gz directory) instead of data/normalized/
+            budget: Per-book size/time limits, so pathological files are
+                sampled or skipped instead of stalling a worker
+            honour_dedup: Leave out the near-duplicates listed in
+                data/normalized/dedup_map.json, if it exists
+            store: Write per-book results to this SQLite store instead of
+                per-author JSONL, and read and aggregate them from it
         """
         self._base_dir = base_dir
-        self._reader = NormalizedFileReader(base_dir)
+        self._catalog: Optional[CorpusCatalog] = None
+        if use_catalog:
+            self._catalog = CorpusCatalog.open(
+                base_dir / "data" / "normalized",
+                index_path=self.catalog_path,
+            )
+        self._duplicates = load_duplicates(self.dedup_map_path) if honour_dedup else {}
+        self._reader: NormalizedFileReader | ArchiveReader
+        if archive is not None:
+            self._reader = ArchiveReader(archive, exclude=set(self._duplicates))
+        else:
+            self._reader = NormalizedFileReader(
+                base_dir,
+                catalog=self._catalog,
+                use_mmap=use_mmap,
+                exclude=set(self._duplicates),
+            )
+        self._lowercase = lowercase
+        self._ttr_config = ttr_config
+        self._budget = budget
+        self._store = store
         self._tokenizer = VictorianTokenizer(lowercase=lowercase)
         self._calculator = TTRCalculator(config=ttr_config)
         self._aggregator = TTRAggregator()
 
+    @property
+    def catalog_path(self) -> Path:
+        """Path of the persisted corpus catalog."""
+        return self._base_dir / "data" / "catalog" / "normalized.json"
+
+    @property
+    def catalog(self) -> Optional[CorpusCatalog]:
+        """Corpus catalog, if the service was created with use_catalog=True."""
+        return self._catalog
+
+    @property
+    def dedup_map_path(self) -> Path:
+        """Path of the near-duplicate map written by normalize --dedup."""
+        return self._base_dir / "data" / "normalized" / DEDUP_MAP_NAME
+
+    @property
+    def duplicates(self) -> dict[str, str]:
+        """Near-duplicate file names being left out, mapped to the kept file."""
+        return self._duplicates
+
+    @property
+    def store_path(self) -> Path:
+        """Default path of the SQLite metrics store."""
+        return self._base_dir / "data" / "metrics" / "ttr.sqlite"
+
+    @property
+    def store(self) -> Optional[SQLiteMetricsStore]:
+        """SQLite metrics store, if the service writes to one."""
+        return self._store
+
     @property
     def metrics_dir(self) -> Path:
         """Directory for per-book metric outputs."""
@@ -57,54 +332,103 @@ class TTRService:
         """Directory for per-author aggregate outputs."""
         return self._base_dir / "data" / "aggregates" / "ttr"
 
-    def process_book(self, content: BookContent) -> ProcessingResult:
+    @property
+    def corpus_aggregate_path(self) -> Path:
+        """Path of the corpus-level aggregate output."""
+        return self._base_dir / "data" / "aggregates" / "ttr_corpus.json"
+
+    @property
+    def checkpoints_dir(self) -> Path:
+        """Directory for per-author progress journals."""
+        return self._base_dir / "data" / "checkpoints" / "ttr"
+
+    @property
+    def queue_path(self) -> Path:
+        """Default path of the distributed work queue database."""
+        return self._base_dir / "data" / "queue" / "ttr.sqlite"
+
+    @property
+    def shards_dir(self) -> Path:
+        """Directory for per-worker result shards of a queue run."""
+        return self._base_dir / "data" / "metrics" / "vocabulary" / "ttr_shards"
+
+    @property
+    def estimates_dir(self) -> Path:
+        """Directory for sampled (approximate) estimates."""
+        return self._base_dir / "data" / "estimates" / "ttr"
+
+    @property
+    def char_ngrams_dir(self) -> Path:
+        """Directory for per-author character n-gram profiles."""
+        return self._base_dir / "data" / "metrics" / "char_ngrams"
+
+    @property
+    def word_ngrams_dir(self) -> Path:
+        """Directory for per-author word n-gram counters."""
+        return self._base_dir / "data" / "metrics" / "word_ngrams"
+
+    @property
+    def index_path(self) -> Path:
+        """Path of the persisted fingerprint similarity index."""
+        return self._base_dir / "data" / "index" / "ttr_fingerprints.npz"
+
+    def process_book(
+        self, content: BookContent, profiler: Profiler = NULL_PROFILER
+    ) -> ProcessingResult:
         """
         Process a single book and compute TTR metrics.
 
         Args:
             content: Book content and metadata
+            profiler: Records stage timings (default: off)
 
         Returns:
             ProcessingResult with success status and result
         """
-        try:
-            # Tokenize
-            tokens = self._tokenizer.tokenize(content.text)
-
-            # Compute TTR
-            result = self._calculator.compute(
-                tokens=tokens,
-                gutenberg_id=content.gutenberg_id,
-                title=content.title,
-                author=content.author,
-            )
-
-            return ProcessingResult(
-                file_path=str(content.file_path),
-                success=True,
-                error=None,
-                result=result,
-            )
-
-        except Exception as e:
-            return ProcessingResult(
-                file_path=str(content.file_path),
-                success=False,
-                error=str(e),
-                result=None,
-            )
+        return process_content(
+            content, self._tokenizer, self._calculator, profiler, self._budget
+        )
 
-    def process_author(self, author: str) -> BatchProcessingStats:
+    def process_author(
+        self,
+        author: str,
+        prefetch: int = 0,
+        workers: int = 1,
+        resume: bool = False,
+        profiler: Optional[Profiler] = None,
+    ) -> BatchProcessingStats:
         """
         Process all books by an author.
 
         Writes per-book results to JSONL and returns batch statistics.
 
+        With prefetch > 0, up to that many books are read ahead on
+        background threads and results are written by a background thread,
+        so slow storage overlaps with tokenization. With workers > 1,
+        tokenization and TTR computation run in a process pool. Output
+        order is the same in every mode.
+
+        Every completed book is recorded in a progress journal once its
+        result is flushed. With resume=True and a journal written under the
+        same configuration, the books the journal lists are skipped: the
+        existing output is repaired, trimmed to those books and appended
+        to. Otherwise the run starts from scratch.
+
+        With a SQLite store, results are committed to it in batches instead
+        of being written to JSONL. The journal then only gates resuming on
+        the configuration, and the books already committed to the store are
+        what a resumed run skips.
+
         Args:
             author: Author identifier (e.g., 'dickens')
+            prefetch: Books to keep in flight ahead of the CPU stage
+            workers: Processes for tokenize + compute (1 runs in-process)
+            resume: Continue an interrupted run instead of starting over
+            profiler: Collect per-stage timings into stats.profile (a
+                Profiler may be shared across authors for corpus totals)
 
         Returns:
-            BatchProcessingStats with processing summary
+            BatchProcessingStats for the books processed by this call
         """
         started_at = datetime.utcnow()
         results: list[TTRResult] = []
@@ -112,20 +436,63 @@ class TTRService:
 
         # Ensure output directory exists
         output_path = self.metrics_dir / f"{author}.jsonl"
+        journal = ProgressJournal(self.checkpoints_dir / f"{author}.journal.jsonl")
+        run_config = self._config_hash()
+
+        completed: set[str] = set()
+        if resume:
+            journal_config, journaled = journal.read()
+            if journal_config == run_config:
+                completed = (
+                    self._store.book_ids(author)
+                    if self._store
+                    else repair_jsonl(output_path, keep=journaled)
+                )
+        if self._store is not None and not completed:
+            self._store.delete_author(author)
 
-        with JSONLWriter(output_path) as writer:
-            for file_path in self._reader.iter_author_files(author):
-                # Read file
-                content = self._reader.read(file_path)
+        with ExitStack() as stack:
+            journal.start(run_config, completed)
+            stack.callback(journal.close)
 
-                # Process
-                proc_result = self.process_book(content)
+            if self._store is not None:
+                # Committed rows are the record of progress; batches stay batched
+                writer = self._store
+                stack.callback(self._store.flush)
+            else:
+                jsonl = stack.enter_context(JSONLWriter(output_path, append=bool(completed)))
+                writer = JournaledWriter(jsonl, journal)
+            if prefetch > 0:
+                writer = stack.enter_context(BackgroundWriter(writer))
 
+            active = profiler or NULL_PROFILER
+            contents = active.iter_read(self._iter_contents(author, prefetch, completed))
+
+            if workers > 1:
+                pool = stack.enter_context(
+                    ProcessPoolExecutor(
+                        max_workers=workers,
+                        initializer=_init_worker,
+                        initargs=(self._lowercase, self._ttr_config, self._budget),
+                    )
+                )
+                depth = workers * 2 + prefetch
+                if profiler is None:
+                    proc_results = iter_bounded_map(_process_in_worker, contents, pool, depth)
+                else:
+                    proc_results = self._merge_profiles(
+                        iter_bounded_map(_profile_in_worker, contents, pool, depth), profiler
+                    )
+            else:
+                proc_results = (self.process_book(content, active) for content in contents)
+
+            for proc_result in proc_results:
                 if proc_result.success and proc_result.result:
-                    writer.write(proc_result.result)
+                    with active.stage("write"):
+                        writer.write(proc_result.result)
                     results.append(proc_result.result)
                 else:
-                    errors.append((str(file_path), proc_result.error or "Unknown error"))
+                    errors.append((proc_result.file_path, proc_result.error or "Unknown error"))
 
         completed_at = datetime.utcnow()
 
@@ -134,17 +501,313 @@ class TTRService:
             files_processed=len(results) + len(errors),
             files_succeeded=len(results),
             files_failed=len(errors),
+            files_resumed=len(completed),
             total_words=sum(r.total_words for r in results),
             started_at=started_at,
             completed_at=completed_at,
             errors=errors,
+            profile=profiler.summary() if profiler is not None else None,
+        )
+
+    @staticmethod
+    def _merge_profiles(
+        items: Iterator[tuple[ProcessingResult, dict]], profiler: Profiler
+    ) -> Iterator[ProcessingResult]:
+        """Fold profile totals returned by pool workers into profiler."""
+        for proc_result, totals in items:
+            profiler.merge(totals)
+            yield proc_result
+
+    def _iter_contents(
+        self,
+        author: str,
+        prefetch: int,
+        exclude_ids: Optional[set[str]] = None,
+    ) -> Iterator[BookContent]:
+        """Read stage: an author's books, optionally read ahead on threads."""
+        if prefetch <= 0:
+            return self._reader.iter_author_books(author, exclude_ids)
+        if isinstance(self._reader, ArchiveReader):
+            # Archive members must be streamed in order
+            return iter_ahead(self._reader.iter_author_books(author, exclude_ids), prefetch)
+        paths = (
+            path
+            for path in self._reader.iter_author_files(author)
+            if not (exclude_ids and self._reader.book_id(path) in exclude_ids)
+        )
+        return iter_prefetched(paths, self._reader.read, prefetch)
+
+    # -------------------------------------------------------------------------
+    # Distributed (work queue) mode
+    # -------------------------------------------------------------------------
+
+    def _config_hash(self) -> str:
+        """Hash of the settings that affect per-book results."""
+        return config_hash(self._ttr_config, self._lowercase, self._budget)
+
+    def _rotate_shards(self) -> None:
+        """Move shards of an earlier queue run aside (to ttr_shards.<timestamp>)."""
+        if self.shards_dir.exists() and any(self.shards_dir.glob("*.jsonl")):
+            stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+            self.shards_dir.rename(self.shards_dir.with_name(f"{self.shards_dir.name}.{stamp}"))
+
+    def enqueue_corpus(self, queue: TaskQueue, authors: Optional[list[str]] = None) -> int:
+        """
+        Coordinator step: queue one task per book.
+
+        The first enqueue into a queue records this service's configuration
+        hash in it and moves any shards left by an earlier run aside, so
+        their results cannot be merged into this one.
+
+        Args:
+            queue: Task queue shared by the workers
+            authors: Authors to queue (default: every available author)
+
+        Returns:
+            Number of newly queued books
+
+        Raises:
+            ValueError: If the queue was filled with different settings
+        """
+        run_config = self._config_hash()
+        if queue.run_config() is None:
+            self._rotate_shards()
+        if queue.set_run_config(run_config) != run_config:
+            raise ValueError("Queue was filled with different settings; use a new queue")
+        return queue.enqueue(
+            (author, str(path))
+            for author in authors or self.list_available_authors()
+            for path in self._reader.iter_author_files(author)
+        )
+
+    def run_queue_worker(
+        self,
+        queue: TaskQueue,
+        worker_id: str,
+        batch_size: int = 8,
+        wait: bool = True,
+        poll_interval: float = 5.0,
+    ) -> BatchProcessingStats:
+        """
+        Worker step: lease books from the queue until it is drained.
+
+        Results are appended to this worker's shard and flushed before the
+        task is marked done, so a crash never loses a completed result (at
+        worst a book is written twice and deduplicated by merge_shards).
+        Failed books are retried by the queue up to its max_attempts.
+
+        The shard starts with a header holding the configuration hash; a
+        shard left with another configuration is started afresh.
+
+        Args:
+            queue: Task queue shared by the workers
+            worker_id: Unique worker name (also the shard file name)
+            batch_size: Tasks leased per round trip
+            wait: Keep polling while other workers hold leases, so books
+                of workers that die are picked up once their lease expires
+            poll_interval: Seconds between polls when nothing is available
+
+        Returns:
+            BatchProcessingStats for this worker (author is the worker ID)
+
+        Raises:
+            ValueError: If the queue was filled with different settings
+        """
+        run_config = self._config_hash()
+        if queue.run_config() not in (None, run_config):
+            raise ValueError("Queue was filled with different settings than this worker's")
+
+        started_at = datetime.utcnow()
+        succeeded = total_words = 0
+        errors: list[tuple[str, str]] = []
+
+        shard_path = self.shards_dir / f"{worker_id}.jsonl"
+        fresh = _shard_config(shard_path) != run_config
+        with JSONLWriter(shard_path, append=not fresh) as writer:
+            if fresh:
+                header = {
+                    "_type": "run",
+                    "config_hash": run_config,
+                    "started_at": started_at.isoformat(),
+                }
+                writer.write(header)
+                writer.flush()
+            while True:
+                tasks = queue.lease(worker_id, limit=batch_size)
+                if not tasks:
+                    if not wait or queue.is_drained():
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                for task in tasks:
+                    queue.renew(worker_id)
+                    try:
+                        proc_result = self.process_book(self._reader.read(Path(task.file_path)))
+                    except Exception as e:
+                        proc_result = ProcessingResult(
+                            file_path=task.file_path, success=False, error=str(e), result=None
+                        )
+
+                    if proc_result.success and proc_result.result:
+                        writer.write(proc_result.result)
+                        writer.flush()
+                        queue.complete(task.id, worker_id)
+                        succeeded += 1
+                        total_words += proc_result.result.total_words
+                    else:
+                        error = proc_result.error or "Unknown error"
+                        queue.fail(task.id, worker_id, error)
+                        errors.append((task.file_path, error))
+
+        return BatchProcessingStats(
+            author=worker_id,
+            files_processed=succeeded + len(errors),
+            files_succeeded=succeeded,
+            files_failed=len(errors),
+            total_words=total_words,
+            started_at=started_at,
+            completed_at=datetime.utcnow(),
+            errors=errors,
         )
 
+    def merge_shards(
+        self, aggregate: bool = True, config: Optional[str] = None
+    ) -> dict[str, dict]:
+        """
+        Merge step: turn worker shards into the usual per-author outputs.
+
+        Writes metrics_dir/{author}.jsonl for every author in the shards
+        (one record per book, in the same order as process_author) and,
+        optionally, the per-author aggregates. Shards written with another
+        configuration are ignored; a book found more than once keeps its
+        newest record (shards are read oldest first, lines in order).
+
+        Args:
+            aggregate: Also write aggregates for the merged authors
+            config: Configuration hash to merge (default: this service's;
+                pass TaskQueue.run_config() to merge whatever the queue ran)
+
+        Returns:
+            Aggregates by author (empty if aggregate=False)
+        """
+        config = config or self._config_hash()
+        shards = [p for p in self.shards_dir.glob("*.jsonl") if _shard_config(p) == config]
+        by_author: dict[str, dict[str, str]] = {}
+        for shard in sorted(shards, key=lambda p: (p.stat().st_mtime_ns, p.name)):
+            with open(shard, "r", encoding="utf-8") as f:
+                next(f)  # Run header
+                for line in f:
+                    if not line.endswith("\n"):
+                        continue  # Torn write from a worker that died
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    by_author.setdefault(record["author"], {})[str(record["gutenberg_id"])] = line
+
+        aggregates: dict[str, dict] = {}
+        self.metrics_dir.mkdir(parents=True, exist_ok=True)
+        for author, lines in sorted(by_author.items()):
+            order = {
+                self._reader.book_id(path): i
+                for i, path in enumerate(self._reader.iter_author_files(author))
+            }
+            ids = sorted(lines, key=lambda gutenberg_id: order.get(gutenberg_id, len(order)))
+            with open(self.metrics_dir / f"{author}.jsonl", "w", encoding="utf-8") as f:
+                f.writelines(lines[gutenberg_id] for gutenberg_id in ids)
+            if aggregate:
+                aggregates[author] = self.aggregate_author(author)
+        return aggregates
+
+    # -------------------------------------------------------------------------
+    # Estimation mode
+    # -------------------------------------------------------------------------
+
+    def estimate_sttr(
+        self,
+        authors: Optional[list[str]] = None,
+        samples_per_book: int = DEFAULT_SAMPLES,
+        max_books: Optional[int] = None,
+        confidence: float = 0.95,
+        n_bootstrap: int = 1000,
+        seed: int = 0,
+    ) -> list[STTREstimate]:
+        """
+        Estimate author STTR from random chunks and rank the authors.
+
+        Each book contributes samples_per_book chunks of
+        ttr_config.sttr_chunk_size tokens read from random byte offsets,
+        so whole books are never tokenized. Results are written to
+        estimates_dir/sttr_sampled.jsonl.
+
+        Args:
+            authors: Authors to estimate (default: every available author)
+            samples_per_book: Chunks drawn per book
+            max_books: Randomly sample at most this many books per author
+            confidence: Two-sided coverage of the intervals
+            n_bootstrap: Bootstrap replicates per author
+            seed: Seed for chunk offsets, book subsets and the bootstrap
+
+        Returns:
+            Estimates ordered by rank (highest STTR first)
+        """
+        config = self._ttr_config or TTRConfig()
+        sampler = ChunkSampler(self._tokenizer, config.sttr_chunk_size, samples_per_book)
+        rng = np.random.default_rng(seed)
+        picker = random.Random(seed)
+
+        rows: list[tuple[str, int, int, float, Optional[float], Optional[float]]] = []
+        for author in authors or self.list_available_authors():
+            paths = list(self._reader.iter_author_files(author))
+            if max_books is not None and len(paths) > max_books:
+                paths = sorted(picker.sample(paths, max_books))
+
+            book_means: list[float] = []
+            chunks = 0
+            for path in paths:
+                if isinstance(self._reader, ArchiveReader):
+                    ttrs = sampler.sample_text(self._reader.read(path).text, rng)
+                else:
+                    ttrs = sampler.sample_file(path, rng)
+                if len(ttrs):
+                    book_means.append(float(ttrs.mean()))
+                    chunks += len(ttrs)
+
+            if book_means:
+                estimate, low, high = estimate_with_interval(
+                    np.asarray(book_means), confidence, n_bootstrap, rng
+                )
+                rows.append((author, len(book_means), chunks, estimate, low, high))
+
+        rows.sort(key=lambda row: row[3], reverse=True)
+        estimates = [
+            STTREstimate(
+                author=author,
+                rank=rank,
+                books=books,
+                chunks=chunks,
+                chunk_size=config.sttr_chunk_size,
+                sttr=round(estimate, 6),
+                ci_low=round(low, 6) if low is not None else None,
+                ci_high=round(high, 6) if high is not None else None,
+            )
+            for rank, (author, books, chunks, estimate, low, high) in enumerate(rows, start=1)
+        ]
+
+        with JSONLWriter(self.estimates_dir / "sttr_sampled.jsonl") as writer:
+            for estimate in estimates:
+                writer.write(estimate)
+        return estimates
+
     def aggregate_author(self, author: str) -> dict:
         """
         Aggregate per-book results into author statistics.
 
-        Reads from the per-book JSONL and writes aggregate JSON.
+        Reads from the per-book JSONL and writes aggregate JSON. With a
+        SQLite store, the statistics are computed by SQL queries instead
+        (only books with vocabulary sketches are loaded), and the aggregate
+        is also stored in the database.
 
         Args:
             author: Author identifier
@@ -152,29 +815,238 @@ class TTRService:
         Returns:
             Aggregate statistics dict
         """
-        from gutenburg_stylometry.io.writer import JSONLReader
+        if self._store is not None:
+            aggregates = self._store.aggregate(author)
+            if aggregates is None:
+                raise ValueError(f"No results found for author: {author}")
+            aggregates["heaps_beta_mean"] = self._store.heaps_beta_mean(author)
+            aggregates.update(TTRAggregator.vocabulary(self._store.sketched_results(author)))
+        else:
+            # Read per-book results (our own output, so without validation)
+            columns = self.load_columns(author)
 
-        # Read per-book results
-        input_path = self.metrics_dir / f"{author}.jsonl"
-        if not input_path.exists():
-            raise FileNotFoundError(f"No metrics found for author: {author}")
+            if not len(columns):
+                raise ValueError(f"No results found for author: {author}")
 
-        reader = JSONLReader(input_path)
-        results = [TTRResult(**record) for record in reader]
-
-        if not results:
-            raise ValueError(f"No results found for author: {author}")
-
-        # Compute aggregates
-        aggregates = self._aggregator.aggregate(results, author)
+            # Compute aggregates
+            aggregates = self._aggregator.aggregate_columns(columns, author)
         aggregates["generated_at"] = datetime.utcnow().isoformat()
 
         # Write aggregate file
         output_path = self.aggregates_dir / f"{author}.json"
         JSONWriter.write(output_path, aggregates)
+        if self._store is not None:
+            self._store.write_aggregate(author, aggregates)
+
+        return aggregates
+
+    def aggregate_corpus(self, authors: Optional[list[str]] = None) -> dict:
+        """
+        Corpus-level vocabulary from the per-book HyperLogLog sketches.
+
+        Requires results computed with TTRConfig(vocabulary_sketch=True).
+        Authors are loaded one at a time, so memory stays at one author's
+        results plus two sketches. Writes corpus_aggregate_path.
+
+        Args:
+            authors: Authors to include (default: every processed author)
+
+        Returns:
+            Dict with corpus totals, vocabulary_estimate, corpus_ttr and a
+            per-author vocabulary_estimate map
+        """
+        corpus: Optional[HyperLogLog] = None
+        per_author: dict[str, int] = {}
+        books = words = 0
+
+        for author in authors or self.list_processed_authors():
+            sketched = [r for r in self.load_results(author) if r.vocabulary_sketch]
+            union = TTRAggregator.union_sketch(sketched)
+            if union is None:
+                continue
+            per_author[author] = round(union.estimate())
+            books += len(sketched)
+            words += sum(r.total_words for r in sketched)
+            if corpus is None:
+                corpus = union
+            else:
+                corpus.update(union)
+
+        if corpus is None:
+            raise ValueError("No vocabulary sketches found; run with vocabulary_sketch=True")
 
+        estimate = round(corpus.estimate())
+        aggregates = {
+            "authors": len(per_author),
+            "book_count": books,
+            "total_words": words,
+            "vocabulary_estimate": estimate,
+            "vocabulary_error": round(corpus.relative_error, 6),
+            "corpus_ttr": round(estimate / words, 6) if words else None,
+            "author_vocabulary": per_author,
+            "generated_at": datetime.utcnow().isoformat(),
+        }
+        JSONWriter.write(self.corpus_aggregate_path, aggregates)
         return aggregates
 
+    def load_results(self, author: str) -> list[TTRResult]:
+        """
+        Load the per-book results written by process_author.
+
+        Args:
+            author: Author identifier
+
+        Returns:
+            List of per-book TTR results
+        """
+        if self._store is not None:
+            results = self._store.load_results(author)
+            if not results:
+                raise FileNotFoundError(f"No metrics found for author: {author}")
+            return results
+
+        input_path = self.metrics_dir / f"{author}.jsonl"
+        if not input_path.exists():
+            raise FileNotFoundError(f"No metrics found for author: {author}")
+
+        # A run resumed after a crash may have written a book twice
+        results: dict[str, TTRResult] = {}
+        for line in JSONLReader(input_path).lines():
+            result = TTRResult.model_validate_json(line)
+            results.setdefault(result.gutenberg_id, result)
+        return list(results.values())
+
+    def load_columns(self, author: str) -> ResultColumns:
+        """
+        Load an author's per-book results as columns, for aggregation.
+
+        The trusted fast path for re-reading process_author's output:
+        JSONL records go straight into arrays without building a TTRResult
+        per book. Use load_results for validated models.
+
+        Args:
+            author: Author identifier
+
+        Returns:
+            ResultColumns (duplicate books counted once)
+        """
+        if self._store is not None:
+            return ResultColumns.from_results(self.load_results(author))
+
+        input_path = self.metrics_dir / f"{author}.jsonl"
+        if not input_path.exists():
+            raise FileNotFoundError(f"No metrics found for author: {author}")
+        return ResultColumns.from_records(_first_per_book(JSONLReader(input_path)))
+
+    def list_processed_authors(self) -> list[str]:
+        """List authors that have per-book results in the metrics directory (or store)."""
+        if self._store is not None:
+            return self._store.authors()
+        if not self.metrics_dir.exists():
+            return []
+        return sorted(p.stem for p in self.metrics_dir.glob("*.jsonl"))
+
+    def build_char_ngram_profiles(
+        self,
+        author: str,
+        profiler: Optional[CharNgramProfiler] = None,
+        top_k: int = DEFAULT_TOP_K,
+        prefetch: int = 0,
+    ) -> dict[str, CharNgramProfile]:
+        """
+        Profile an author's books by hashed character n-grams.
+
+        Profiles are taken over the tokenizer-normalized text and saved to
+        char_ngrams_dir/{author}.npz.
+
+        Args:
+            author: Author identifier
+            profiler: Profiler to use (default: CharNgramProfiler())
+            top_k: Buckets kept per book
+            prefetch: Books to read ahead on background threads (0 = off)
+
+        Returns:
+            Mapping of gutenberg_id to profile
+        """
+        profiler = profiler or CharNgramProfiler()
+        profiles = {
+            content.gutenberg_id: profiler.profile(self._tokenizer.normalize(content.text), top_k)
+            for content in self._iter_contents(author, prefetch)
+        }
+        save_profiles(self.char_ngrams_dir / f"{author}.npz", profiles)
+        return profiles
+
+    def load_char_ngram_profiles(self, author: str) -> dict[str, CharNgramProfile]:
+        """Load the profiles written by build_char_ngram_profiles (empty if none)."""
+        path = self.char_ngrams_dir / f"{author}.npz"
+        return load_profiles(path) if path.exists() else {}
+
+    def build_word_ngrams(
+        self,
+        author: str,
+        counter: Optional[WordNgramCounter] = None,
+        prefetch: int = 0,
+    ) -> WordNgramCounter:
+        """
+        Count an author's word n-grams and collocations.
+
+        Books are tokenized and streamed into the counter one at a time,
+        so memory stays at the counter's fixed size. The counter is saved
+        to word_ngrams_dir/{author}.npz; counters of several authors
+        merge into corpus counts with WordNgramCounter.merge().
+
+        Args:
+            author: Author identifier
+            counter: Counter to add to (default: WordNgramCounter())
+            prefetch: Books to read ahead on background threads (0 = off)
+
+        Returns:
+            The counter
+        """
+        counter = counter or WordNgramCounter()
+        for content in self._iter_contents(author, prefetch):
+            counter.add_tokens(self._tokenizer.tokenize(content.text))
+        counter.save(self.word_ngrams_dir / f"{author}.npz")
+        return counter
+
+    def load_word_ngrams(self, author: str) -> Optional[WordNgramCounter]:
+        """Load the counter written by build_word_ngrams (None if none)."""
+        path = self.word_ngrams_dir / f"{author}.npz"
+        return WordNgramCounter.load(path) if path.exists() else None
+
+    def build_fingerprint_index(
+        self,
+        authors: Optional[list[str]] = None,
+        char_ngram_dims: Optional[int] = None,
+        profile_weight: float = 1.0,
+    ) -> FingerprintIndex:
+        """
+        Build and persist a similarity index over per-book fingerprints.
+
+        Args:
+            authors: Authors to include (default: every processed author)
+            char_ngram_dims: Extend fingerprints with character n-gram
+                profiles folded to this many dimensions (a power of two);
+                books without a saved profile get a zero block
+            profile_weight: Relative weight of the n-gram block
+
+        Returns:
+            The FingerprintIndex, also saved to index_path
+        """
+        results: list[TTRResult] = []
+        profiles: dict[str, np.ndarray] = {}
+        for author in authors or self.list_processed_authors():
+            results.extend(self.load_results(author))
+            if char_ngram_dims:
+                for gutenberg_id, profile in self.load_char_ngram_profiles(author).items():
+                    profiles[gutenberg_id] = profile.dense(char_ngram_dims)
+
+        index = FingerprintIndex.from_results(
+            results, profiles=profiles or None, profile_weight=profile_weight
+        )
+        index.save(self.index_path)
+        return index
+
     def process_and_aggregate_author(self, author: str) -> tuple[BatchProcessingStats, dict]:
         """
         Full pipeline: process all books and aggregate.
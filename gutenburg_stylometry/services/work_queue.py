@@ -0,0 +1,250 @@
+"""
+SQLite-backed task queue for multi-process / multi-node corpus runs.
+
+Each task is one book. Workers lease batches of tasks for a fixed time;
+a lease that is not completed before it expires (a dead or stalled
+worker) makes the task available again, up to max_attempts leases, after
+which it is marked failed. No external services are needed: the queue is
+a single SQLite file.
+
+The queue also records the configuration hash of the run it was filled
+for (see checkpoint.config_hash), so workers and merges started with
+different settings can be refused instead of mixing results.
+
+Journal mode: WAL (the default) is fastest but requires every worker to
+run on the same host. For workers on several nodes sharing a network
+filesystem, open the queue with journal_mode="DELETE".
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+
+DEFAULT_LEASE_SECONDS = 600.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    author TEXT NOT NULL,
+    file_path TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    error TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, lease_expires);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class Task(NamedTuple):
+    """A leased unit of work."""
+
+    id: int
+    author: str
+    file_path: str
+    attempts: int
+
+
+class TaskQueue:
+    """
+    Book-level work queue stored in SQLite.
+
+    Statuses: pending -> leased -> done, or back to pending on failure or
+    lease expiry, or failed once max_attempts is reached.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        journal_mode: str = "WAL",
+    ):
+        """
+        Open (and create if needed) a queue database.
+
+        Args:
+            db_path: SQLite file path
+            lease_seconds: How long a lease lasts before the task is retried
+            max_attempts: Leases per task before it is marked failed
+            journal_mode: SQLite journal mode ('WAL' or 'DELETE')
+        """
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lease_seconds = lease_seconds
+        self._max_attempts = max_attempts
+        self._conn = sqlite3.connect(db_path, timeout=60.0, isolation_level=None)
+        self._conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "TaskQueue":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def enqueue(self, tasks: Iterable[tuple[str, str]]) -> int:
+        """
+        Add books to the queue (already queued paths are ignored).
+
+        Args:
+            tasks: (author, file_path) pairs
+
+        Returns:
+            Number of new tasks
+        """
+        now = time.time()
+        before = self._conn.total_changes
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO tasks (author, file_path, updated_at) VALUES (?, ?, ?)",
+                ((author, str(file_path), now) for author, file_path in tasks),
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return self._conn.total_changes - before
+
+    def run_config(self) -> Optional[str]:
+        """Return the configuration hash the queue was filled for, if recorded."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'config_hash'").fetchone()
+        return row[0] if row else None
+
+    def set_run_config(self, config: str) -> str:
+        """
+        Record the run's configuration hash unless one is already set.
+
+        Args:
+            config: Hash from checkpoint.config_hash()
+
+        Returns:
+            The hash in force (the existing one if it was already set)
+        """
+        self._conn.execute(
+            "INSERT OR IGNORE INTO meta (key, value) VALUES ('config_hash', ?)", (config,)
+        )
+        return self.run_config()
+
+    def lease(self, worker_id: str, limit: int = 8) -> list[Task]:
+        """
+        Atomically lease up to limit available tasks.
+
+        Expired leases that have used up their attempts are marked failed
+        first; other expired leases are handed out again.
+
+        Args:
+            worker_id: Unique worker identifier
+            limit: Maximum tasks to lease
+
+        Returns:
+            Leased tasks (empty if nothing is available)
+        """
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "UPDATE tasks SET status = 'failed', error = 'lease expired', updated_at = ? "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self._max_attempts),
+            )
+            rows = self._conn.execute(
+                "SELECT id, author, file_path, attempts FROM tasks "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY id LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE tasks SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                ((worker_id, now + self._lease_seconds, now, row[0]) for row in rows),
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return [Task(row[0], row[1], row[2], row[3] + 1) for row in rows]
+
+    def renew(self, worker_id: str) -> int:
+        """
+        Extend every lease held by a worker.
+
+        Args:
+            worker_id: Worker identifier
+
+        Returns:
+            Number of leases renewed
+        """
+        now = time.time()
+        cursor = self._conn.execute(
+            "UPDATE tasks SET lease_expires = ?, updated_at = ? "
+            "WHERE status = 'leased' AND lease_owner = ?",
+            (now + self._lease_seconds, now, worker_id),
+        )
+        return cursor.rowcount
+
+    def complete(self, task_id: int, worker_id: str) -> bool:
+        """
+        Mark a leased task done.
+
+        Args:
+            task_id: Task ID
+            worker_id: Worker holding the lease
+
+        Returns:
+            False if the lease had already been taken over by another worker
+        """
+        cursor = self._conn.execute(
+            "UPDATE tasks SET status = 'done', error = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (time.time(), task_id, worker_id),
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, task_id: int, worker_id: str, error: str) -> None:
+        """
+        Report a failed attempt; the task is retried until max_attempts.
+
+        Args:
+            task_id: Task ID
+            worker_id: Worker holding the lease
+            error: Error message
+        """
+        self._conn.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (self._max_attempts, error, time.time(), task_id, worker_id),
+        )
+
+    def counts(self) -> dict[str, int]:
+        """Return the number of tasks per status."""
+        rows = self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status")
+        return {status: count for status, count in rows}
+
+    def failures(self) -> list[tuple[str, Optional[str]]]:
+        """Return (file_path, error) for every failed task."""
+        rows = self._conn.execute(
+            "SELECT file_path, error FROM tasks WHERE status = 'failed' ORDER BY id"
+        )
+        return list(rows)
+
+    def is_drained(self) -> bool:
+        """True when no task is pending or leased."""
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM tasks WHERE status IN ('pending', 'leased')"
+        ).fetchone()
+        return row[0] == 0
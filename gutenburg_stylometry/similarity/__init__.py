@@ -0,0 +1,18 @@
+"""Stylometric similarity search."""
+
+from typing import TYPE_CHECKING
+
+from gutenburg_stylometry._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from gutenburg_stylometry.similarity.fingerprint import FingerprintBuilder, FINGERPRINT_FIELDS
+    from gutenburg_stylometry.similarity.index import FingerprintIndex, Neighbor
+
+__all__ = ["FingerprintBuilder", "FINGERPRINT_FIELDS", "FingerprintIndex", "Neighbor"]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "FingerprintBuilder": "gutenburg_stylometry.similarity.fingerprint",
+    "FINGERPRINT_FIELDS": "gutenburg_stylometry.similarity.fingerprint",
+    "FingerprintIndex": "gutenburg_stylometry.similarity.index",
+    "Neighbor": "gutenburg_stylometry.similarity.index",
+})
@@ -0,0 +1,143 @@
+"""
+Stylometric fingerprint vectors.
+
+A fingerprint is a fixed-length float vector per book built from the
+TTRResult metric fields, optionally extended with a frequency profile
+(function words, character n-grams, ...). Metric columns are z-scored
+against the corpus so that no single metric dominates the distance.
+"""
+
+from dataclasses import dataclass, field
+from typing import Mapping, Optional, Sequence
+
+import numpy as np
+
+from gutenburg_stylometry.models import TTRResult
+
+
+# TTRResult fields that make up the metric block of a fingerprint
+FINGERPRINT_FIELDS: tuple[str, ...] = (
+    "ttr",
+    "root_ttr",
+    "log_ttr",
+    "sttr",
+    "sttr_std",
+    "delta_mean",
+    "delta_std",
+    "delta_min",
+    "delta_max",
+)
+
+
+def metric_matrix(results: Sequence[TTRResult]) -> np.ndarray:
+    """
+    Collect fingerprint fields into a (books x fields) matrix.
+
+    Missing optional metrics (short books without STTR) become NaN.
+
+    Args:
+        results: Per-book TTR results
+
+    Returns:
+        float64 matrix with one row per result
+    """
+    matrix = np.full((len(results), len(FINGERPRINT_FIELDS)), np.nan, dtype=np.float64)
+    for row, result in enumerate(results):
+        for col, name in enumerate(FINGERPRINT_FIELDS):
+            value = getattr(result, name)
+            if value is not None:
+                matrix[row, col] = value
+    return matrix
+
+
+@dataclass
+class FingerprintBuilder:
+    """
+    Turns metric rows and frequency profiles into unit-length fingerprints.
+
+    The builder is fitted once on the corpus; the fitted column statistics
+    are kept so that query books outside the corpus land in the same space.
+    """
+
+    profile_weight: float = 1.0  # Relative weight of the profile block
+    mean: Optional[np.ndarray] = field(default=None, repr=False)
+    scale: Optional[np.ndarray] = field(default=None, repr=False)
+
+    def fit(self, metrics: np.ndarray) -> "FingerprintBuilder":
+        """
+        Learn per-column mean and standard deviation (NaN-aware).
+
+        Args:
+            metrics: Matrix from metric_matrix()
+
+        Returns:
+            self, for chaining
+        """
+        with np.errstate(invalid="ignore"):
+            mean = np.nanmean(metrics, axis=0) if len(metrics) else np.zeros(metrics.shape[1])
+            scale = np.nanstd(metrics, axis=0) if len(metrics) else np.ones(metrics.shape[1])
+        self.mean = np.nan_to_num(mean, nan=0.0)
+        self.scale = np.where(np.nan_to_num(scale, nan=0.0) > 0, scale, 1.0)
+        return self
+
+    def transform(
+        self,
+        metrics: np.ndarray,
+        profiles: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Build L2-normalized fingerprint vectors.
+
+        Args:
+            metrics: Matrix from metric_matrix()
+            profiles: Optional (books x dims) frequency profile matrix
+
+        Returns:
+            float32 matrix of unit-length fingerprints
+        """
+        if self.mean is None or self.scale is None:
+            raise RuntimeError("FingerprintBuilder must be fitted before transform()")
+
+        # Missing metrics sit at the corpus mean (zero after scaling)
+        block = np.nan_to_num((metrics - self.mean) / self.scale, nan=0.0)
+        block /= np.sqrt(block.shape[1])
+        blocks = [block]
+
+        if profiles is not None:
+            profiles = np.asarray(profiles, dtype=np.float64)
+            norms = np.linalg.norm(profiles, axis=1, keepdims=True)
+            blocks.append(self.profile_weight * profiles / np.where(norms > 0, norms, 1.0))
+
+        vectors = np.hstack(blocks)
+        return normalize_rows(vectors).astype(np.float32)
+
+
+def profile_matrix(
+    ids: Sequence[str],
+    profiles: Mapping[str, np.ndarray],
+) -> np.ndarray:
+    """
+    Stack per-book profile vectors in the order of ids.
+
+    Books without a profile get a zero row.
+
+    Args:
+        ids: Gutenberg IDs in row order
+        profiles: Mapping of gutenberg_id to a 1-D profile vector
+
+    Returns:
+        (books x dims) float64 matrix
+    """
+    dims = len(next(iter(profiles.values())))
+    matrix = np.zeros((len(ids), dims), dtype=np.float64)
+    for row, gutenberg_id in enumerate(ids):
+        profile = profiles.get(gutenberg_id)
+        if profile is not None:
+            matrix[row] = profile
+    return matrix
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row to unit L2 norm (zero rows are left as-is)."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
@@ -0,0 +1,431 @@
+"""
+Nearest-neighbour index over stylometric fingerprints.
+
+Answers "which books (or authors) are stylistically closest to this one"
+using cosine similarity between fingerprint vectors.
+
+Two search modes are supported:
+
+1. Exact: blocked matrix multiplication over the whole corpus, keeping a
+   running top-k per query so memory stays bounded by the block size.
+2. Approximate: random-hyperplane LSH codes (SimHash). Candidates are
+   ranked by Hamming distance and then re-scored exactly.
+
+The index persists to a single .npz file and loads without pickling.
+"""
+
+from pathlib import Path
+from typing import Mapping, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from gutenburg_stylometry.models import TTRResult
+from gutenburg_stylometry.similarity.fingerprint import (
+    FINGERPRINT_FIELDS,
+    FingerprintBuilder,
+    metric_matrix,
+    normalize_rows,
+    profile_matrix,
+)
+
+
+DEFAULT_BLOCK_SIZE = 65536  # Corpus rows scored per matmul block
+DEFAULT_LSH_BITS = 128  # Hyperplanes for approximate search
+
+# Popcount lookup for uint8 Hamming distances
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class Neighbor(NamedTuple):
+    """A single search hit."""
+
+    gutenberg_id: str
+    author: str
+    score: float  # Cosine similarity in [-1, 1]
+
+
+class FingerprintIndex:
+    """
+    In-process similarity index over unit-length fingerprint vectors.
+
+    Rows are identified by gutenberg_id (or author name for author-level
+    indexes built with author_index()).
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        ids: Sequence[str],
+        authors: Sequence[str],
+        builder: Optional[FingerprintBuilder] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ):
+        """
+        Initialize index.
+
+        Args:
+            vectors: (rows x dims) fingerprint matrix (normalized on load)
+            ids: Row identifiers (gutenberg_id)
+            authors: Author of each row
+            builder: Fitted builder used to embed query results
+            block_size: Rows scored per matmul block in exact search
+        """
+        if len(vectors) != len(ids) or len(ids) != len(authors):
+            raise ValueError("vectors, ids and authors must have the same length")
+
+        self._vectors = np.ascontiguousarray(normalize_rows(np.asarray(vectors)), dtype=np.float32)
+        self._ids = [str(i) for i in ids]
+        self._authors = [str(a) for a in authors]
+        self._rows = {gutenberg_id: row for row, gutenberg_id in enumerate(self._ids)}
+        self._builder = builder
+        self._block_size = block_size
+        self._planes: Optional[np.ndarray] = None
+        self._codes: Optional[np.ndarray] = None
+        self._author_index: Optional["FingerprintIndex"] = None
+
+    # -------------------------------------------------------------------------
+    # Construction
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def from_results(
+        cls,
+        results: Sequence[TTRResult],
+        profiles: Optional[Mapping[str, np.ndarray]] = None,
+        profile_weight: float = 1.0,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> "FingerprintIndex":
+        """
+        Build an index from per-book TTR results.
+
+        Args:
+            results: Per-book TTR results
+            profiles: Optional gutenberg_id -> frequency profile vectors
+            profile_weight: Relative weight of the profile block
+            block_size: Rows scored per matmul block in exact search
+
+        Returns:
+            Populated FingerprintIndex
+        """
+        if not results:
+            raise ValueError("Cannot build an index from an empty results list")
+
+        ids = [r.gutenberg_id for r in results]
+        metrics = metric_matrix(results)
+        builder = FingerprintBuilder(profile_weight=profile_weight).fit(metrics)
+        profile_block = profile_matrix(ids, profiles) if profiles else None
+        vectors = builder.transform(metrics, profile_block)
+
+        return cls(
+            vectors=vectors,
+            ids=ids,
+            authors=[r.author for r in results],
+            builder=builder,
+            block_size=block_size,
+        )
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def dims(self) -> int:
+        """Fingerprint dimensionality."""
+        return self._vectors.shape[1]
+
+    def embed(self, result: TTRResult, profile: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Embed a result that is not (necessarily) in the index.
+
+        Args:
+            result: TTR result for the query book
+            profile: Frequency profile, if the index was built with profiles
+
+        Returns:
+            Unit-length fingerprint vector
+
+        Raises:
+            ValueError: If the profile does not match the index's profile block
+        """
+        if self._builder is None:
+            raise RuntimeError("Index has no fitted builder; cannot embed new results")
+        profile_dims = self.dims - len(FINGERPRINT_FIELDS)
+        if profile is None and profile_dims:
+            raise ValueError(f"Index uses {profile_dims}-dim frequency profiles; pass profile")
+        if profile is not None and np.shape(profile) != (profile_dims,):
+            raise ValueError(
+                f"Profile has shape {np.shape(profile)}, index expects ({profile_dims},)"
+            )
+        profiles = None if profile is None else np.asarray(profile)[None, :]
+        return self._builder.transform(metric_matrix([result]), profiles)[0]
+
+    # -------------------------------------------------------------------------
+    # Search
+    # -------------------------------------------------------------------------
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int = 10,
+        approximate: bool = False,
+        candidates: Optional[int] = None,
+        exclude_rows: Optional[np.ndarray] = None,
+    ) -> list[list[Neighbor]]:
+        """
+        Find the k most similar rows for each query vector.
+
+        Args:
+            queries: (q x dims) query matrix or a single vector
+            k: Number of neighbours per query
+            approximate: Use LSH candidate generation (see enable_approximate)
+            candidates: LSH candidates re-scored per query (default 20 * k)
+            exclude_rows: Optional row index per query to leave out (-1 for none)
+
+        Returns:
+            One list of Neighbor per query, best first
+
+        Raises:
+            ValueError: If k is less than 1
+        """
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        queries = normalize_rows(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        if exclude_rows is None:
+            exclude_rows = np.full(len(queries), -1, dtype=np.int64)
+
+        if approximate:
+            rows, scores = self._search_lsh(queries, k, candidates or 20 * k, exclude_rows)
+        else:
+            rows, scores = self._search_exact(queries, k, exclude_rows)
+
+        return [
+            [
+                Neighbor(self._ids[row], self._authors[row], round(float(score), 6))
+                for row, score in zip(row_hits, score_hits)
+                if row >= 0
+            ]
+            for row_hits, score_hits in zip(rows, scores)
+        ]
+
+    def query(self, gutenberg_id: str, k: int = 10, approximate: bool = False) -> list[Neighbor]:
+        """
+        Find the books closest to an indexed book (excluding itself).
+
+        Args:
+            gutenberg_id: ID of an indexed row
+            k: Number of neighbours
+            approximate: Use LSH candidate generation
+
+        Returns:
+            Neighbours, best first
+        """
+        row = self._rows.get(gutenberg_id)
+        if row is None:
+            raise KeyError(f"Not in index: {gutenberg_id}")
+        return self.search(
+            self._vectors[row],
+            k=k,
+            approximate=approximate,
+            exclude_rows=np.array([row]),
+        )[0]
+
+    def query_result(
+        self,
+        result: TTRResult,
+        k: int = 10,
+        profile: Optional[np.ndarray] = None,
+        approximate: bool = False,
+    ) -> list[Neighbor]:
+        """
+        Find the indexed books closest to an arbitrary TTR result.
+
+        Args:
+            result: Query book metrics
+            k: Number of neighbours
+            profile: Query frequency profile (if the index uses profiles)
+            approximate: Use LSH candidate generation
+
+        Returns:
+            Neighbours, best first
+        """
+        return self.search(self.embed(result, profile), k=k, approximate=approximate)[0]
+
+    def _search_exact(
+        self,
+        queries: np.ndarray,
+        k: int,
+        exclude_rows: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Blocked matmul with a running top-k per query."""
+        n_queries = len(queries)
+        k = min(k, len(self._ids))
+        best_scores = np.full((n_queries, k), -np.inf, dtype=np.float32)
+        best_rows = np.full((n_queries, k), -1, dtype=np.int64)
+
+        for start in range(0, len(self._ids), self._block_size):
+            block = self._vectors[start : start + self._block_size]
+            scores = queries @ block.T
+
+            # Mask excluded rows that fall inside this block
+            hit = (exclude_rows >= start) & (exclude_rows < start + len(block))
+            scores[np.nonzero(hit)[0], exclude_rows[hit] - start] = -np.inf
+
+            rows = np.broadcast_to(np.arange(start, start + len(block)), scores.shape)
+            merged_scores = np.concatenate([best_scores, scores], axis=1)
+            merged_rows = np.concatenate([best_rows, rows], axis=1)
+            top = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(merged_scores, top, axis=1)
+            best_rows = np.take_along_axis(merged_rows, top, axis=1)
+
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        best_rows[~np.isfinite(best_scores)] = -1
+        return best_rows, best_scores
+
+    # -------------------------------------------------------------------------
+    # Approximate search (random-hyperplane LSH)
+    # -------------------------------------------------------------------------
+
+    def enable_approximate(self, n_bits: int = DEFAULT_LSH_BITS, seed: int = 0) -> None:
+        """
+        Compute SimHash codes for approximate search.
+
+        Args:
+            n_bits: Number of random hyperplanes (multiple of 8)
+            seed: RNG seed for reproducible hyperplanes
+        """
+        if n_bits % 8:
+            raise ValueError("n_bits must be a multiple of 8")
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((self.dims, n_bits)).astype(np.float32)
+        self._codes = self._encode(self._vectors)
+
+    def _encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Pack the sign of each hyperplane projection into bytes."""
+        return np.packbits(vectors @ self._planes > 0, axis=1)
+
+    def _search_lsh(
+        self,
+        queries: np.ndarray,
+        k: int,
+        candidates: int,
+        exclude_rows: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Rank by Hamming distance, then re-score candidates exactly."""
+        if self._codes is None:
+            self.enable_approximate()
+
+        k = min(k, len(self._ids))
+        candidates = min(max(candidates, k + 1), len(self._ids))
+        query_codes = self._encode(queries)
+        rows_out = np.full((len(queries), k), -1, dtype=np.int64)
+        scores_out = np.full((len(queries), k), -np.inf, dtype=np.float32)
+
+        for q, code in enumerate(query_codes):
+            distances = _POPCOUNT[self._codes ^ code].sum(axis=1, dtype=np.uint16)
+            pool = np.argpartition(distances, candidates - 1)[:candidates]
+            pool = pool[pool != exclude_rows[q]]
+            scores = self._vectors[pool] @ queries[q]
+            top = np.argsort(-scores, kind="stable")[:k]
+            rows_out[q, : len(top)] = pool[top]
+            scores_out[q, : len(top)] = scores[top]
+
+        return rows_out, scores_out
+
+    # -------------------------------------------------------------------------
+    # Author level
+    # -------------------------------------------------------------------------
+
+    def author_index(self) -> "FingerprintIndex":
+        """
+        Build (and cache) an index of per-author centroid fingerprints.
+
+        Returns:
+            FingerprintIndex whose ids are author identifiers
+        """
+        if self._author_index is None:
+            names, inverse = np.unique(np.array(self._authors), return_inverse=True)
+            order = np.argsort(inverse, kind="stable")
+            starts = np.searchsorted(inverse[order], np.arange(len(names)))
+            centroids = np.add.reduceat(self._vectors[order].astype(np.float64), starts, axis=0)
+            self._author_index = FingerprintIndex(
+                vectors=centroids,
+                ids=names.tolist(),
+                authors=names.tolist(),
+                builder=self._builder,
+                block_size=self._block_size,
+            )
+        return self._author_index
+
+    def nearest_authors(self, author: str, k: int = 10) -> list[Neighbor]:
+        """
+        Find the authors whose centroid is closest to the given author's.
+
+        Args:
+            author: Author identifier present in the index
+            k: Number of neighbours
+
+        Returns:
+            Neighbours (gutenberg_id holds the author name), best first
+        """
+        return self.author_index().query(author, k=k)
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def save(self, file_path: Path) -> None:
+        """
+        Persist the index to a single .npz file.
+
+        Args:
+            file_path: Output path
+        """
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            "vectors": self._vectors,
+            "ids": np.array(self._ids),
+            "authors": np.array(self._authors),
+            "block_size": np.array(self._block_size),
+        }
+        if self._builder is not None:
+            arrays["mean"] = self._builder.mean
+            arrays["scale"] = self._builder.scale
+            arrays["profile_weight"] = np.array(self._builder.profile_weight)
+        if self._planes is not None:
+            arrays["planes"] = self._planes
+            arrays["codes"] = self._codes
+
+        with open(file_path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, file_path: Path) -> "FingerprintIndex":
+        """
+        Load an index written by save().
+
+        Args:
+            file_path: Path to .npz file
+
+        Returns:
+            FingerprintIndex ready for queries
+        """
+        with np.load(file_path, allow_pickle=False) as data:
+            builder = None
+            if "mean" in data:
+                builder = FingerprintBuilder(
+                    profile_weight=float(data["profile_weight"]),
+                    mean=data["mean"],
+                    scale=data["scale"],
+                )
+            index = cls(
+                vectors=data["vectors"],
+                ids=data["ids"].tolist(),
+                authors=data["authors"].tolist(),
+                builder=builder,
+                block_size=int(data["block_size"]),
+            )
+            if "planes" in data:
+                index._planes = data["planes"]
+                index._codes = data["codes"]
+        return index
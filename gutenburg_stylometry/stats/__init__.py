@@ -0,0 +1,38 @@
+"""Statistical utilities for cross-author comparison."""
+
+from typing import TYPE_CHECKING
+
+from gutenburg_stylometry._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from gutenburg_stylometry.stats.resampling import (
+        bootstrap_group_means,
+        cohens_d_matrix,
+        pairwise_difference_intervals,
+        percentile_interval,
+    )
+    from gutenburg_stylometry.stats.significance import (
+        benjamini_hochberg,
+        pairwise_tests,
+        run_pair_test,
+    )
+
+__all__ = [
+    "benjamini_hochberg",
+    "bootstrap_group_means",
+    "cohens_d_matrix",
+    "pairwise_difference_intervals",
+    "pairwise_tests",
+    "percentile_interval",
+    "run_pair_test",
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "benjamini_hochberg": "gutenburg_stylometry.stats.significance",
+    "bootstrap_group_means": "gutenburg_stylometry.stats.resampling",
+    "cohens_d_matrix": "gutenburg_stylometry.stats.resampling",
+    "pairwise_difference_intervals": "gutenburg_stylometry.stats.resampling",
+    "pairwise_tests": "gutenburg_stylometry.stats.significance",
+    "percentile_interval": "gutenburg_stylometry.stats.resampling",
+    "run_pair_test": "gutenburg_stylometry.stats.significance",
+})
@@ -0,0 +1,159 @@
+"""
+Vectorized resampling helpers.
+
+Bootstrap replicates are drawn for many groups at once: the groups are
+laid out back-to-back in one flat array, a single uniform draw matrix is
+mapped onto each group's index range, and per-group sums come out of one
+np.add.reduceat call. Replicates are processed in batches so memory stays
+bounded regardless of corpus size.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+# Upper bound on elements in a single (replicates x values) draw matrix
+MAX_BATCH_ELEMENTS = 8_000_000
+
+
+def flatten_groups(groups: Sequence[np.ndarray]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Lay out ragged groups back-to-back.
+
+    Args:
+        groups: One 1-D array of observations per group
+
+    Returns:
+        Tuple of (flat values, group start offsets, group sizes)
+    """
+    sizes = np.array([len(g) for g in groups], dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+    flat = (
+        np.concatenate([np.asarray(g, dtype=np.float64) for g in groups])
+        if groups
+        else np.empty(0)
+    )
+    return flat, starts, sizes
+
+
+def bootstrap_group_means(
+    groups: Sequence[np.ndarray],
+    n_resamples: int = 2000,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Bootstrap the mean of every group in one batched computation.
+
+    Args:
+        groups: One 1-D array of observations per group
+        n_resamples: Bootstrap replicates per group
+        rng: Random generator (default: fresh unseeded generator)
+
+    Returns:
+        (groups x n_resamples) matrix of resampled means; rows for empty
+        groups are NaN
+    """
+    rng = rng or np.random.default_rng()
+    result = np.full((len(groups), n_resamples), np.nan)
+
+    nonempty = [i for i, g in enumerate(groups) if len(g)]
+    if not nonempty:
+        return result
+
+    flat, starts, sizes = flatten_groups([groups[i] for i in nonempty])
+
+    # Every position knows which group's index range it samples from
+    position_start = np.repeat(starts, sizes)
+    position_size = np.repeat(sizes, sizes)
+
+    batch = max(1, MAX_BATCH_ELEMENTS // len(flat))
+    for lo in range(0, n_resamples, batch):
+        hi = min(lo + batch, n_resamples)
+        draws = rng.random((hi - lo, len(flat)))
+        picks = position_start + (draws * position_size).astype(np.int64)
+        sums = np.add.reduceat(flat[picks], starts, axis=1)
+        result[nonempty, lo:hi] = (sums / sizes).T
+
+    return result
+
+
+def percentile_interval(
+    replicates: np.ndarray,
+    confidence: float = 0.95,
+    axis: int = -1,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Percentile bootstrap confidence interval along an axis.
+
+    Args:
+        replicates: Array of bootstrap replicates
+        confidence: Two-sided coverage (e.g. 0.95)
+        axis: Axis holding the replicates
+
+    Returns:
+        Tuple of (lower bound, upper bound) arrays
+    """
+    alpha = (1.0 - confidence) / 2.0
+    low, high = np.quantile(replicates, [alpha, 1.0 - alpha], axis=axis)
+    return low, high
+
+
+def pairwise_difference_intervals(
+    boot_means: np.ndarray,
+    confidence: float = 0.95,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Bootstrap CIs for every pairwise difference of group means.
+
+    The (i, j) interval is taken over boot_means[i] - boot_means[j].
+    Rows are processed in blocks to bound the (rows x groups x replicates)
+    intermediate.
+
+    Args:
+        boot_means: (groups x replicates) matrix from bootstrap_group_means
+        confidence: Two-sided coverage
+
+    Returns:
+        Tuple of (groups x groups) lower and upper bound matrices
+    """
+    n_groups, n_resamples = boot_means.shape
+    low = np.full((n_groups, n_groups), np.nan)
+    high = np.full((n_groups, n_groups), np.nan)
+    if n_groups == 0:
+        return low, high
+
+    block = max(1, MAX_BATCH_ELEMENTS // max(1, n_groups * n_resamples))
+    for lo in range(0, n_groups, block):
+        hi = min(lo + block, n_groups)
+        diffs = boot_means[lo:hi, None, :] - boot_means[None, :, :]
+        low[lo:hi], high[lo:hi] = percentile_interval(diffs, confidence, axis=2)
+
+    return low, high
+
+
+def cohens_d_matrix(means: np.ndarray, stds: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Pairwise Cohen's d with pooled standard deviation.
+
+    A group with a single observation has no sample deviation (NaN) but
+    contributes nothing to the pooled sum of squares, so its pairs with
+    larger groups still get an effect size.
+
+    Args:
+        means: Per-group means
+        stds: Per-group sample standard deviations (NaN below two observations)
+        counts: Per-group observation counts
+
+    Returns:
+        (groups x groups) matrix; NaN where the pooled deviation is undefined
+        (fewer than three observations between the pair, or zero spread)
+    """
+    n = counts.astype(np.float64)
+    squares = np.where(n > 1, (n - 1) * np.nan_to_num(stds) ** 2, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pooled_var = (squares[:, None] + squares[None, :]) / (n[:, None] + n[None, :] - 2)
+        pooled = np.sqrt(pooled_var)
+        d = (means[:, None] - means[None, :]) / pooled
+    d[~np.isfinite(d)] = np.nan
+    return d
@@ -0,0 +1,243 @@
+"""
+Significance tests for differences between authors.
+
+Two-sample tests on per-book metric arrays (e.g. STTR per book):
+
+1. Permutation test: group labels are shuffled thousands of times; every
+   replicate is one row of a (replicates x books) matrix shuffled in place
+   with Generator.permuted, so no Python-level loop runs per replicate.
+2. Bootstrap test: books are resampled with replacement; the percentile
+   interval of the mean difference is reported together with a p-value
+   from the null-shifted replicates.
+
+All author pairs can be fanned out over a process pool; each pair gets
+its own child SeedSequence so results do not depend on scheduling.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Mapping, Optional
+
+import numpy as np
+
+from gutenburg_stylometry.models import SignificanceResult
+from gutenburg_stylometry.stats.resampling import (
+    MAX_BATCH_ELEMENTS,
+    bootstrap_group_means,
+    percentile_interval,
+)
+
+
+METHODS = ("permutation", "bootstrap")
+
+
+def permutation_pvalue(
+    a: np.ndarray,
+    b: np.ndarray,
+    n_resamples: int = 5000,
+    rng: Optional[np.random.Generator] = None,
+) -> float:
+    """
+    Two-sided permutation test for a difference in means.
+
+    Args:
+        a: Observations for the first group
+        b: Observations for the second group
+        n_resamples: Number of label permutations
+        rng: Random generator
+
+    Returns:
+        p-value with the +1 correction (never exactly zero)
+    """
+    rng = rng or np.random.default_rng()
+    pooled = np.concatenate([a, b]).astype(np.float64)
+    n_a, n_b = len(a), len(b)
+    total = pooled.sum()
+    observed = abs(a.mean() - b.mean())
+
+    extreme = 0
+    batch = max(1, MAX_BATCH_ELEMENTS // len(pooled))
+    for lo in range(0, n_resamples, batch):
+        rows = np.tile(pooled, (min(batch, n_resamples - lo), 1))
+        rng.permuted(rows, axis=1, out=rows)
+        sum_a = rows[:, :n_a].sum(axis=1)
+        deltas = sum_a / n_a - (total - sum_a) / n_b
+        extreme += int(np.count_nonzero(np.abs(deltas) >= observed - 1e-12))
+
+    return (extreme + 1) / (n_resamples + 1)
+
+
+def bootstrap_delta(
+    a: np.ndarray,
+    b: np.ndarray,
+    n_resamples: int = 5000,
+    confidence: float = 0.95,
+    rng: Optional[np.random.Generator] = None,
+) -> tuple[float, float, float]:
+    """
+    Bootstrap the difference in means.
+
+    The null distribution reuses the same replicates: shifting both groups
+    to the pooled mean moves every replicate delta by exactly the observed
+    delta, so no second resampling pass is needed.
+
+    Args:
+        a: Observations for the first group
+        b: Observations for the second group
+        n_resamples: Bootstrap replicates
+        confidence: Two-sided CI coverage
+        rng: Random generator
+
+    Returns:
+        Tuple of (p_value, ci_low, ci_high)
+    """
+    boot = bootstrap_group_means([a, b], n_resamples, rng)
+    deltas = boot[0] - boot[1]
+    observed = a.mean() - b.mean()
+
+    null = deltas - observed
+    extreme = int(np.count_nonzero(np.abs(null) >= abs(observed) - 1e-12))
+    low, high = percentile_interval(deltas, confidence)
+
+    return (extreme + 1) / (n_resamples + 1), float(low), float(high)
+
+
+def run_pair_test(
+    author_a: str,
+    author_b: str,
+    a: np.ndarray,
+    b: np.ndarray,
+    metric: str,
+    method: str = "permutation",
+    n_resamples: int = 5000,
+    confidence: float = 0.95,
+    seed: Optional[np.random.SeedSequence | int] = None,
+) -> SignificanceResult:
+    """
+    Run a single two-sample test.
+
+    Args:
+        author_a: First author
+        author_b: Second author
+        a: Per-book metric values for author_a
+        b: Per-book metric values for author_b
+        metric: Name of the metric being tested
+        method: 'permutation' or 'bootstrap'
+        n_resamples: Replicates
+        confidence: CI coverage (bootstrap only)
+        seed: Seed or SeedSequence for this pair
+
+    Returns:
+        SignificanceResult (p-value None if either group is too small)
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method} (expected one of {METHODS})")
+
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    fields = dict(
+        author_a=author_a,
+        author_b=author_b,
+        metric=metric,
+        method=method,
+        n_a=len(a),
+        n_b=len(b),
+        n_resamples=n_resamples,
+    )
+
+    if len(a) < 2 or len(b) < 2:
+        return SignificanceResult(**fields)
+
+    rng = np.random.default_rng(seed)
+    observed = round(float(a.mean() - b.mean()), 6)
+
+    if method == "permutation":
+        p_value = permutation_pvalue(a, b, n_resamples, rng)
+        return SignificanceResult(**fields, observed_delta=observed, p_value=round(p_value, 6))
+
+    p_value, low, high = bootstrap_delta(a, b, n_resamples, confidence, rng)
+    return SignificanceResult(
+        **fields,
+        observed_delta=observed,
+        p_value=round(p_value, 6),
+        ci_low=round(low, 6),
+        ci_high=round(high, 6),
+    )
+
+
+def _run_pairs(tasks: list[tuple], options: dict) -> list[SignificanceResult]:
+    """Worker entry point: run a chunk of pair tests."""
+    return [
+        run_pair_test(author_a, author_b, a, b, seed=seed, **options)
+        for author_a, author_b, a, b, seed in tasks
+    ]
+
+
+def benjamini_hochberg(p_values: np.ndarray) -> np.ndarray:
+    """
+    Benjamini-Hochberg false discovery rate adjustment.
+
+    Args:
+        p_values: Raw p-values (NaN entries are ignored)
+
+    Returns:
+        Adjusted p-values in the original order
+    """
+    p_values = np.asarray(p_values, dtype=np.float64)
+    adjusted = np.full_like(p_values, np.nan)
+    valid = np.flatnonzero(~np.isnan(p_values))
+    if len(valid) == 0:
+        return adjusted
+
+    order = valid[np.argsort(p_values[valid])]
+    ranked = p_values[order] * len(valid) / np.arange(1, len(valid) + 1)
+    adjusted[order] = np.minimum(1.0, np.minimum.accumulate(ranked[::-1])[::-1])
+    return adjusted
+
+
+def pairwise_tests(
+    samples: Mapping[str, np.ndarray],
+    metric: str,
+    method: str = "permutation",
+    n_resamples: int = 5000,
+    confidence: float = 0.95,
+    seed: Optional[int] = 0,
+    workers: int = 1,
+) -> list[SignificanceResult]:
+    """
+    Test every unordered author pair, with FDR-adjusted p-values.
+
+    Args:
+        samples: Mapping of author -> per-book metric values
+        metric: Name of the metric being tested
+        method: 'permutation' or 'bootstrap'
+        n_resamples: Replicates per pair
+        confidence: CI coverage (bootstrap only)
+        seed: Root seed; each pair gets an independent child stream
+        workers: Processes to use (1 runs in-process)
+
+    Returns:
+        One SignificanceResult per pair, in sorted author order
+    """
+    authors = sorted(samples)
+    pairs = list(combinations(authors, 2))
+    seeds = np.random.SeedSequence(seed).spawn(len(pairs))
+    tasks = [(a, b, samples[a], samples[b], s) for (a, b), s in zip(pairs, seeds)]
+    options = dict(metric=metric, method=method, n_resamples=n_resamples, confidence=confidence)
+
+    if workers > 1 and len(tasks) > 1:
+        chunk = max(1, len(tasks) // (workers * 4))
+        chunks = [tasks[i : i + chunk] for i in range(0, len(tasks), chunk)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_pairs, c, options) for c in chunks]
+            results = [r for f in futures for r in f.result()]
+    else:
+        results = _run_pairs(tasks, options)
+
+    adjusted = benjamini_hochberg(
+        np.array([np.nan if r.p_value is None else r.p_value for r in results])
+    )
+    return [
+        r if np.isnan(p) else r.model_copy(update={"p_adjusted": round(float(p), 6)})
+        for r, p in zip(results, adjusted)
+    ]
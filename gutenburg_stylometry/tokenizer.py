@@ -6,9 +6,8 @@ Handles period-specific orthography, Gutenberg OCR artifacts, and dialect repres
 """
 
 import re
-from typing import Iterator
-
-from gutenburg_stylometry.protocols import Tokenizer as TokenizerProtocol
+import time
+from typing import Iterator, Optional
 
 
 # =============================================================================
@@ -71,6 +70,10 @@ def _multi_char_replacer(match: re.Match) -> str:
 
 def normalize_unicode(text: str) -> str:
     """Replace smart quotes, em-dashes, ligatures, and other unicode with ASCII."""
+    # In pure-ASCII input only the grave accent needs replacing (isascii()
+    # is O(1) on str)
+    if text.isascii():
+        return text.replace("`", "'") if "`" in text else text
     text = text.translate(_UNICODE_TABLE)
     text = _MULTI_CHAR_PATTERN.sub(_multi_char_replacer, text)
     return text
@@ -149,6 +152,28 @@ _TOKEN_PATTERN = re.compile(
 # TOKENIZER IMPLEMENTATION
 # =============================================================================
 
+# Tokens between deadline checks in tokenize_normalized()
+DEADLINE_CHECK_INTERVAL = 4096
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when processing a book runs past its cooperative deadline."""
+
+
+def check_deadline(deadline: Optional[float], stage: str) -> None:
+    """
+    Raise DeadlineExceeded if a deadline has passed.
+
+    Args:
+        deadline: time.perf_counter() value, or None for no deadline
+        stage: Stage just finished (for the error message)
+
+    Raises:
+        DeadlineExceeded: If the deadline has passed
+    """
+    if deadline is not None and time.perf_counter() > deadline:
+        raise DeadlineExceeded(f"Book deadline exceeded after {stage}")
+
 
 class VictorianTokenizer:
     """
@@ -194,6 +219,78 @@ class VictorianTokenizer:
 
             yield token
 
+    def normalize(self, text: str) -> str:
+        """
+        Apply the pre-tokenization passes (unicode and Gutenberg artifacts).
+
+        tokenize(text) is equivalent to tokenize_normalized(normalize(text));
+        the split lets callers time the two phases separately.
+
+        Args:
+            text: Raw input text
+
+        Returns:
+            Normalized text
+        """
+        text = normalize_unicode(text)
+        return clean_gutenberg_artifacts(text)
+
+    def tokenize_normalized(self, text: str, deadline: Optional[float] = None) -> list[str]:
+        """
+        Tokenize text that has already been through normalize().
+
+        Args:
+            text: Normalized text
+            deadline: time.perf_counter() value after which to give up;
+                checked every DEADLINE_CHECK_INTERVAL tokens
+
+        Returns:
+            List of tokens
+
+        Raises:
+            DeadlineExceeded: If the deadline passes before the end of the text
+        """
+        if deadline is None:
+            return list(self._iter_tokens(text))
+
+        tokens: list[str] = []
+        for i, token in enumerate(self._iter_tokens(text)):
+            if not i % DEADLINE_CHECK_INTERVAL and time.perf_counter() > deadline:
+                raise DeadlineExceeded(f"Tokenization deadline exceeded after {i} tokens")
+            tokens.append(token)
+        return tokens
+
+    def tokenize_segments(
+        self, text: str, starts: list[int], deadline: Optional[float] = None
+    ) -> tuple[list[str], list[int]]:
+        """
+        Tokenize normalized text, recording the token offset of each segment start.
+
+        The text is cut at each start and the pieces are tokenized in order,
+        so every character is still scanned once. Starts must fall between
+        words (e.g. either end of a chapter heading line) so that no token
+        spans a cut.
+
+        Args:
+            text: Normalized text
+            starts: Ascending character offsets
+            deadline: As for tokenize_normalized()
+
+        Returns:
+            Tuple of (tokens, token offset of each start)
+
+        Raises:
+            DeadlineExceeded: If the deadline passes before the end of the text
+        """
+        tokens: list[str] = []
+        offsets: list[int] = []
+        bounds = [0, *starts, len(text)]
+        for i, (begin, end) in enumerate(zip(bounds, bounds[1:])):
+            if i:
+                offsets.append(len(tokens))
+            tokens.extend(self.tokenize_normalized(text[begin:end], deadline=deadline))
+        return tokens, offsets
+
     def tokenize(self, text: str) -> list[str]:
         """
         Tokenize text into words.
@@ -204,9 +301,7 @@ class VictorianTokenizer:
         Returns:
             List of tokens
         """
-        text = normalize_unicode(text)
-        text = clean_gutenberg_artifacts(text)
-        return list(self._iter_tokens(text))
+        return self.tokenize_normalized(self.normalize(text))
 
     def tokenize_iter(self, text: str) -> Iterator[str]:
         """
@@ -218,13 +313,48 @@ class VictorianTokenizer:
         Yields:
             Individual tokens
         """
-        text = normalize_unicode(text)
-        text = clean_gutenberg_artifacts(text)
-        yield from self._iter_tokens(text)
+        yield from self._iter_tokens(self.normalize(text))
 
 
-# Protocol compliance verification
-assert isinstance(VictorianTokenizer(), TokenizerProtocol)
+# =============================================================================
+# BOOK TOKENIZATION
+# =============================================================================
+
+
+def tokenize_book(
+    text: str,
+    tokenizer: VictorianTokenizer,
+    chapters: bool = False,
+    deadline: Optional[float] = None,
+) -> tuple[list[str], list[int], list[int], list[str]]:
+    """
+    Tokenize normalized text, optionally finding chapter boundaries on the way.
+
+    Each chapter starts after its heading line and ends before the next
+    heading, so heading words count toward the book but not a chapter.
+    The heading finder lives in normalize, which loads the near-duplicate
+    detection stack, so it is only imported when segmenting.
+
+    Args:
+        text: Text that has been through tokenizer.normalize()
+        tokenizer: Tokenizer instance
+        chapters: Segment at chapter headings (TTRConfig.chapters)
+        deadline: As for VictorianTokenizer.tokenize_normalized()
+
+    Returns:
+        Tuple of (tokens, chapter token offsets, chapter token ends,
+        chapter headings); the chapter lists are empty when not segmenting
+        or no heading is found
+    """
+    if not chapters:
+        return tokenizer.tokenize_normalized(text, deadline=deadline), [], [], []
+    from gutenburg_stylometry.normalize import find_chapter_headings
+
+    headings = find_chapter_headings(text)
+    cuts = [offset for h in headings for offset in (h.start, h.end)]
+    tokens, offsets = tokenizer.tokenize_segments(text, cuts, deadline=deadline)
+    ends = [*offsets[2::2], len(tokens)] if headings else []
+    return tokens, offsets[1::2], ends, [h.heading for h in headings]
 
 
 # =============================================================================
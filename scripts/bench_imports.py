@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark import time of the package, its modules and the CLI scripts.
+
+Each target is imported (or run with --help) in a fresh interpreter,
+repeated --runs times, and the median wall time is reported alongside
+the bare interpreter start-up and which heavy dependencies the import
+pulled in. Package imports are lazy, so `import gutenburg_stylometry`
+should cost little more than start-up and load none of them.
+
+Usage:
+    poetry run python scripts/bench_imports.py
+    poetry run python scripts/bench_imports.py --runs 20
+    poetry run python scripts/bench_imports.py --importtime gutenburg_stylometry.tokenizer
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Third-party packages whose import dominates start-up
+HEAVY_MODULES = ("numpy", "pydantic", "rich")
+
+DEFAULT_MODULES = (
+    "gutenburg_stylometry",
+    "gutenburg_stylometry.tokenizer",
+    "gutenburg_stylometry.models",
+    "gutenburg_stylometry.metrics.ttr",
+    "gutenburg_stylometry.services.ttr_service",
+)
+DEFAULT_SCRIPTS = ("compute_ttr.py", "stream_ttr.py")
+
+_PROBE = (
+    "import json, sys; import {module}; "
+    "print(json.dumps([m for m in {heavy!r} if m in sys.modules]))"
+)
+
+
+def time_command(command: list[str], runs: int) -> tuple[float, str]:
+    """Median wall time (ms) of a command over runs, and its last stdout."""
+    timings = []
+    output = ""
+    for _ in range(runs):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            command, cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        )
+        timings.append((time.perf_counter() - started) * 1000)
+        output = completed.stdout
+    return statistics.median(timings), output
+
+
+def top_imports(module: str, limit: int) -> list[tuple[int, str]]:
+    """The modules with the largest cumulative time under -X importtime."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark import and CLI start-up time")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per target (default: 10)")
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES, help="Modules to import")
+    parser.add_argument(
+        "--scripts", nargs="*", default=DEFAULT_SCRIPTS, help="Scripts to time with --help"
+    )
+    parser.add_argument(
+        "--importtime",
+        metavar="MODULE",
+        help="Instead, list the slowest imports beneath one module",
+    )
+    parser.add_argument("--top", type=int, default=15, help="Rows for --importtime")
+    args = parser.parse_args()
+
+    if args.importtime:
+        for cumulative, name in top_imports(args.importtime, args.top):
+            print(f"{cumulative / 1000:9.1f} ms  {name}")
+        return 0
+
+    baseline, _ = time_command([sys.executable, "-c", "pass"], args.runs)
+    print(f"{'target':<45} {'median ms':>10} {'over bare':>10}  heavy imports")
+    print(f"{'(bare interpreter)':<45} {baseline:>10.1f} {0.0:>10.1f}")
+
+    for module in args.modules:
+        probe = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+        elapsed, output = time_command([sys.executable, "-c", probe], args.runs)
+        heavy = ", ".join(json.loads(output)) or "-"
+        print(f"{module:<45} {elapsed:>10.1f} {elapsed - baseline:>10.1f}  {heavy}")
+
+    for script in args.scripts:
+        command = [sys.executable, str(PROJECT_ROOT / "scripts" / script), "--help"]
+        elapsed, _ = time_command(command, args.runs)
+        label = f"scripts/{script} --help"
+        print(f"{label:<45} {elapsed:>10.1f} {elapsed - baseline:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,32 +6,62 @@ Usage:
     poetry run python scripts/compute_ttr.py /path/to/dickens_clean
     poetry run python scripts/compute_ttr.py /path/to/dickens_clean --output results.jsonl
     poetry run python scripts/compute_ttr.py /path/to/dickens_clean -o results.jsonl
+    poetry run python scripts/compute_ttr.py /path/to/corpus --workers 8 --progress-stream p.jsonl
 """
 
 from __future__ import annotations
 
 import argparse
+import functools
 import json
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple, Optional, TextIO
 
 # Add project root to path for imports - must be before project imports
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from gutenburg_stylometry.metrics.ttr import TTRCalculator, TTRConfig, TTRAggregator  # noqa: E402
-from gutenburg_stylometry.tokenizer import VictorianTokenizer  # noqa: E402
-from gutenburg_stylometry.models import TTRResult  # noqa: E402
-from rich.console import Console  # noqa: E402
-from rich.table import Table  # noqa: E402
+from gutenburg_stylometry.io.reader import read_text  # noqa: E402
+from gutenburg_stylometry.tokenizer import VictorianTokenizer, tokenize_book  # noqa: E402
+from gutenburg_stylometry.profiling import NULL_PROFILER, Profiler, to_prometheus  # noqa: E402
+from gutenburg_stylometry.progress import ProgressTracker  # noqa: E402
+from gutenburg_stylometry.services.pipeline import iter_bounded_map  # noqa: E402
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console, Group
 
+    from gutenburg_stylometry.metrics.ttr import TTRCalculator
+    from gutenburg_stylometry.models import TTRResult
 
-def process_file(file_path: Path, tokenizer: VictorianTokenizer, calculator: TTRCalculator) -> TTRResult:
+
+@functools.cache
+def get_console() -> Console:
+    """The shared rich console (rich is only imported once output is needed)."""
+    from rich.console import Console
+
+    return Console()
+
+
+def process_file(
+    file_path: Path,
+    tokenizer: VictorianTokenizer,
+    calculator: TTRCalculator,
+    use_mmap: bool = False,
+    profiler: Profiler = NULL_PROFILER,
+) -> TTRResult:
     """Process a single text file and compute TTR."""
-    text = file_path.read_text(encoding="utf-8", errors="replace")
-    tokens = tokenizer.tokenize(text)
+    with profiler.stage("read"):
+        text = read_text(file_path, use_mmap=use_mmap)
+    with profiler.stage("normalize"):
+        text = tokenizer.normalize(text)
+    with profiler.stage("tokenize"):
+        tokens, chapter_offsets, chapter_ends, chapter_headings = tokenize_book(
+            text, tokenizer, calculator.config.chapters
+        )
 
     # Extract info from filename
     name = file_path.stem
@@ -51,16 +81,145 @@ def process_file(file_path: Path, tokenizer: VictorianTokenizer, calculator: TTR
         author = "unknown"
         title = title_part
 
-    return calculator.compute(
-        tokens=tokens,
-        gutenberg_id=gutenberg_id,
-        title=title,
-        author=author,
+    with profiler.stage("compute"):
+        result = calculator.compute(
+            tokens=tokens,
+            gutenberg_id=gutenberg_id,
+            title=title,
+            author=author,
+            chapter_offsets=chapter_offsets,
+            chapter_ends=chapter_ends,
+            chapter_headings=chapter_headings,
+        )
+    profiler.count_book(len(tokens))
+    return result
+
+
+class FileOutcome(NamedTuple):
+    """Result of processing one file, as sent back by a worker."""
+
+    file_path: Path
+    result: Optional[TTRResult]
+    error: Optional[str]
+    worker: str
+    n_bytes: int
+    profile: Optional[dict]  # Profiler.totals() when profiling
+
+
+# Per-process state (set by init_worker, in the main process or pool workers)
+_worker_state: dict = {}
+
+
+def init_worker(
+    sttr_chunk_size: int,
+    sttr_sweep: tuple[int, ...],
+    vocabulary_growth: bool,
+    chapters: bool,
+    use_mmap: bool,
+    profile: bool,
+    label: str = "",
+) -> None:
+    """Build the tokenizer and calculator once per process."""
+    from gutenburg_stylometry.metrics.ttr import TTRCalculator, TTRConfig
+
+    config = TTRConfig(
+        sttr_chunk_size=sttr_chunk_size,
+        sttr_sweep=sttr_sweep,
+        vocabulary_growth=vocabulary_growth,
+        chapters=chapters,
+    )
+    _worker_state.update(
+        tokenizer=VictorianTokenizer(),
+        calculator=TTRCalculator(config=config),
+        use_mmap=use_mmap,
+        profile=profile,
+        label=label or f"pid {os.getpid()}",
     )
 
 
+def run_file(file_path: Path) -> FileOutcome:
+    """Process one file with this process's state; never raises."""
+    profiler = Profiler() if _worker_state["profile"] else NULL_PROFILER
+    n_bytes = 0
+    try:
+        n_bytes = file_path.stat().st_size
+        profiler.count_bytes(n_bytes)
+        result = process_file(
+            file_path,
+            _worker_state["tokenizer"],
+            _worker_state["calculator"],
+            use_mmap=_worker_state["use_mmap"],
+            profiler=profiler,
+        )
+        error = None
+    except Exception as e:
+        result, error = None, str(e)
+    totals = profiler.totals() if profiler.enabled else None
+    return FileOutcome(file_path, result, error, _worker_state["label"], n_bytes, totals)
+
+
+def format_seconds(seconds: Optional[float]) -> str:
+    """Format a duration as H:MM:SS (or '-' if unknown)."""
+    if seconds is None:
+        return "-"
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}"
+
+
+def render_progress(snapshot: dict) -> Group:
+    """Render a ProgressTracker snapshot as a live dashboard."""
+    from rich.console import Group
+    from rich.table import Table
+
+    done, total = snapshot["files_done"], snapshot["files_total"]
+    summary = Table.grid(padding=(0, 2))
+    summary.add_column(style="bold")
+    summary.add_column(justify="right")
+    summary.add_column(justify="right", style="dim")
+    summary.add_row("Files", f"{done:,} / {total:,}", f"{done / total:.1%}" if total else "")
+    summary.add_row(
+        "Files/s",
+        f"{snapshot['recent_files_per_sec']:,.1f}",
+        f"avg {snapshot['files_per_sec']:,.1f}",
+    )
+    summary.add_row(
+        "Tokens/s",
+        f"{snapshot['recent_tokens_per_sec']:,.0f}",
+        f"avg {snapshot['tokens_per_sec']:,.0f}",
+    )
+    summary.add_row(
+        "MB/s", f"{snapshot['recent_mb_per_sec']:,.2f}", f"avg {snapshot['mb_per_sec']:,.2f}"
+    )
+    errors = snapshot["errors"]
+    summary.add_row("Errors", f"[red]{errors:,}[/red]" if errors else "0", "")
+    summary.add_row("Elapsed", format_seconds(snapshot["elapsed_seconds"]), "")
+    summary.add_row("ETA", format_seconds(snapshot["eta_seconds"]), "")
+
+    workers = Table(title="Workers", title_justify="left")
+    workers.add_column("Worker", style="cyan")
+    workers.add_column("Books", justify="right")
+    workers.add_column("Tokens", justify="right")
+    workers.add_column("Errors", justify="right")
+    workers.add_column("Idle", justify="right")
+    workers.add_column("Last file")
+    for w in snapshot["workers"]:
+        workers.add_row(
+            w["worker"],
+            f"{w['books']:,}",
+            f"{w['tokens']:,}",
+            str(w["errors"]),
+            f"{w['idle_seconds']:.1f}s",
+            (w["last_file"] or "")[:40],
+        )
+    return Group(summary, workers)
+
+
 def print_results(results: list[TTRResult], aggregates: dict):
     """Print results summary."""
+    from rich.table import Table
+
+    console = get_console()
     console.print(f"\n[bold green]Processed {len(results)} files[/bold green]")
     console.print(f"  Total words: {aggregates['total_words']:,}")
 
@@ -90,6 +249,11 @@ def print_results(results: list[TTRResult], aggregates: dict):
             f"  Delta:    volatility={aggregates['delta_std_mean']:.4f} (mean of per-book delta std)"
         )
 
+    if aggregates.get("heaps_beta_mean") is not None:
+        console.print(
+            f"  Heaps:    beta={aggregates['heaps_beta_mean']:.4f} (mean of per-book fits)"
+        )
+
     # Show per-file breakdown
     console.print("\n[bold]Per-file results:[/bold]")
     table = Table()
@@ -107,6 +271,41 @@ def print_results(results: list[TTRResult], aggregates: dict):
     console.print(table)
 
 
+def positive_int(value: str) -> int:
+    """
+    Parse a positive integer argument.
+
+    Args:
+        value: Command-line value
+
+    Returns:
+        The integer
+
+    Raises:
+        argparse.ArgumentTypeError: If value is not a positive integer
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be positive, got {number}")
+    return number
+
+
+def chunk_sizes(value: str) -> tuple[int, ...]:
+    """
+    Parse a comma-separated list of positive chunk sizes.
+
+    Args:
+        value: Command-line value, e.g. "250,500,1000"
+
+    Returns:
+        Tuple of chunk sizes
+    """
+    return tuple(positive_int(size) for size in value.split(","))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Compute TTR metrics for text files in a directory"
@@ -123,12 +322,66 @@ def main():
     )
     parser.add_argument(
         "--sttr-chunk-size",
-        type=int,
+        type=positive_int,
         default=1000,
         help="Chunk size for STTR computation (default: 1000)",
     )
+    parser.add_argument(
+        "--sttr-sweep",
+        type=chunk_sizes,
+        default=(),
+        help="Also compute STTR at these comma-separated chunk sizes in the same pass "
+        "(e.g. 100,250,500,1000,2000,5000)",
+    )
+    parser.add_argument(
+        "--vocabulary-growth",
+        action="store_true",
+        help="Record each book's vocabulary growth curve and fit Heaps' law",
+    )
+    parser.add_argument(
+        "--chapters",
+        action="store_true",
+        help="Split books at chapter headings and record per-chapter metrics",
+    )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="Memory-map input files instead of reading them into memory",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes for reading and tokenizing (default: 1, in-process)",
+    )
+    parser.add_argument(
+        "--progress-stream",
+        type=Path,
+        help="Append a JSON progress snapshot per interval to this file ('-' for stdout, "
+        "which also disables the live display)",
+    )
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between progress stream snapshots (default: 1.0)",
+    )
+    parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="Print a line per file instead of the live display",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["json", "prometheus"],
+        help="Print per-stage timings in this format after processing "
+        "(to stderr with --progress-stream -)",
+    )
 
     args = parser.parse_args()
+    console = get_console()
+    if str(args.progress_stream) == "-":
+        console.stderr = True  # Keep stdout machine-readable
 
     # Validate input
     if not args.input_dir.exists():
@@ -147,21 +400,94 @@ def main():
 
     console.print(f"[bold]Found {len(txt_files)} text files in {args.input_dir}[/bold]")
 
-    # Initialize
-    config = TTRConfig(sttr_chunk_size=args.sttr_chunk_size)
-    tokenizer = VictorianTokenizer()
-    calculator = TTRCalculator(config=config)
+    # Initialize (numpy and pydantic load here, not for --help)
+    from gutenburg_stylometry.metrics.ttr import TTRAggregator
+
     aggregator = TTRAggregator()
+    profiler = Profiler() if args.profile else NULL_PROFILER
+    tracker = ProgressTracker(total_files=len(txt_files))
+
+    stream: Optional[TextIO] = None
+    if args.progress_stream is not None:
+        stream = sys.stdout if str(args.progress_stream) == "-" else open(
+            args.progress_stream, "a", encoding="utf-8"
+        )
+    show_live = not args.verbose and stream is not sys.stdout
+
+    def emit(final: bool = False) -> None:
+        if stream is not None:
+            stream.write(json.dumps({**tracker.snapshot(), "final": final}) + "\n")
+            stream.flush()
 
     # Process files
     results: list[TTRResult] = []
-    for file_path in txt_files:
-        try:
-            result = process_file(file_path, tokenizer, calculator)
-            results.append(result)
-            console.print(f"  [green]✓[/green] {file_path.name}")
-        except Exception as e:
-            console.print(f"  [red]✗[/red] {file_path.name}: {e}")
+    init_args = (
+        args.sttr_chunk_size,
+        args.sttr_sweep,
+        args.vocabulary_growth,
+        args.chapters,
+        args.mmap,
+        bool(args.profile),
+    )
+    from rich.live import Live
+
+    live = Live(
+        get_renderable=lambda: render_progress(tracker.snapshot()),
+        console=console,
+        refresh_per_second=4,
+        transient=True,
+    )
+    pool = None
+    try:
+        if args.workers > 1:
+            pool = ProcessPoolExecutor(
+                max_workers=args.workers, initializer=init_worker, initargs=init_args
+            )
+            outcomes = iter_bounded_map(run_file, txt_files, pool, args.workers * 2)
+        else:
+            init_worker(*init_args, label="main")
+            outcomes = map(run_file, txt_files)
+
+        if show_live:
+            live.start()
+        last_emit = time.monotonic()
+        for outcome in outcomes:
+            ok = outcome.result is not None
+            tracker.update(
+                outcome.file_path.name,
+                ok,
+                tokens=outcome.result.total_words if ok else 0,
+                n_bytes=outcome.n_bytes,
+                worker=outcome.worker,
+            )
+            if outcome.profile is not None:
+                profiler.merge(outcome.profile)
+            if ok:
+                results.append(outcome.result)
+                if args.verbose:
+                    console.print(f"  [green]✓[/green] {outcome.file_path.name}")
+            else:
+                console.print(f"  [red]✗[/red] {outcome.file_path.name}: {outcome.error}")
+
+            if stream is not None and time.monotonic() - last_emit >= args.progress_interval:
+                emit()
+                last_emit = time.monotonic()
+    finally:
+        if show_live:
+            live.stop()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        emit(final=True)
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+
+    snapshot = tracker.snapshot()
+    console.print(
+        f"[bold]Processed {snapshot['files_done']:,} files in "
+        f"{format_seconds(snapshot['elapsed_seconds'])}[/bold] "
+        f"({snapshot['files_per_sec']:,.1f} files/s, {snapshot['tokens_per_sec']:,.0f} tokens/s, "
+        f"{snapshot['mb_per_sec']:,.2f} MB/s, {snapshot['errors']:,} errors)"
+    )
 
     if not results:
         console.print("[red]No files processed successfully[/red]")
@@ -185,6 +511,13 @@ def main():
             f.write(json.dumps(agg_with_marker) + "\n")
         console.print(f"\n[bold]Output written to:[/bold] {args.output}")
 
+    # Keep a stdout progress stream line-delimited: the profile goes to stderr
+    profile_out = sys.stderr if stream is sys.stdout else sys.stdout
+    if args.profile == "json":
+        print(profiler.summary().model_dump_json(indent=2), file=profile_out)
+    elif args.profile == "prometheus":
+        print(to_prometheus(profiler.summary()), end="", file=profile_out)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Run the local analysis server.
+
+Keeps the tokenizer, per-author results and fingerprint index warm so
+interactive queries skip start-up costs. See
+gutenburg_stylometry/services/server.py for the endpoints.
+
+Usage:
+    poetry run python scripts/serve.py
+    poetry run python scripts/serve.py --port 8765 --workers 4
+    poetry run python scripts/serve.py --socket /tmp/stylometry.sock
+
+    curl -s localhost:8765/compare?a=austen\\&b=dickens
+    curl -s -d '{"text": "It is a truth universally acknowledged..."}' localhost:8765/score
+    curl -s --unix-socket /tmp/stylometry.sock 'http://x/nearest?id=1342&k=5'
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path for imports - must be before project imports
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from gutenburg_stylometry.metrics.ttr import TTRConfig  # noqa: E402
+from gutenburg_stylometry.services.budget import BookBudget  # noqa: E402
+from gutenburg_stylometry.services.server import (  # noqa: E402
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_BATCH_WAIT_MS,
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    AnalysisService,
+    make_server,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve stylometric analysis over local HTTP")
+    parser.add_argument(
+        "--base-dir",
+        type=Path,
+        default=PROJECT_ROOT,
+        help="Project base directory (default: repository root)",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Interface (default: {DEFAULT_HOST})")
+    parser.add_argument(
+        "--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})"
+    )
+    parser.add_argument("--socket", type=Path, help="Listen on a Unix socket instead of TCP")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=min(4, os.cpu_count() or 1),
+        help="Processes scoring texts (default: min(4, CPUs))",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Score requests per batch (default: {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--batch-wait-ms",
+        type=float,
+        default=DEFAULT_BATCH_WAIT_MS,
+        help=f"Longest a request waits for its batch to fill (default: {DEFAULT_BATCH_WAIT_MS})",
+    )
+    parser.add_argument(
+        "--sttr-chunk-size",
+        type=int,
+        default=1000,
+        help="Chunk size for STTR computation (default: 1000)",
+    )
+    parser.add_argument("--max-chars", type=int, help="Sample texts longer than this")
+    parser.add_argument(
+        "--max-seconds", type=float, help="Per-text time budget (normalize + tokenize)"
+    )
+    parser.add_argument("--catalog", action="store_true", help="Keep the corpus catalog open")
+    parser.add_argument("--verbose", action="store_true", help="Log each request")
+    args = parser.parse_args()
+
+    budget = None
+    if args.max_chars or args.max_seconds:
+        budget = BookBudget(max_chars=args.max_chars, max_seconds=args.max_seconds)
+
+    with AnalysisService(
+        args.base_dir,
+        ttr_config=TTRConfig(sttr_chunk_size=args.sttr_chunk_size),
+        workers=args.workers,
+        batch_size=args.batch_size,
+        batch_wait_ms=args.batch_wait_ms,
+        budget=budget,
+        use_catalog=args.catalog,
+    ) as service:
+        server = make_server(service, args.host, args.port, args.socket, args.verbose)
+        where = args.socket or "http://{}:{}".format(*server.server_address[:2])
+        print(f"Serving on {where} ({args.workers} workers)", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Streaming TTR: read documents from stdin (or paths), write JSONL to stdout.
+
+One TTRResult JSON object is written per document as soon as it is
+computed, in a single write() call, and documents are read
+incrementally, so memory stays constant however long the stream.
+Failures go to stderr as JSON lines and make the exit status 1.
+
+Input formats (--format):
+    jsonl   One {"id", "text"[, "title", "author"]} object per line (default)
+    nul     Raw documents separated by NUL bytes; ids are 0, 1, 2, ...
+    paths   Newline-separated file paths (metadata parsed from file names)
+    paths0  NUL-separated file paths (find -print0)
+
+Usage:
+    cat docs.jsonl | poetry run python scripts/stream_ttr.py > results.jsonl
+    find data/normalized -name '*.txt' -print0 | \\
+        poetry run python scripts/stream_ttr.py --format paths0 > results.jsonl
+
+Writes to a pipe are only atomic up to PIPE_BUF (4 KiB on Linux), which
+records with --vocabulary-sketch exceed, so parallel processes must not
+share one stdout pipe; give each its own output file:
+    find data/normalized -name '*.txt' -print0 | \\
+        xargs -0 -P 8 -n 200 sh -c \\
+        'poetry run python scripts/stream_ttr.py "$@" > results.$$.jsonl' sh
+    cat results.*.jsonl > results.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Union
+
+# Add project root to path for imports - must be before project imports
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from gutenburg_stylometry.io.reader import (  # noqa: E402
+    BookContent,
+    decode_text,
+    parse_filename,
+    read_text,
+)
+from gutenburg_stylometry.metrics.ttr import TTRCalculator, TTRConfig  # noqa: E402
+from gutenburg_stylometry.services.budget import BookBudget  # noqa: E402
+from gutenburg_stylometry.services.ttr_service import process_content  # noqa: E402
+from gutenburg_stylometry.tokenizer import VictorianTokenizer  # noqa: E402
+
+READ_BLOCK = 1 << 20
+STDIN_PATH = Path("-")
+
+# A parsed document, or the error that prevented reading it
+Document = Union[BookContent, Exception]
+
+
+def write_line(fd: int, line: str) -> None:
+    """Write one line to a file descriptor in a single write() where possible."""
+    data = (line + "\n").encode("utf-8")
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def iter_split(stream: BinaryIO, separator: bytes) -> Iterator[bytes]:
+    """
+    Split a binary stream on a separator, reading it in fixed-size blocks.
+
+    Only the current partial record is held in memory.
+    """
+    pending = b""
+    while block := stream.read(READ_BLOCK):
+        records = (pending + block).split(separator)
+        pending = records.pop()
+        yield from records
+    if pending:
+        yield pending
+
+
+def book_from_path(file_path: Path) -> Document:
+    """Read a file, taking metadata from its name when it parses."""
+    try:
+        author, title, gutenberg_id = parse_filename(file_path.name)
+    except ValueError:
+        author, title, gutenberg_id = "unknown", file_path.stem, file_path.stem
+    try:
+        return BookContent(gutenberg_id, title, author, read_text(file_path), file_path)
+    except OSError as e:
+        return e
+
+
+def book_from_json(line: bytes) -> Document:
+    """Parse one JSONL record."""
+    try:
+        record = json.loads(line)
+        doc_id = str(record["id"])
+        return BookContent(
+            gutenberg_id=doc_id,
+            title=record.get("title", doc_id),
+            author=record.get("author", "unknown"),
+            text=record["text"],
+            file_path=STDIN_PATH,
+        )
+    except (ValueError, KeyError, TypeError) as e:
+        return ValueError(f"Malformed record: {e}")
+
+
+def iter_documents(stream: BinaryIO, fmt: str) -> Iterator[Document]:
+    """Parse documents from stdin in the given format."""
+    if fmt == "jsonl":
+        for line in stream:
+            if line.strip():
+                yield book_from_json(line)
+    elif fmt == "nul":
+        for i, raw in enumerate(iter_split(stream, b"\0")):
+            yield BookContent(str(i), str(i), "unknown", decode_text(raw), STDIN_PATH)
+    else:
+        separator = b"\0" if fmt == "paths0" else b"\n"
+        for raw in iter_split(stream, separator):
+            path = raw.decode("utf-8", errors="surrogateescape").strip("\r\n")
+            if path:
+                yield book_from_path(Path(path))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Stream TTR results as JSONL")
+    parser.add_argument("paths", nargs="*", type=Path, help="Files to process (default: stdin)")
+    parser.add_argument(
+        "--format",
+        choices=["jsonl", "nul", "paths", "paths0"],
+        default="jsonl",
+        help="stdin format (default: jsonl)",
+    )
+    parser.add_argument(
+        "--sttr-chunk-size",
+        type=int,
+        default=1000,
+        help="Chunk size for STTR computation (default: 1000)",
+    )
+    parser.add_argument(
+        "--vocabulary-sketch",
+        action="store_true",
+        help="Attach a HyperLogLog sketch of each document's types",
+    )
+    parser.add_argument("--max-chars", type=int, help="Sample documents longer than this")
+    parser.add_argument(
+        "--max-seconds", type=float, help="Per-document time budget (normalize + tokenize)"
+    )
+    args = parser.parse_args()
+
+    tokenizer = VictorianTokenizer()
+    calculator = TTRCalculator(
+        TTRConfig(sttr_chunk_size=args.sttr_chunk_size, vocabulary_sketch=args.vocabulary_sketch)
+    )
+    budget = None
+    if args.max_chars or args.max_seconds:
+        budget = BookBudget(max_chars=args.max_chars, max_seconds=args.max_seconds)
+
+    documents: Iterable[Document] = (
+        map(book_from_path, args.paths)
+        if args.paths
+        else iter_documents(sys.stdin.buffer, args.format)
+    )
+
+    failed = False
+    sys.stdout.flush()
+    out, err = sys.stdout.fileno(), sys.stderr.fileno()
+    try:
+        for content in documents:
+            if isinstance(content, Exception):
+                # Unreadable file or malformed record: report and keep going
+                write_line(err, json.dumps({"error": str(content)}))
+                failed = True
+                continue
+
+            proc_result = process_content(content, tokenizer, calculator, budget=budget)
+            if proc_result.success and proc_result.result:
+                write_line(out, proc_result.result.model_dump_json())
+            else:
+                error = {"id": content.gutenberg_id, "error": proc_result.error}
+                write_line(err, json.dumps(error))
+                failed = True
+    except BrokenPipeError:
+        # Downstream closed early (e.g. `| head`); stop quietly
+        sys.stderr.close()
+        return 0
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
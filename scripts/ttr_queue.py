@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Distributed TTR processing through a shared SQLite work queue.
+
+Run one coordinator, any number of workers (on this host, or on several
+nodes that share the project directory), then merge the worker shards.
+Workers must be given the same metric and budget options as the enqueue
+step; the queue records them and refuses workers that differ. Enqueueing
+into a new queue moves shards from earlier runs aside.
+
+Usage:
+    poetry run python scripts/ttr_queue.py enqueue
+    poetry run python scripts/ttr_queue.py enqueue --authors dickens austen
+    poetry run python scripts/ttr_queue.py work --worker-id node1-a
+    poetry run python scripts/ttr_queue.py status
+    poetry run python scripts/ttr_queue.py merge
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import sys
+from pathlib import Path
+
+# Add project root to path for imports - must be before project imports
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from gutenburg_stylometry.metrics.ttr import TTRConfig  # noqa: E402
+from gutenburg_stylometry.services.budget import BookBudget  # noqa: E402
+from gutenburg_stylometry.services.ttr_service import TTRService  # noqa: E402
+from gutenburg_stylometry.services.work_queue import (  # noqa: E402
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_MAX_ATTEMPTS,
+    TaskQueue,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed TTR processing via a work queue")
+    parser.add_argument(
+        "--base-dir", type=Path, default=PROJECT_ROOT, help="Project base directory"
+    )
+    parser.add_argument(
+        "--queue", type=Path, help="Queue database (default: data/queue/ttr.sqlite)"
+    )
+    parser.add_argument("--archive", type=Path, help="Read books from this archive")
+    parser.add_argument(
+        "--sttr-chunk-size",
+        type=int,
+        default=1000,
+        help="Chunk size for STTR computation (default: 1000)",
+    )
+    parser.add_argument("--max-chars", type=int, help="Per-book size budget in characters")
+    parser.add_argument(
+        "--max-seconds", type=float, help="Per-book time budget (normalize + tokenize)"
+    )
+    parser.add_argument(
+        "--oversize",
+        choices=["sample", "skip"],
+        default="sample",
+        help="What to do with books over --max-chars (default: sample)",
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=DEFAULT_LEASE_SECONDS,
+        help=f"Lease duration before a task is retried (default: {DEFAULT_LEASE_SECONDS:.0f})",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=DEFAULT_MAX_ATTEMPTS,
+        help=f"Attempts per book before it is marked failed (default: {DEFAULT_MAX_ATTEMPTS})",
+    )
+    parser.add_argument(
+        "--shared-fs",
+        action="store_true",
+        help="Workers run on several nodes: use a rollback journal instead of WAL",
+    )
+
+    commands = parser.add_subparsers(dest="command", required=True)
+    enqueue = commands.add_parser("enqueue", help="Queue every book (coordinator)")
+    enqueue.add_argument("--authors", nargs="+", help="Only queue these authors")
+    work = commands.add_parser("work", help="Process books until the queue is drained")
+    work.add_argument("--worker-id", default=f"{socket.gethostname()}-{os.getpid()}")
+    work.add_argument("--batch-size", type=int, default=8, help="Tasks leased at a time")
+    work.add_argument("--no-wait", action="store_true", help="Exit as soon as nothing is pending")
+    commands.add_parser("status", help="Show task counts and failures")
+    commands.add_parser("merge", help="Merge worker shards into per-author outputs")
+
+    args = parser.parse_args()
+
+    service = TTRService(
+        args.base_dir,
+        ttr_config=TTRConfig(sttr_chunk_size=args.sttr_chunk_size),
+        archive=args.archive,
+        budget=(
+            BookBudget(
+                max_chars=args.max_chars,
+                max_seconds=args.max_seconds,
+                oversize=args.oversize,
+            )
+            if args.max_chars or args.max_seconds
+            else None
+        ),
+    )
+    queue = TaskQueue(
+        args.queue or service.queue_path,
+        lease_seconds=args.lease_seconds,
+        max_attempts=args.max_attempts,
+        journal_mode="DELETE" if args.shared_fs else "WAL",
+    )
+    with queue:
+        if args.command == "merge":
+            # Merge the queue's run, whatever settings this command was given
+            aggregates = service.merge_shards(config=queue.run_config())
+            print(f"Merged {len(aggregates)} authors into {service.metrics_dir}")
+        elif args.command == "enqueue":
+            try:
+                added = service.enqueue_corpus(queue, authors=args.authors)
+            except ValueError as e:
+                sys.exit(f"error: {e}")
+            print(f"Queued {added} new books")
+        elif args.command == "work":
+            try:
+                stats = service.run_queue_worker(
+                    queue,
+                    args.worker_id,
+                    batch_size=args.batch_size,
+                    wait=not args.no_wait,
+                )
+            except ValueError as e:
+                sys.exit(f"error: {e}")
+            print(
+                f"{args.worker_id}: {stats.files_succeeded} succeeded, "
+                f"{stats.files_failed} failed attempts, {stats.total_words:,} words"
+            )
+        else:
+            for status, count in sorted(queue.counts().items()):
+                print(f"{status:>8}: {count}")
+            for file_path, error in queue.failures():
+                print(f"  failed: {file_path}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Tests for the corpus catalog."""
+
+import os
+
+from gutenburg_stylometry.io.catalog import CorpusCatalog
+from gutenburg_stylometry.io.reader import NormalizedFileReader
+
+
+def write_corpus(normalized_dir):
+    """Create a tiny normalized corpus."""
+    normalized_dir.mkdir(parents=True)
+    (normalized_dir / "austen-emma-158.txt").write_text("Emma Woodhouse, handsome")
+    (normalized_dir / "austen-persuasion-105.txt").write_text("Sir Walter Elliot")
+    (normalized_dir / "dickens-hard-times-786.txt").write_text("Now, what I want is, Facts.")
+    (normalized_dir / "notes.txt").write_text("unparseable")
+
+
+class TestCorpusCatalog:
+    """Tests for CorpusCatalog."""
+
+    def test_build_indexes_authors_and_ids(self, tmp_path):
+        """One scan indexes every parseable file."""
+        root = tmp_path / "data" / "normalized"
+        write_corpus(root)
+        catalog = CorpusCatalog.open(root)
+        assert catalog.authors() == ["austen", "dickens"]
+        assert [p.name for p in catalog.files_for("austen")] == [
+            "austen-emma-158.txt",
+            "austen-persuasion-105.txt",
+        ]
+        assert catalog.by_id("786").title == "hard-times"
+
+    def test_refresh_is_incremental(self, tmp_path):
+        """Only added, changed and removed files are reported."""
+        root = tmp_path / "data" / "normalized"
+        index_path = tmp_path / "catalog.json"
+        write_corpus(root)
+        CorpusCatalog.open(root, index_path)
+
+        (root / "austen-emma-158.txt").write_text("Emma Woodhouse, handsome, clever")
+        os.utime(root / "austen-emma-158.txt", ns=(1, 1))
+        (root / "dickens-hard-times-786.txt").unlink()
+        (root / "eliot-middlemarch-145.txt").write_text("Miss Brooke")
+
+        catalog = CorpusCatalog(root, index_path)
+        catalog.load()
+        stats = catalog.refresh()
+        assert (stats.added, stats.changed, stats.removed, stats.unchanged) == (1, 1, 1, 1)
+        assert catalog.authors() == ["austen", "eliot"]
+
+    def test_reader_uses_catalog(self, tmp_path):
+        """The reader serves listings from the catalog."""
+        write_corpus(tmp_path / "data" / "normalized")
+        catalog = CorpusCatalog.open(tmp_path / "data" / "normalized")
+        reader = NormalizedFileReader(tmp_path, catalog=catalog)
+        plain = NormalizedFileReader(tmp_path)
+        assert reader.list_authors() == plain.list_authors()
+        assert list(reader.iter_author_files("austen")) == list(plain.iter_author_files("austen"))
+        content = reader.read(next(reader.iter_author_files("dickens")))
+        assert (content.author, content.gutenberg_id) == ("dickens", "786")
+
+    def test_reader_excludes_catalog_authors(self, tmp_path):
+        """An author whose only books are excluded is not listed."""
+        write_corpus(tmp_path / "data" / "normalized")
+        catalog = CorpusCatalog.open(tmp_path / "data" / "normalized")
+        exclude = {"dickens-hard-times-786.txt"}
+        reader = NormalizedFileReader(tmp_path, catalog=catalog, exclude=exclude)
+        plain = NormalizedFileReader(tmp_path, exclude=exclude)
+        assert reader.list_authors() == plain.list_authors() == ["austen"]
@@ -0,0 +1,73 @@
+"""Tests for hashed character n-gram profiles."""
+
+import numpy as np
+
+from gutenburg_stylometry.metrics import char_ngrams
+from gutenburg_stylometry.metrics.char_ngrams import (
+    CharNgramProfiler,
+    load_profiles,
+    save_profiles,
+)
+from gutenburg_stylometry.services.ttr_service import TTRService
+
+from tests.test_dedup import make_text
+from tests.test_ttr_service import write_corpus
+
+
+def cosine(a: np.ndarray, b: np.ndarray) -> float:
+    """Cosine similarity of two vectors."""
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+class TestCharNgramProfiler:
+    """Tests for counting, profiles and persistence."""
+
+    def test_counts_every_ngram_once_across_blocks(self, monkeypatch):
+        """Counts total every 2..5-gram, and block size does not change them."""
+        text = "The  Quick brown fox,\n jumps over the lazy dog. " * 50
+        profiler = CharNgramProfiler(dims=1024)
+        counts = profiler.counts(text)
+        data = " ".join(text.lower().split())
+        assert counts.sum() == sum(len(data) - n + 1 for n in range(2, 6))
+
+        monkeypatch.setattr(char_ngrams, "_BLOCK_BYTES", 37)
+        assert np.array_equal(profiler.counts(text), counts)
+
+    def test_profiles_fold_and_separate_styles(self):
+        """Folded profiles keep their mass; similar texts score higher."""
+        profiler = CharNgramProfiler()
+        a, b = make_text(1), make_text(2)
+        profile = profiler.profile(a, top_k=0)
+        assert np.isclose(profile.dense().sum(), 1.0)
+        assert np.isclose(profile.dense(256).sum(), 1.0)
+
+        same = cosine(profile.dense(), profiler.profile(b).dense())
+        other = cosine(profile.dense(), profiler.profile(b.replace("word", "zyx; ")).dense())
+        assert same > 0.9 > other
+
+    def test_top_k_and_round_trip(self, tmp_path):
+        """Profiles keep the top buckets and survive save/load."""
+        profiler = CharNgramProfiler(dims=4096)
+        profiles = {str(i): profiler.profile(make_text(i, 2000), top_k=100) for i in range(3)}
+        counts = profiler.counts(make_text(0, 2000))
+        assert len(profiles["0"].indices) == 100
+        assert profiles["0"].counts.min() >= np.sort(counts)[-100]
+
+        save_profiles(tmp_path / "p.npz", profiles)
+        loaded = load_profiles(tmp_path / "p.npz")
+        assert loaded.keys() == profiles.keys()
+        for key, profile in profiles.items():
+            assert np.array_equal(loaded[key].dense(), profile.dense())
+            assert loaded[key].total == profile.total
+
+    def test_service_extends_fingerprints(self, tmp_path):
+        """TTRService saves profiles and can add them to the fingerprint index."""
+        write_corpus(tmp_path)
+        service = TTRService(tmp_path)
+        service.process_author("austen")
+        profiles = service.build_char_ngram_profiles("austen")
+        assert len(service.load_char_ngram_profiles("austen")) == len(profiles) == 6
+
+        plain = service.build_fingerprint_index()
+        extended = service.build_fingerprint_index(char_ngram_dims=512)
+        assert extended.dims == plain.dims + 512
@@ -0,0 +1,71 @@
+"""Tests for the cross-author comparison service."""
+
+import json
+
+import numpy as np
+import pytest
+
+from gutenburg_stylometry.services.comparison_service import ComparisonService
+from gutenburg_stylometry.services.ttr_service import TTRService
+
+from tests.test_ttr_service import write_corpus
+
+
+def write_authors(base_dir, moved: str = "[0-2]"):
+    """Process a corpus split into austen and the books moved to bronte."""
+    write_corpus(base_dir)
+    normalized = base_dir / "data" / "normalized"
+    for path in list(normalized.glob(f"austen-book-{moved}-*.txt")):
+        path.rename(normalized / path.name.replace("austen", "bronte"))
+    TTRService(base_dir).process_author("austen")
+    TTRService(base_dir).process_author("bronte")
+
+
+class TestComparisonService:
+    """Tests for ComparisonService."""
+
+    def test_matrix_matches_per_author_statistics(self, tmp_path):
+        """Deltas and effect sizes agree with the per-book samples."""
+        write_authors(tmp_path)
+        service = ComparisonService(tmp_path, n_bootstrap=500)
+        samples = service.load_samples()
+        matrix = service.compute()
+        assert matrix.authors == ["austen", "bronte"]
+
+        a, b = samples["austen"]["ttr"], samples["bronte"]["ttr"]
+        pooled = np.sqrt((2 * a.var(ddof=1) + 2 * b.var(ddof=1)) / 4)
+        comparison = matrix.comparison("austen", "bronte")
+        assert comparison.ttr_delta == pytest.approx(a.mean() - b.mean(), abs=1e-6)
+        assert comparison.ttr_effect_size == pytest.approx((a.mean() - b.mean()) / pooled, abs=1e-5)
+        assert comparison.ttr_delta_ci_low <= comparison.ttr_delta <= comparison.ttr_delta_ci_high
+        assert matrix.comparison("bronte", "austen").ttr_delta == -comparison.ttr_delta
+
+        with pytest.raises(KeyError):
+            matrix.comparison("austen", "nobody")
+
+    def test_write_and_load_round_trip(self, tmp_path):
+        """The JSON artifact reloads to the same matrix."""
+        write_authors(tmp_path)
+        service = ComparisonService(tmp_path, n_bootstrap=200)
+        matrix = service.compute_and_write()
+        loaded = service.load()
+        assert loaded.authors == matrix.authors
+        assert list(loaded.iter_comparisons()) == list(matrix.iter_comparisons())
+
+    def test_single_book_authors(self, tmp_path):
+        """One book gives no deviation, but never NaN in the output."""
+        write_authors(tmp_path, moved="0")
+        service = ComparisonService(tmp_path, n_bootstrap=200)
+        matrix = service.compute_and_write()
+
+        # austen has five books, so the pair still has a pooled deviation
+        assert matrix.comparison("austen", "bronte").ttr_effect_size is not None
+        assert np.isnan(matrix.metrics["ttr"].effect_size[1, 1])
+        data = json.loads(service.matrix_path.read_text())
+        assert data["metrics"]["ttr"]["std"][1] is None
+        assert data["metrics"]["ttr"]["effect_size"][1][1] is None
+
+    def test_no_authors(self, tmp_path):
+        """Comparing nothing is an error."""
+        with pytest.raises(ValueError):
+            ComparisonService(tmp_path).compute()
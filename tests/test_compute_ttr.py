@@ -0,0 +1,69 @@
+"""Tests for the batch TTR CLI's argument parsing."""
+
+import argparse
+import importlib.util
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from tests.test_ttr_service import write_corpus
+
+SCRIPT = Path(__file__).parent.parent / "scripts" / "compute_ttr.py"
+
+_spec = importlib.util.spec_from_file_location("compute_ttr", SCRIPT)
+compute_ttr = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(compute_ttr)
+
+
+class TestChunkSizeArguments:
+    """Tests for --sttr-chunk-size and --sttr-sweep parsing."""
+
+    def test_sweep_parses_sizes(self):
+        """Comma-separated sizes become a tuple."""
+        assert compute_ttr.chunk_sizes("100,250,1000") == (100, 250, 1000)
+
+    @pytest.mark.parametrize("value", ["0", "100,-5", "100,x", ""])
+    def test_bad_sizes_rejected(self, value):
+        """Non-positive or non-integer sizes are argument errors."""
+        with pytest.raises(argparse.ArgumentTypeError):
+            compute_ttr.chunk_sizes(value)
+
+    @pytest.mark.parametrize("option", ["--sttr-sweep=250,0", "--sttr-chunk-size=0"])
+    def test_cli_reports_clean_error(self, tmp_path, option):
+        """The CLI exits with a usage error rather than a traceback."""
+        completed = subprocess.run(
+            [sys.executable, str(SCRIPT), str(tmp_path), option],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        assert completed.returncode == 2
+        assert "must be positive" in completed.stderr
+        assert "Traceback" not in completed.stderr
+
+
+class TestOutputStreams:
+    """Tests for what the CLI writes to stdout and stderr."""
+
+    @pytest.mark.parametrize("profile", ["json", "prometheus"])
+    def test_stdout_progress_stream_stays_jsonl(self, tmp_path, profile):
+        """With --progress-stream -, stdout holds only snapshot lines."""
+        write_corpus(tmp_path, books=2)
+        completed = subprocess.run(
+            [
+                sys.executable,
+                str(SCRIPT),
+                str(tmp_path / "data" / "normalized"),
+                "--progress-stream=-",
+                f"--profile={profile}",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        snapshots = [json.loads(line) for line in completed.stdout.splitlines()]
+        assert snapshots[-1]["final"] is True
+        assert "tokens_per_second" in completed.stderr
@@ -0,0 +1,120 @@
+"""Tests for MinHash/LSH near-duplicate detection."""
+
+import json
+import random
+import tarfile
+import zipfile
+
+from gutenburg_stylometry.dedup import (
+    DEDUP_MAP_NAME,
+    DocumentSignature,
+    MinHasher,
+    build_dedup_map,
+    similarity,
+)
+from gutenburg_stylometry.normalize import normalize_files
+from gutenburg_stylometry.services.ttr_service import TTRService
+
+
+def make_text(seed: int, words: int = 6000) -> str:
+    """Random prose-like text."""
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(3000)]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def edit(text: str, every: int = 60) -> str:
+    """A lightly edited edition of a text."""
+    words = text.split()
+    for i in range(0, len(words), every):
+        words[i] = "variantword"
+    return " ".join(words)
+
+
+class TestMinHash:
+    """Tests for signatures and clustering."""
+
+    def test_similarity_tracks_overlap(self):
+        """Edited editions score high; unrelated texts score near zero."""
+        hasher = MinHasher()
+        original = make_text(1)
+        assert similarity(hasher.signature(original), hasher.signature(edit(original))) > 0.75
+        assert similarity(hasher.signature(original), hasher.signature(make_text(2))) < 0.1
+        assert hasher.signature("too short") is None
+
+    def test_clusters_keep_largest_version(self):
+        """Each cluster keeps its largest book and maps the others to it."""
+        hasher = MinHasher()
+        base, other = make_text(1), make_text(2)
+        texts = {
+            "a-first-1.txt": base,
+            "a-reprint-2.txt": edit(base) + " appendix",
+            "a-other-3.txt": other,
+        }
+        documents = [
+            DocumentSignature(name, len(text), i, hasher.signature(text))
+            for i, (name, text) in enumerate(texts.items())
+        ]
+        dedup_map = build_dedup_map(documents)
+        assert dedup_map["duplicates"] == {"a-first-1.txt": "a-reprint-2.txt"}
+        assert dedup_map["clusters"][0]["keep"] == "a-reprint-2.txt"
+
+
+class TestDedupMap:
+    """Tests for writing and honouring the dedup map."""
+
+    def test_normalize_and_service_honour_map(self, tmp_path):
+        """normalize_files writes the map, then skips and TTRService ignores duplicates."""
+        raw = tmp_path / "raw"
+        raw.mkdir()
+        base = make_text(1)
+        (raw / "austen-emma-158.txt").write_text(base)
+        (raw / "austen-emma-illustrated-19839.txt").write_text(edit(base) + " the end")
+        (raw / "austen-persuasion-105.txt").write_text(make_text(2))
+
+        normalized = tmp_path / "data" / "normalized"
+        stats = normalize_files(raw, normalized, dedup=True)
+        assert stats["files_written"] == 3
+        assert stats["near_duplicates"] == 1
+        dedup_map = json.loads((normalized / DEDUP_MAP_NAME).read_text())
+        assert dedup_map["duplicates"] == {"austen-emma.txt": "austen-emma-illustrated.txt"}
+
+        stats = normalize_files(raw, normalized)
+        assert stats["near_duplicates_skipped"] == 1
+        assert stats["files_written"] == 2
+
+        service = TTRService(tmp_path)
+        files = [p.name for p in service._reader.iter_author_files("austen")]
+        assert "austen-emma.txt" not in files and len(files) == 2
+        unfiltered = TTRService(tmp_path, honour_dedup=False)
+        assert len(list(unfiltered._reader.iter_author_files("austen"))) == 3
+
+    def test_archive_service_honours_map(self, tmp_path):
+        """Near-duplicates listed in the map are left out of archives too."""
+        normalized = tmp_path / "data" / "normalized"
+        normalized.mkdir(parents=True)
+        base = make_text(1)
+        (normalized / "austen-emma-158.txt").write_text(base)
+        (normalized / "austen-emma-illustrated-19839.txt").write_text(edit(base))
+        (normalized / "austen-persuasion-105.txt").write_text(make_text(2))
+        duplicates = {"austen-emma-158.txt": "austen-emma-illustrated-19839.txt"}
+        (normalized / DEDUP_MAP_NAME).write_text(json.dumps({"duplicates": duplicates}))
+        texts = sorted(normalized.glob("*.txt"))
+        with zipfile.ZipFile(tmp_path / "corpus.zip", "w") as zf:
+            for path in texts:
+                zf.write(path, f"corpus/{path.name}")
+        with tarfile.open(tmp_path / "corpus.tar", "w") as tf:
+            for path in texts:
+                tf.add(path, f"corpus/{path.name}")
+
+        for archive in (tmp_path / "corpus.zip", tmp_path / "corpus.tar"):
+            # A fresh tar reader streams without an index
+            streamed = TTRService(tmp_path, archive=archive)._reader.iter_books()
+            assert sorted(b.gutenberg_id for b in streamed) == ["105", "19839"]
+            service = TTRService(tmp_path, archive=archive)
+            assert service.duplicates == duplicates
+            files = [p.name for p in service._reader.iter_author_files("austen")]
+            assert "austen-emma-158.txt" not in files and len(files) == 2
+            assert service.process_author("austen").files_succeeded == 2
+            unfiltered = TTRService(tmp_path, archive=archive, honour_dedup=False)
+            assert unfiltered.process_author("austen").files_succeeded == 3
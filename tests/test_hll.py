@@ -0,0 +1,54 @@
+"""Tests for HyperLogLog vocabulary sketches."""
+
+import pytest
+
+from gutenburg_stylometry.metrics.hll import HyperLogLog
+from gutenburg_stylometry.metrics.ttr import TTRAggregator, TTRCalculator, TTRConfig
+
+
+class TestHyperLogLog:
+    """Tests for the sketch itself."""
+
+    @pytest.mark.parametrize("n", [50, 3000, 100_000])
+    def test_estimate_within_error(self, n):
+        """Estimates stay within a few standard errors of the true count."""
+        sketch = HyperLogLog()
+        sketch.add(f"word{i}" for i in range(n))
+        assert abs(sketch.estimate() - n) / n < 4 * sketch.relative_error
+
+    def test_union_and_serialization(self):
+        """Union counts shared types once and survives a round trip."""
+        a, b = HyperLogLog(), HyperLogLog()
+        a.add(f"w{i}" for i in range(20_000))
+        b.add(f"w{i}" for i in range(10_000, 30_000))
+        union = HyperLogLog.union([a, b])
+        assert abs(union.estimate() - 30_000) / 30_000 < 0.05
+
+        restored = HyperLogLog.from_base64(union.to_base64())
+        assert restored.estimate() == union.estimate()
+        assert len(union.to_base64()) < 8192
+
+    def test_precision_mismatch_rejected(self):
+        """Sketches with different precision cannot be merged."""
+        with pytest.raises(ValueError):
+            HyperLogLog(12).update(HyperLogLog(10))
+
+
+class TestVocabularyAggregation:
+    """Tests for sketch-based author vocabulary."""
+
+    def test_author_vocabulary_from_book_sketches(self):
+        """The author union approximates the exact type count across books."""
+        calculator = TTRCalculator(TTRConfig(vocabulary_sketch=True))
+        books = [[f"w{(i * 7 + j) % (2000 + i * 500)}" for j in range(5000)] for i in range(4)]
+        results = [calculator.compute(tokens, str(i), "t", "a") for i, tokens in enumerate(books)]
+
+        aggregates = TTRAggregator().aggregate(results, "a")
+        exact = len(set().union(*books))
+        assert aggregates["vocabulary_books"] == 4
+        assert abs(aggregates["vocabulary_estimate"] - exact) / exact < 0.05
+        assert aggregates["author_ttr"] == round(aggregates["vocabulary_estimate"] / 20000, 6)
+
+        plain = TTRCalculator().compute(books[0], "0", "t", "a")
+        assert plain.vocabulary_sketch is None
+        assert TTRAggregator().aggregate([plain], "a")["vocabulary_estimate"] is None
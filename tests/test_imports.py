@@ -0,0 +1,51 @@
+"""Tests for lazy package exports."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import gutenburg_stylometry
+from gutenburg_stylometry import io, metrics, services, similarity, stats
+
+
+def loaded_after(statement: str) -> list[str]:
+    """Modules (of interest) loaded by a statement in a fresh interpreter."""
+    probe = (
+        f"import json, sys; {statement}; print(json.dumps(sorted(m for m in sys.modules "
+        "if m.split('.')[0] in ('pydantic', 'numpy', 'rich') "
+        "or m == 'gutenburg_stylometry.tokenizer')))"
+    )
+    output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True)
+    return json.loads(output.stdout)
+
+
+class TestLazyExports:
+    """Tests for PEP 562 re-exports."""
+
+    def test_package_import_is_light(self):
+        """Importing the package loads neither the tokenizer nor pydantic."""
+        assert loaded_after("import gutenburg_stylometry") == []
+        assert loaded_after("import gutenburg_stylometry.tokenizer") == [
+            "gutenburg_stylometry.tokenizer"
+        ]
+
+    def test_cli_module_is_light(self):
+        """The batch CLI defers numpy, pydantic and rich until it runs."""
+        scripts = Path(__file__).parent.parent / "scripts"
+        statement = f"sys.path.insert(0, {str(scripts)!r}); import compute_ttr"
+        assert loaded_after(statement) == ["gutenburg_stylometry.tokenizer"]
+
+    def test_exports_resolve(self):
+        """Every name in each __all__ resolves and appears in dir()."""
+        for package in (gutenburg_stylometry, io, metrics, services, similarity, stats):
+            for name in package.__all__:
+                assert getattr(package, name) is not None
+                assert name in dir(package)
+
+    def test_unknown_attribute_raises(self):
+        """Names outside the exports still raise AttributeError."""
+        with pytest.raises(AttributeError, match="NoSuchThing"):
+            gutenburg_stylometry.NoSuchThing
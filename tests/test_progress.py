@@ -0,0 +1,52 @@
+"""Tests for progress tracking."""
+
+from gutenburg_stylometry.progress import ProgressTracker
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProgressTracker:
+    """Tests for ProgressTracker."""
+
+    def test_totals_rates_and_eta(self):
+        """Overall rates, ETA and per-worker status follow the updates."""
+        clock = FakeClock()
+        tracker = ProgressTracker(total_files=10, clock=clock)
+        for i in range(4):
+            clock.now += 1.0
+            tracker.update(
+                f"book-{i}.txt", ok=i != 3, tokens=1000, n_bytes=2_000_000, worker=f"w{i % 2}"
+            )
+
+        snapshot = tracker.snapshot()
+        assert snapshot["files_done"] == 4
+        assert snapshot["errors"] == 1
+        assert snapshot["files_per_sec"] == 1.0
+        assert snapshot["tokens_per_sec"] == 1000.0
+        assert snapshot["mb_per_sec"] == 2.0
+        assert snapshot["eta_seconds"] == 6.0
+        assert [w["books"] for w in snapshot["workers"]] == [2, 2]
+        assert snapshot["workers"][1]["last_file"] == "book-3.txt"
+
+    def test_recent_rate_uses_window(self):
+        """The recent rate reflects only the sliding window."""
+        clock = FakeClock()
+        tracker = ProgressTracker(total_files=100, window_seconds=5.0, clock=clock)
+        for _ in range(10):  # Slow start: one file every 10 seconds
+            clock.now += 10.0
+            tracker.update("slow.txt", ok=True)
+        for _ in range(20):  # Then four files per second
+            clock.now += 0.25
+            tracker.update("fast.txt", ok=True)
+
+        snapshot = tracker.snapshot()
+        assert snapshot["files_per_sec"] < 1.0
+        assert snapshot["recent_files_per_sec"] == 4.0
@@ -0,0 +1,135 @@
+"""Tests for the normalized file and archive readers."""
+
+import gzip
+import io
+import pickle
+import tarfile
+import zipfile
+
+from gutenburg_stylometry.io.archive import ArchiveReader, is_archive
+from gutenburg_stylometry.io.reader import NormalizedFileReader, parse_filename, read_text
+
+
+class TestReadText:
+    """Tests for read_text."""
+
+    def test_mmap_matches_read_text(self, tmp_path):
+        """Memory-mapped reads decode exactly like Path.read_text."""
+        path = tmp_path / "book.txt"
+        path.write_bytes("Café — naïve\r\nline two\rthree \xff".encode("utf-8") + b"\xff")
+        assert read_text(path, use_mmap=True) == path.read_text(encoding="utf-8", errors="replace")
+
+    def test_mmap_empty_file(self, tmp_path):
+        """Empty files cannot be mapped but still read as empty text."""
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+        assert read_text(path, use_mmap=True) == ""
+
+    def test_reader_mmap_mode(self, tmp_path):
+        """The reader returns identical content in mmap mode."""
+        normalized = tmp_path / "data" / "normalized"
+        normalized.mkdir(parents=True)
+        path = normalized / "austen-emma-158.txt"
+        path.write_text("Emma Woodhouse, handsome, clever, and rich")
+        assert NormalizedFileReader(tmp_path, use_mmap=True).read(path) == NormalizedFileReader(
+            tmp_path
+        ).read(path)
+
+
+class TestParseFilename:
+    """Tests for parse_filename."""
+
+    def test_multiword_title(self):
+        """Everything between author and ID is the title."""
+        assert parse_filename("dickens-great-expectations-1400.txt") == (
+            "dickens",
+            "great-expectations",
+            "1400",
+        )
+
+
+BOOKS = {
+    "austen-emma-158.txt": "Emma Woodhouse, handsome, clever, and rich",
+    "austen-persuasion-105.txt": "Sir Walter Elliot, of Kellynch Hall",
+    "dickens-hard-times-786.txt": "Now, what I want is, Facts.",
+}
+
+
+def write_archives(tmp_path):
+    """Write the same books as zip, tar.gz and a .txt.gz directory."""
+    zip_path = tmp_path / "corpus.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        for name, text in BOOKS.items():
+            zf.writestr(f"txt/{name}", text)
+
+    tar_path = tmp_path / "corpus.tar.gz"
+    with tarfile.open(tar_path, "w:gz") as tf:
+        for name, text in BOOKS.items():
+            data = text.encode("utf-8")
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+
+    gz_dir = tmp_path / "gz"
+    gz_dir.mkdir()
+    for name, text in BOOKS.items():
+        with gzip.open(gz_dir / f"{name}.gz", "wt", encoding="utf-8") as f:
+            f.write(text)
+
+    return [zip_path, tar_path, gz_dir]
+
+
+class TestArchiveReader:
+    """Tests for ArchiveReader."""
+
+    def test_streams_books_from_every_format(self, tmp_path):
+        """Zip, tar.gz and .txt.gz directories yield the same books."""
+        for source in write_archives(tmp_path):
+            reader = ArchiveReader(source)
+            assert reader.list_authors() == ["austen", "dickens"]
+            books = list(reader.iter_author_books("austen"))
+            assert sorted(b.text for b in books) == sorted(
+                BOOKS[n] for n in BOOKS if n.startswith("austen")
+            )
+            path = next(reader.iter_author_files("dickens"))
+            assert reader.read(path).gutenberg_id == "786"
+
+    def test_shards_partition_members(self, tmp_path):
+        """Shards are disjoint and cover every book, even after pickling."""
+        for source in write_archives(tmp_path):
+            reader = pickle.loads(pickle.dumps(ArchiveReader(source)))
+            shards = [{b.gutenberg_id for b in reader.iter_books(i, 2)} for i in range(2)]
+            assert not shards[0] & shards[1]
+            assert shards[0] | shards[1] == {"158", "105", "786"}
+
+    def test_tar_is_read_through_one_handle(self, tmp_path, monkeypatch):
+        """Authors and single reads after the first reuse one indexed tar handle."""
+        _, tar_path, _ = write_archives(tmp_path)
+        opened = []
+        real_open = tarfile.open
+
+        def counting_open(*args, **kwargs):
+            opened.append(args)
+            return real_open(*args, **kwargs)
+
+        monkeypatch.setattr(tarfile, "open", counting_open)
+        with ArchiveReader(tar_path) as reader:
+            austen = [b.gutenberg_id for b in reader.iter_author_books("austen")]
+            dickens = [b.gutenberg_id for b in reader.iter_author_books("dickens")]
+            emma = reader.read(tar_path / "austen-emma-158.txt")
+            assert reader.list_authors() == ["austen", "dickens"]
+        assert austen == ["158", "105"] and dickens == ["786"]
+        assert emma.text == BOOKS["austen-emma-158.txt"]
+        assert len(opened) == 1
+
+    def test_is_archive_needs_only_gzipped_texts(self, tmp_path):
+        """A directory is a .txt.gz bundle only if none of its texts are plain."""
+        _, tar_path, gz_dir = write_archives(tmp_path)
+        assert is_archive(tar_path) and is_archive(gz_dir)
+
+        mixed = tmp_path / "mixed"
+        mixed.mkdir()
+        (mixed / "austen-emma-158.txt").write_text(BOOKS["austen-emma-158.txt"])
+        (mixed / "austen-persuasion-105.txt.gz").write_bytes(b"")
+        assert not is_archive(mixed)
+        assert not is_archive(tmp_path / "missing")
@@ -0,0 +1,142 @@
+"""Tests for the local analysis server."""
+
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+from gutenburg_stylometry.services.server import (
+    AnalysisService,
+    AnalysisUnixServer,
+    MicroBatcher,
+    make_server,
+)
+from gutenburg_stylometry.services.ttr_service import TTRService
+
+from tests.test_ttr_service import WORDS, write_corpus
+
+
+class TestMicroBatcher:
+    """Tests for request coalescing."""
+
+    def test_concurrent_submissions_share_batches(self):
+        """Items submitted together are processed in few batches, results in order."""
+        batches = []
+
+        def double(items):
+            batches.append(len(items))
+            return [item * 2 for item in items]
+
+        batcher = MicroBatcher(double, batch_size=8, max_wait_ms=50)
+        futures = [batcher.submit(i) for i in range(20)]
+        assert [f.result() for f in futures] == [i * 2 for i in range(20)]
+        assert sum(batches) == 20 and max(batches) <= 8 and len(batches) < 20
+        batcher.close()
+
+    def test_batch_errors_reach_every_caller(self):
+        """An exception in the batch function fails each waiting future."""
+        def fail(items):
+            raise RuntimeError("boom")
+
+        batcher = MicroBatcher(fail, max_wait_ms=1)
+        with pytest.raises(RuntimeError):
+            batcher.submit(1).result()
+        batcher.close()
+
+
+@pytest.fixture
+def client(tmp_path):
+    """A server on a free port over a processed two-author corpus."""
+    write_corpus(tmp_path)
+    normalized = tmp_path / "data" / "normalized"
+    for path in list(normalized.glob("austen-book-[0-2]-*.txt")):
+        path.rename(normalized / path.name.replace("austen", "bronte"))
+    TTRService(tmp_path).process_author("austen")
+    TTRService(tmp_path).process_author("bronte")
+
+    service = AnalysisService(tmp_path, batch_wait_ms=1)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def request(method, path, body=None):
+        conn = http.client.HTTPConnection(*server.server_address[:2], timeout=30)
+        conn.request(method, path, body=json.dumps(body) if body is not None else None)
+        response = conn.getresponse()
+        payload = json.loads(response.read())
+        conn.close()
+        return response.status, payload
+
+    yield request
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+class TestAnalysisServer:
+    """End-to-end tests over HTTP."""
+
+    def test_score_compare_and_nearest(self, client):
+        """Texts are scored, authors compared and neighbours found."""
+        status, result = client("POST", "/score", {"text": "the cat sat on the mat " * 50})
+        assert status == 200
+        assert result["total_words"] == 300 and result["unique_words"] == 5
+
+        status, comparison = client("GET", "/compare?a=austen&b=bronte")
+        assert status == 200
+        assert comparison["author_a"] == "austen" and comparison["ttr_delta"] is not None
+
+        status, nearest = client("GET", "/nearest?id=103&k=2")
+        assert status == 200 and len(nearest["neighbors"]) == 2
+        status, nearest = client("POST", "/nearest", {"text": "a tale of two words " * 200, "k": 3})
+        assert status == 200 and len(nearest["neighbors"]) == 3
+
+        status, health = client("GET", "/health")
+        assert health["cached_authors"] == 2 and health["index_loaded"]
+
+    def test_errors_map_to_status_codes(self, client):
+        """Unknown authors are 404s and malformed requests are 400s."""
+        assert client("GET", "/compare?a=austen&b=nobody")[0] == 404
+        assert client("POST", "/score", {"title": "no text"})[0] == 400
+        assert client("GET", "/nearest?k=3")[0] == 400
+        assert client("GET", "/missing")[0] == 404
+
+    def test_concurrent_scores_are_batched(self, client):
+        """Simultaneous score requests return correct, individually routed results."""
+        results = {}
+
+        def score(n):
+            results[n] = client("POST", "/score", {"text": " ".join(WORDS[:n])})
+
+        threads = [threading.Thread(target=score, args=(n,)) for n in range(10, 20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(results[n][1]["unique_words"] == n for n in range(10, 20))
+
+
+class TestUnixSocket:
+    """Tests for binding the Unix domain socket."""
+
+    def test_refuses_to_replace_other_files(self, tmp_path):
+        """A regular file at the socket path is left alone."""
+        path = tmp_path / "README.md"
+        path.write_text("keep me")
+        with pytest.raises(FileExistsError):
+            AnalysisUnixServer(path, service=None)
+        assert path.read_text() == "keep me"
+
+    def test_replaces_stale_socket(self, tmp_path):
+        """A socket left behind by an earlier run is replaced."""
+        path = tmp_path / "serve.sock"
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(path))
+        stale.close()
+
+        server = AnalysisUnixServer(path, service=None)
+        assert path.is_socket()
+        server.server_close()
+        assert not path.exists()
@@ -0,0 +1,111 @@
+"""Tests for the fingerprint similarity index."""
+
+import numpy as np
+import pytest
+
+from gutenburg_stylometry.models import TTRResult
+from gutenburg_stylometry.similarity import FingerprintIndex
+
+
+def make_result(gutenberg_id: str, author: str, sttr: float, delta_std: float) -> TTRResult:
+    """Build a minimal TTRResult with the fields the fingerprint uses."""
+    return TTRResult(
+        gutenberg_id=gutenberg_id,
+        title=f"book-{gutenberg_id}",
+        author=author,
+        total_words=50000,
+        unique_words=8000,
+        ttr=0.16,
+        root_ttr=35.7,
+        log_ttr=0.83,
+        sttr=sttr,
+        sttr_std=0.01,
+        chunk_count=50,
+        delta_mean=0.0,
+        delta_std=delta_std,
+        delta_min=-0.05,
+        delta_max=0.05,
+    )
+
+
+def make_corpus() -> list[TTRResult]:
+    """Two well-separated authors."""
+    return [
+        make_result("1", "austen", 0.41, 0.010),
+        make_result("2", "austen", 0.412, 0.011),
+        make_result("3", "austen", 0.409, 0.012),
+        make_result("4", "eliot", 0.45, 0.030),
+        make_result("5", "eliot", 0.448, 0.031),
+        make_result("6", "eliot", 0.451, 0.029),
+    ]
+
+
+class TestFingerprintIndex:
+    """Tests for FingerprintIndex."""
+
+    def test_query_excludes_self_and_finds_same_author(self):
+        """Nearest neighbours of a book are its author's other books."""
+        index = FingerprintIndex.from_results(make_corpus())
+        hits = index.query("1", k=2)
+        assert [h.gutenberg_id for h in hits if h.gutenberg_id == "1"] == []
+        assert {h.author for h in hits} == {"austen"}
+
+    def test_blocked_search_matches_single_block(self):
+        """Block size does not change exact results."""
+        corpus = make_corpus()
+        single = FingerprintIndex.from_results(corpus)
+        blocked = FingerprintIndex.from_results(corpus, block_size=2)
+        assert single.query("4", k=3) == blocked.query("4", k=3)
+
+    def test_approximate_matches_exact_on_small_corpus(self):
+        """With every row as a candidate, LSH search equals exact search."""
+        index = FingerprintIndex.from_results(make_corpus())
+        index.enable_approximate(n_bits=64)
+        exact = index.query("5", k=3)
+        approx = index.query("5", k=3, approximate=True)
+        assert [h.gutenberg_id for h in exact] == [h.gutenberg_id for h in approx]
+
+    def test_nearest_authors(self):
+        """Author centroids are queryable by author name."""
+        index = FingerprintIndex.from_results(make_corpus())
+        hits = index.nearest_authors("austen", k=5)
+        assert [h.gutenberg_id for h in hits] == ["eliot"]
+
+    def test_save_and_load_roundtrip(self, tmp_path):
+        """A loaded index answers queries identically."""
+        index = FingerprintIndex.from_results(make_corpus())
+        path = tmp_path / "index.npz"
+        index.save(path)
+        loaded = FingerprintIndex.load(path)
+        assert loaded.query("2", k=3) == index.query("2", k=3)
+        query = make_result("99", "unknown", 0.449, 0.030)
+        assert loaded.query_result(query, k=1)[0].author == "eliot"
+
+    def test_profiles_extend_vectors(self):
+        """Frequency profiles add dimensions to the fingerprint."""
+        corpus = make_corpus()
+        profiles = {r.gutenberg_id: np.ones(4) for r in corpus}
+        index = FingerprintIndex.from_results(corpus, profiles=profiles)
+        assert index.dims == 9 + 4
+
+    def test_query_checks_profile_and_k(self):
+        """Missing profiles and non-positive k are clear errors."""
+        corpus = make_corpus()
+        profiles = {r.gutenberg_id: np.ones(4) for r in corpus}
+        index = FingerprintIndex.from_results(corpus, profiles=profiles)
+        query = make_result("99", "unknown", 0.449, 0.030)
+
+        with pytest.raises(ValueError, match="profile"):
+            index.query_result(query, k=1)
+        with pytest.raises(ValueError, match="index expects"):
+            index.query_result(query, k=1, profile=np.ones(3))
+        assert len(index.query_result(query, k=1, profile=np.ones(4))) == 1
+
+        plain = FingerprintIndex.from_results(corpus)
+        with pytest.raises(ValueError, match="index expects"):
+            plain.query_result(query, k=1, profile=np.ones(4))
+        for k in (0, -1):
+            with pytest.raises(ValueError, match="k must be"):
+                plain.query_result(query, k=k)
+            with pytest.raises(ValueError, match="k must be"):
+                plain.query("1", k=k)
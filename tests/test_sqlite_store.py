@@ -0,0 +1,56 @@
+"""Tests for the SQLite metrics store."""
+
+import pytest
+
+from gutenburg_stylometry.io.sqlite_store import SQLiteMetricsStore
+from gutenburg_stylometry.metrics.ttr import TTRAggregator, TTRConfig
+from gutenburg_stylometry.services.ttr_service import TTRService
+
+from tests.test_ttr_service import write_corpus
+
+
+class TestSQLiteMetricsStore:
+    """Tests for writing, reading and SQL aggregation."""
+
+    def test_round_trip_and_sql_aggregate(self, tmp_path):
+        """Results survive the store and SQL aggregates match TTRAggregator."""
+        write_corpus(tmp_path)
+        config = TTRConfig(vocabulary_sketch=True, vocabulary_growth=True, sttr_sweep=(250, 500))
+        jsonl = TTRService(tmp_path, ttr_config=config)
+        jsonl.process_author("austen")
+        results = jsonl.load_results("austen")
+
+        with SQLiteMetricsStore(tmp_path / "m.sqlite", batch_size=4) as store:
+            store.write_many(results)
+            loaded = store.load_results("austen")
+            assert sorted(loaded, key=lambda r: r.gutenberg_id) == sorted(
+                results, key=lambda r: r.gutenberg_id
+            )
+
+            expected = TTRAggregator().aggregate(results, "austen")
+            aggregate = store.aggregate("austen")
+            for key, value in aggregate.items():
+                assert value == pytest.approx(expected[key], abs=2e-6), key
+            assert store.heaps_beta_mean("austen") == pytest.approx(expected["heaps_beta_mean"])
+
+            top = store.top_books("ttr", limit=2)
+            assert [r.ttr for r in top] == sorted((r.ttr for r in results), reverse=True)[:2]
+            assert store.aggregate("nobody") is None
+
+    def test_service_writes_and_aggregates_through_store(self, tmp_path):
+        """process_author fills the store, resumes from it, and aggregates in SQL."""
+        write_corpus(tmp_path)
+        with SQLiteMetricsStore(tmp_path / "m.sqlite", batch_size=2) as store:
+            service = TTRService(tmp_path, store=store)
+            stats = service.process_author("austen", prefetch=2)
+            assert stats.files_succeeded == 6
+            assert not (service.metrics_dir / "austen.jsonl").exists()
+            assert len(store.book_ids("austen")) == 6
+            assert service.list_processed_authors() == ["austen"]
+
+            resumed = service.process_author("austen", resume=True)
+            assert resumed.files_resumed == 6 and resumed.files_processed == 0
+
+            aggregate = service.aggregate_author("austen")
+            assert aggregate["book_count"] == 6
+            assert store.load_aggregate("austen")["ttr_mean"] == aggregate["ttr_mean"]
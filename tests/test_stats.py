@@ -0,0 +1,90 @@
+"""Tests for resampling and significance testing."""
+
+import numpy as np
+
+from gutenburg_stylometry.stats import (
+    benjamini_hochberg,
+    bootstrap_group_means,
+    cohens_d_matrix,
+    pairwise_tests,
+    run_pair_test,
+)
+
+
+class TestResampling:
+    """Tests for batched bootstrap helpers."""
+
+    def test_bootstrap_group_means_shape_and_center(self):
+        """Replicate means center on each group's sample mean."""
+        rng = np.random.default_rng(0)
+        groups = [rng.normal(0.4, 0.01, 30), rng.normal(0.45, 0.01, 5), np.array([])]
+        boot = bootstrap_group_means(groups, n_resamples=4000, rng=rng)
+        assert boot.shape == (3, 4000)
+        assert abs(boot[0].mean() - groups[0].mean()) < 1e-3
+        assert abs(boot[1].mean() - groups[1].mean()) < 1e-3
+        assert np.isnan(boot[2]).all()
+
+    def test_bootstrap_draws_stay_within_group(self):
+        """Resampled values never leak across group boundaries."""
+        groups = [np.zeros(3), np.ones(7)]
+        boot = bootstrap_group_means(groups, n_resamples=500)
+        assert (boot[0] == 0).all()
+        assert (boot[1] == 1).all()
+
+    def test_cohens_d_is_antisymmetric(self):
+        """d(a, b) == -d(b, a)."""
+        d = cohens_d_matrix(np.array([1.0, 2.0]), np.array([1.0, 1.0]), np.array([10, 10]))
+        assert d[0, 1] == -d[1, 0] == -1.0
+        assert d[0, 0] == 0.0
+
+    def test_cohens_d_single_observation_groups(self):
+        """A one-value group pools with larger groups; two such groups give NaN."""
+        means = np.array([1.0, 2.0, 4.0])
+        d = cohens_d_matrix(means, np.array([1.0, np.nan, np.nan]), np.array([5, 1, 1]))
+        # Pooled variance is (4 * 1) / (5 + 1 - 2) = 1
+        assert d[0, 1] == -1.0 and d[0, 2] == -3.0
+        assert np.isnan(d[1, 2]) and np.isnan(d[1, 1])
+
+
+class TestSignificance:
+    """Tests for permutation/bootstrap significance tests."""
+
+    def test_separated_groups_are_significant(self):
+        """Clearly different authors get a tiny p-value."""
+        rng = np.random.default_rng(1)
+        a, b = rng.normal(0.40, 0.01, 20), rng.normal(0.45, 0.01, 20)
+        for method in ("permutation", "bootstrap"):
+            result = run_pair_test("a", "b", a, b, metric="sttr", method=method, seed=0)
+            assert result.p_value < 0.01
+            assert result.observed_delta < 0
+
+        boot = run_pair_test("a", "b", a, b, metric="sttr", method="bootstrap", seed=0)
+        assert boot.ci_low < boot.observed_delta < boot.ci_high < 0
+
+    def test_identical_distributions_not_significant(self):
+        """Samples from the same distribution are not flagged."""
+        rng = np.random.default_rng(2)
+        a, b = rng.normal(0.42, 0.01, 25), rng.normal(0.42, 0.01, 25)
+        result = run_pair_test("a", "b", a, b, metric="sttr", seed=0)
+        assert result.p_value > 0.05
+
+    def test_small_groups_have_no_pvalue(self):
+        """Single-book authors cannot be tested."""
+        result = run_pair_test("a", "b", np.array([0.4]), np.array([0.4, 0.5]), metric="ttr")
+        assert result.p_value is None
+
+    def test_benjamini_hochberg(self):
+        """Adjusted p-values are monotone and ignore NaN."""
+        adjusted = benjamini_hochberg(np.array([0.01, np.nan, 0.04, 0.03]))
+        assert np.isnan(adjusted[1])
+        assert np.allclose(adjusted[[0, 2, 3]], [0.03, 0.04, 0.04])
+
+    def test_process_pool_matches_serial(self):
+        """Per-pair seeding makes pooled results identical to serial ones."""
+        rng = np.random.default_rng(3)
+        samples = {name: rng.normal(0.42, 0.02, 12) for name in ("a", "b", "c", "d")}
+        serial = pairwise_tests(samples, metric="sttr", n_resamples=500, workers=1)
+        pooled = pairwise_tests(samples, metric="sttr", n_resamples=500, workers=2)
+        assert serial == pooled
+        assert len(serial) == 6
+        assert all(r.p_adjusted is not None for r in serial)
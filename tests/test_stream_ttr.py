@@ -0,0 +1,85 @@
+"""Tests for the streaming stdin-to-JSONL CLI."""
+
+import importlib.util
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from tests.test_ttr_service import WORDS
+
+SCRIPT = Path(__file__).parent.parent / "scripts" / "stream_ttr.py"
+
+_spec = importlib.util.spec_from_file_location("stream_ttr", SCRIPT)
+stream_ttr = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(stream_ttr)
+
+
+def run(stdin: bytes, *args: str) -> tuple[int, list[dict], list[dict]]:
+    """Run the CLI; return the exit status and the parsed stdout and stderr lines."""
+    completed = subprocess.run(
+        [sys.executable, str(SCRIPT), *args], input=stdin, capture_output=True, check=False
+    )
+    stdout, stderr = (
+        [json.loads(line) for line in output.decode().splitlines()]
+        for output in (completed.stdout, completed.stderr)
+    )
+    return completed.returncode, stdout, stderr
+
+
+class TestIterSplit:
+    """Tests for block-wise record splitting."""
+
+    @pytest.mark.parametrize("block", [1, 2, 3, 64])
+    def test_separators_across_block_boundaries(self, monkeypatch, block):
+        """Records come out the same whatever the block size."""
+        monkeypatch.setattr(stream_ttr, "READ_BLOCK", block)
+        stream = io.BytesIO(b"ab\0cde\0\0f")
+        assert list(stream_ttr.iter_split(stream, b"\0")) == [b"ab", b"cde", b"", b"f"]
+
+    def test_trailing_separator(self):
+        """A final separator does not produce an empty record."""
+        assert list(stream_ttr.iter_split(io.BytesIO(b"a\nb\n"), b"\n")) == [b"a", b"b"]
+
+
+class TestStreamCli:
+    """End-to-end tests of scripts/stream_ttr.py."""
+
+    def test_jsonl_errors_go_to_stderr(self):
+        """Good records reach stdout, malformed ones stderr, and the exit status is 1."""
+        stdin = b'{"id": 1, "text": "the cat sat"}\nnot json\n{"id": 2, "text": "a a a"}\n'
+        status, records, errors = run(stdin)
+        assert status == 1
+        assert [(r["gutenberg_id"], r["total_words"]) for r in records] == [("1", 3), ("2", 3)]
+        assert len(errors) == 1 and "Malformed record" in errors[0]["error"]
+
+    def test_nul_separated_documents(self):
+        """Raw documents are numbered in order."""
+        status, records, errors = run(b"one two\0three four four", "--format", "nul")
+        assert status == 0 and not errors
+        assert [(r["gutenberg_id"], r["unique_words"]) for r in records] == [("0", 2), ("1", 2)]
+
+    @pytest.mark.parametrize("fmt, separator", [("paths", b"\n"), ("paths0", b"\0")])
+    def test_paths_with_a_missing_file(self, tmp_path, fmt, separator):
+        """Metadata comes from file names; an unreadable path is reported and skipped."""
+        book = tmp_path / "austen-emma-158.txt"
+        book.write_text(" ".join(WORDS))
+        stdin = separator.join([str(book).encode(), str(tmp_path / "missing.txt").encode()])
+        status, records, errors = run(stdin, "--format", fmt)
+        assert status == 1 and len(errors) == 1
+        assert [(r["author"], r["gutenberg_id"]) for r in records] == [("austen", "158")]
+
+    def test_large_records_are_whole_lines(self):
+        """Records well over PIPE_BUF stay one line each."""
+        title = "t" * 10000
+        stdin = b"".join(
+            json.dumps({"id": i, "title": title, "text": "a b"}).encode() + b"\n" for i in range(3)
+        )
+        status, records, _ = run(stdin)
+        assert status == 0
+        assert [(r["gutenberg_id"], r["title"]) for r in records] == [
+            (str(i), title) for i in range(3)
+        ]
@@ -1,5 +1,6 @@
 """Tests for the tokenizer module."""
 
+from gutenburg_stylometry.protocols import Tokenizer as TokenizerProtocol
 from gutenburg_stylometry.tokenizer import VictorianTokenizer, tokenize
 
 
@@ -47,6 +48,11 @@ class TestVictorianTokenizer:
         assert "hello" in tokens
         assert "said" in tokens
 
+    def test_backtick_contractions(self):
+        """Test that grave accents read as apostrophes, in ASCII text too."""
+        assert tokenize("`twas ne`er o`er") == ["'twas", "ne'er", "o'er"]
+        assert tokenize("\u201c`twas\u201d") == ["'twas"]
+
     def test_em_dash_handling(self):
         """Test em-dash doesn't merge words."""
         text = "word\u2014another"  # word—another
@@ -63,3 +69,7 @@ class TestVictorianTokenizer:
         assert "a" not in tokens
         assert "big" in tokens
         assert "dog" in tokens
+
+    def test_satisfies_tokenizer_protocol(self):
+        """VictorianTokenizer implements the Tokenizer protocol."""
+        assert isinstance(VictorianTokenizer(), TokenizerProtocol)
@@ -0,0 +1,132 @@
+"""Tests for TTR metric computation."""
+
+import random
+
+import numpy as np
+import pytest
+
+from gutenburg_stylometry.metrics.ttr import (
+    ResultColumns,
+    TTRAggregator,
+    TTRCalculator,
+    TTRConfig,
+    fit_heaps,
+)
+
+
+def make_tokens(n: int, vocabulary: int = 800, seed: int = 3) -> list[str]:
+    """Random tokens from a Zipf-like vocabulary."""
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(vocabulary)]
+    weights = [1 / (i + 1) for i in range(vocabulary)]
+    return rng.choices(words, weights, k=n)
+
+
+class TestSTTRSweep:
+    """Tests for multi-chunk-size STTR."""
+
+    def test_sweep_matches_single_size_runs(self):
+        """Every sweep entry equals a separate run at that chunk size."""
+        tokens = make_tokens(12_345)
+        sizes = [100, 250, 500, 1000, 2000, 3000]
+        sweep = TTRCalculator().compute_sweep(tokens, sizes)
+
+        assert sweep.chunk_sizes == sizes
+        for i, size in enumerate(sizes):
+            single = TTRCalculator(TTRConfig(sttr_chunk_size=size)).compute(tokens, "1", "t", "a")
+            assert sweep.sttr[i] == single.sttr
+            assert sweep.sttr_std[i] == single.sttr_std
+            assert sweep.chunk_count[i] == single.chunk_count
+            assert sweep.delta_mean[i] == single.delta_mean
+            assert sweep.delta_std[i] == single.delta_std
+
+    def test_sizes_longer_than_book_are_empty(self):
+        """Chunk sizes the book cannot fill report no STTR."""
+        sweep = TTRCalculator().compute_sweep(make_tokens(2500), [5000, 500])
+        assert sweep.chunk_sizes == [500, 5000]
+        assert sweep.sttr[0] is not None
+        assert sweep.sttr[1] is None and sweep.chunk_count[1] == 0
+
+    def test_config_attaches_sweep_to_result(self):
+        """TTRConfig.sttr_sweep adds the sweep to compute() results."""
+        tokens = make_tokens(5000)
+        result = TTRCalculator(TTRConfig(sttr_sweep=(250, 1000))).compute(tokens, "1", "t", "a")
+        assert result.sttr_sweep is not None
+        assert result.sttr_sweep.sttr[1] == result.sttr
+        assert TTRCalculator().compute(tokens, "1", "t", "a").sttr_sweep is None
+
+    @pytest.mark.parametrize("sizes", [(0,), (250, -1), (2.5,)])
+    def test_non_positive_sizes_rejected(self, sizes):
+        """Chunk sizes that cannot split a book are refused up front."""
+        with pytest.raises(ValueError):
+            TTRConfig(sttr_sweep=sizes)
+        with pytest.raises(ValueError):
+            TTRCalculator().compute_sweep(make_tokens(3000), list(sizes))
+        with pytest.raises(ValueError):
+            TTRConfig(sttr_chunk_size=sizes[-1])
+
+
+class TestVocabularyGrowth:
+    """Tests for the growth curve and Heaps' law fit."""
+
+    def test_curve_matches_prefix_type_counts(self):
+        """Each checkpoint holds the type count of that token prefix."""
+        tokens = make_tokens(20_000)
+        result = TTRCalculator(TTRConfig(vocabulary_growth=True)).compute(tokens, "1", "t", "a")
+        growth = result.vocabulary_growth
+
+        assert growth.tokens[0] == 1 and growth.tokens[-1] == len(tokens)
+        assert growth.tokens == sorted(set(growth.tokens))
+        for n, types in zip(growth.tokens, growth.types):
+            assert types == len(set(tokens[:n]))
+        assert growth.types[-1] == result.unique_words
+
+    def test_heaps_fit_recovers_exponent(self):
+        """An exact power law is fitted back to its parameters."""
+        tokens = np.geomspace(10, 1e6, 40)
+        k, beta, r2 = fit_heaps(tokens, 12.0 * tokens**0.55)
+        assert k == pytest.approx(12.0)
+        assert beta == pytest.approx(0.55)
+        assert r2 == pytest.approx(1.0)
+
+    def test_short_text_has_no_fit(self):
+        """Too few checkpoints above the minimum leave the fit empty."""
+        result = TTRCalculator(TTRConfig(vocabulary_growth=True)).compute(
+            ["a", "b", "a"], "1", "t", "a"
+        )
+        assert result.vocabulary_growth.types == [1, 2, 2]
+        assert result.vocabulary_growth.heaps_beta is None
+
+
+class TestResultColumns:
+    """Tests for columnar aggregation."""
+
+    def test_trusted_records_aggregate_like_results(self):
+        """Columns from raw records and from models aggregate identically."""
+        config = TTRConfig(vocabulary_sketch=True, vocabulary_growth=True)
+        calculator = TTRCalculator(config)
+        results = [
+            calculator.compute(make_tokens(n, seed=n), str(n), "t", "a")
+            for n in (500, 3000, 4500, 9000)
+        ]
+        records = [r.model_dump(mode="json", exclude_none=True) for r in results]
+
+        columns = ResultColumns.from_records(records)
+        assert columns.gutenberg_ids == [r.gutenberg_id for r in results]
+        assert np.isnan(columns.sttr[0]) and not np.isnan(columns.sttr[1])
+
+        aggregator = TTRAggregator()
+        from_records = aggregator.aggregate_columns(columns, "a")
+        assert from_records == aggregator.aggregate(results, "a")
+        assert from_records["book_count"] == 4 and from_records["vocabulary_books"] == 4
+        assert from_records["ttr_median"] == pytest.approx(
+            np.median([r.ttr for r in results]), abs=1e-6
+        )
+
+    def test_shared_ids_all_count(self):
+        """Aggregation keeps results that share an ID (e.g. "0" for unnumbered files)."""
+        calculator = TTRCalculator()
+        results = [calculator.compute(make_tokens(n, seed=n), "0", "t", "a") for n in (500, 900)]
+        aggregates = TTRAggregator().aggregate(results, "a")
+        assert aggregates["book_count"] == 2
+        assert aggregates["total_words"] == 1400
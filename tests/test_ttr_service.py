@@ -0,0 +1,399 @@
+"""Tests for the TTR service pipeline."""
+
+import json
+import os
+import time
+
+import pytest
+
+from gutenburg_stylometry.metrics.ttr import TTRConfig
+from gutenburg_stylometry.services.ttr_service import TTRService
+
+
+WORDS = "the a of and to in that it was he his she her said not but for with as had".split()
+
+
+def write_corpus(base_dir, books=6):
+    """Create normalized books with varied vocabulary."""
+    normalized = base_dir / "data" / "normalized"
+    normalized.mkdir(parents=True)
+    for i in range(books):
+        words = [WORDS[(j * (i + 3)) % len(WORDS)] + str(j % (50 + i * 40)) for j in range(3000)]
+        (normalized / f"austen-book-{i}-{100 + i}.txt").write_text(" ".join(words))
+
+
+class TestProcessAuthor:
+    """Tests for TTRService.process_author."""
+
+    def test_pipeline_modes_produce_identical_output(self, tmp_path):
+        """Prefetching and worker processes do not change results or order."""
+        write_corpus(tmp_path)
+        service = TTRService(tmp_path)
+        output = service.metrics_dir / "austen.jsonl"
+
+        service.process_author("austen")
+        serial = output.read_text()
+
+        stats = service.process_author("austen", prefetch=4)
+        assert output.read_text() == serial
+        assert stats.files_succeeded == 6
+
+        service.process_author("austen", prefetch=2, workers=2)
+        assert output.read_text() == serial
+
+    def test_reloads_count_rewritten_books_once(self, tmp_path):
+        """A book written twice by a resumed run is aggregated once."""
+        write_corpus(tmp_path)
+        service = TTRService(tmp_path)
+        service.process_author("austen")
+        output = service.metrics_dir / "austen.jsonl"
+        lines = output.read_text().splitlines(keepends=True)
+        output.write_text("".join(lines + lines[:1]))
+
+        assert len(service.load_columns("austen")) == len(service.load_results("austen")) == 6
+        assert service.aggregate_author("austen")["book_count"] == 6
+
+    def test_aggregate_after_processing(self, tmp_path):
+        """Aggregates are computed from the written results."""
+        write_corpus(tmp_path)
+        service = TTRService(tmp_path)
+        stats, aggregates = service.process_and_aggregate_author("austen")
+        assert aggregates["book_count"] == stats.files_succeeded == 6
+        assert (service.aggregates_dir / "austen.json").exists()
+
+
+class TestResume:
+    """Tests for checkpointed, resumable runs."""
+
+    def test_resume_after_interrupted_run(self, tmp_path):
+        """Only missing books are processed; torn and duplicate lines are repaired."""
+        write_corpus(tmp_path)
+        service = TTRService(tmp_path)
+        output = service.metrics_dir / "austen.jsonl"
+        service.process_author("austen")
+        complete = output.read_text().splitlines(keepends=True)
+
+        # Crash after three books, mid-way through writing the fourth
+        output.write_text("".join(complete[:3] + [complete[0], complete[3][:40]]))
+
+        stats = service.process_author("austen", resume=True)
+        assert stats.files_resumed == 3
+        assert stats.files_processed == 3
+        assert sorted(output.read_text().splitlines(keepends=True)) == sorted(complete)
+
+    def test_resume_follows_the_journal(self, tmp_path):
+        """A book flushed but not journaled is redone, not duplicated."""
+        write_corpus(tmp_path)
+        service = TTRService(tmp_path)
+        output = service.metrics_dir / "austen.jsonl"
+        service.process_author("austen")
+        complete = output.read_text().splitlines(keepends=True)
+
+        # Crash after the fourth result was flushed but before it was journaled
+        journal = service.checkpoints_dir / "austen.journal.jsonl"
+        journal.write_text("".join(journal.read_text().splitlines(keepends=True)[:4]))
+        output.write_text("".join(complete[:4]))
+
+        stats = service.process_author("austen", resume=True)
+        assert stats.files_resumed == 3
+        assert stats.files_processed == 3
+        assert sorted(output.read_text().splitlines(keepends=True)) == sorted(complete)
+
+    def test_config_change_restarts(self, tmp_path):
+        """A journal from a different configuration is not resumed."""
+        write_corpus(tmp_path)
+        TTRService(tmp_path).process_author("austen")
+        stats = TTRService(tmp_path, lowercase=False).process_author("austen", resume=True)
+        assert stats.files_resumed == 0
+        assert stats.files_processed == 6
+
+
+class TestWorkQueue:
+    """Tests for the distributed work-queue mode."""
+
+    def test_workers_and_merge_match_serial_output(self, tmp_path):
+        """A dead worker's lease is retried and the merge matches process_author."""
+        from gutenburg_stylometry.services.work_queue import TaskQueue
+
+        write_corpus(tmp_path)
+        service = TTRService(tmp_path)
+        service.process_author("austen")
+        serial = (service.metrics_dir / "austen.jsonl").read_text()
+
+        queue = TaskQueue(service.queue_path, lease_seconds=0.0)
+        assert service.enqueue_corpus(queue) == 6
+        assert service.enqueue_corpus(queue) == 0
+
+        # A worker leases two books and dies without completing them
+        assert len(queue.lease("dead", limit=2)) == 2
+        stats = service.run_queue_worker(queue, "a", batch_size=3)
+        queue.close()
+
+        assert stats.files_succeeded == 6
+        aggregates = service.merge_shards()
+        assert aggregates["austen"]["book_count"] == 6
+        assert (service.metrics_dir / "austen.jsonl").read_text() == serial
+
+    def test_queue_runs_are_tied_to_their_settings(self, tmp_path):
+        """Other settings are refused, and a new queue sets stale shards aside."""
+        from gutenburg_stylometry.services.work_queue import TaskQueue
+
+        write_corpus(tmp_path)
+        old = TTRService(tmp_path, ttr_config=TTRConfig(sttr_chunk_size=500))
+        with TaskQueue(tmp_path / "old.sqlite") as queue:
+            old.enqueue_corpus(queue)
+            old.run_queue_worker(queue, "a")
+            with pytest.raises(ValueError):
+                TTRService(tmp_path).enqueue_corpus(queue)
+            with pytest.raises(ValueError):
+                TTRService(tmp_path).run_queue_worker(queue, "b")
+
+        service = TTRService(tmp_path)
+        service.process_author("austen")
+        serial = (service.metrics_dir / "austen.jsonl").read_text()
+        with TaskQueue(tmp_path / "new.sqlite") as queue:
+            service.enqueue_corpus(queue)
+            assert not list(service.shards_dir.glob("*.jsonl"))
+            service.run_queue_worker(queue, "a")
+        service.merge_shards()
+        assert (service.metrics_dir / "austen.jsonl").read_text() == serial
+
+    def test_merge_keeps_newest_record(self, tmp_path):
+        """A book written by two workers keeps the later shard's record."""
+        from gutenburg_stylometry.services.work_queue import TaskQueue
+
+        write_corpus(tmp_path)
+        service = TTRService(tmp_path)
+        with TaskQueue(service.queue_path) as queue:
+            service.enqueue_corpus(queue)
+            service.run_queue_worker(queue, "a")
+
+        header, first, *_ = (service.shards_dir / "a.jsonl").read_text().splitlines()
+        record = json.loads(first)
+        record["total_words"] += 1
+        newer = service.shards_dir / "b.jsonl"
+        newer.write_text(f"{header}\n{json.dumps(record)}\n")
+        os.utime(newer, ns=(time.time_ns() + 10**9,) * 2)
+
+        service.merge_shards(aggregate=False)
+        merged = {r.gutenberg_id: r for r in service.load_results("austen")}
+        assert len(merged) == 6
+        assert merged[record["gutenberg_id"]].total_words == record["total_words"]
+
+    def test_failed_tasks_stop_after_max_attempts(self, tmp_path):
+        """Unreadable books are retried, then marked failed."""
+        from gutenburg_stylometry.services.work_queue import TaskQueue
+
+        write_corpus(tmp_path, books=1)
+        service = TTRService(tmp_path)
+        with TaskQueue(service.queue_path, max_attempts=2) as queue:
+            queue.enqueue([("austen", str(tmp_path / "missing-book-1.txt"))])
+            stats = service.run_queue_worker(queue, "a")
+            assert stats.files_failed == 2
+            assert queue.counts() == {"failed": 1}
+            assert queue.is_drained()
+
+
+class TestProfiling:
+    """Tests for opt-in per-stage profiling."""
+
+    def test_profile_collected_in_every_mode(self, tmp_path):
+        """Stage timings, tokens and bytes are recorded, including from workers."""
+        from gutenburg_stylometry.profiling import Profiler, to_prometheus
+
+        write_corpus(tmp_path)
+        service = TTRService(tmp_path)
+        assert service.process_author("austen").profile is None
+
+        for workers in (1, 2):
+            stats = service.process_author("austen", workers=workers, profiler=Profiler())
+            profile = stats.profile
+            assert list(profile.stages) == ["read", "normalize", "tokenize", "compute", "write"]
+            assert all(timing.calls == 6 for timing in profile.stages.values())
+            assert profile.books == 6
+            assert profile.tokens == stats.total_words
+            assert profile.bytes_read == sum(
+                p.stat().st_size for p in (tmp_path / "data" / "normalized").iterdir()
+            )
+
+        text = to_prometheus(profile, labels={"author": "austen"})
+        assert 'gutenberg_ttr_stage_calls_total{stage="compute",author="austen"} 6' in text
+        assert f'gutenberg_ttr_tokens_total{{author="austen"}} {stats.total_words}' in text
+
+    def test_memory_is_recorded_per_book(self, tmp_path):
+        """Each book records how far it raised the process peak; the largest is kept."""
+        from gutenburg_stylometry.profiling import BookTiming, Profiler
+
+        write_corpus(tmp_path, books=2)
+        profile = TTRService(tmp_path).process_author("austen", profiler=Profiler()).profile
+        assert all(book.rss_growth_bytes >= 0 for book in profile.slowest)
+
+        def book(gutenberg_id, growth):
+            return BookTiming(0.1, "p", "austen", gutenberg_id, 10, 2, "ok", growth)
+
+        worker = Profiler()
+        worker.record_book(book("1", 4096))
+        worker.record_book(book("2", 0))
+        profiler = Profiler()
+        profiler.record_book(book("3", 1024))
+        profiler.merge(worker.totals())
+        summary = profiler.summary()
+        assert sorted(b.gutenberg_id for b in summary.slowest) == ["1", "2", "3"]
+        largest = summary.largest_rss_growth
+        assert (largest.gutenberg_id, largest.rss_growth_bytes) == ("1", 4096)
+
+
+class TestBudgets:
+    """Tests for per-book budgets and the slowest-books report."""
+
+    def test_oversize_books_sampled_or_skipped(self, tmp_path):
+        """Books over max_chars are sampled (and flagged) or skipped."""
+        from gutenburg_stylometry.profiling import Profiler
+        from gutenburg_stylometry.services.budget import BookBudget
+
+        write_corpus(tmp_path, books=2)
+        sampled = TTRService(tmp_path, budget=BookBudget(max_chars=5000, sample_windows=4))
+        profiler = Profiler(slowest=1)
+        stats = sampled.process_author("austen", profiler=profiler)
+        results = sampled.load_results("austen")
+        assert stats.files_succeeded == 2
+        assert all(0 < r.sampled_fraction < 1 for r in results)
+        assert len(stats.profile.slowest) == 1
+        assert stats.profile.slowest[0].status == "sampled"
+
+        skipped = TTRService(tmp_path, budget=BookBudget(max_chars=5000, oversize="skip"))
+        stats = skipped.process_author("austen", workers=2, profiler=Profiler())
+        assert stats.files_failed == 2
+        assert {book.status for book in stats.profile.slowest} == {"skipped"}
+
+    def test_time_budget_abandons_tokenization(self, tmp_path):
+        """A book that runs past max_seconds fails with a timeout."""
+        from gutenburg_stylometry.profiling import Profiler
+        from gutenburg_stylometry.services.budget import BookBudget
+
+        write_corpus(tmp_path, books=1)
+        service = TTRService(tmp_path, budget=BookBudget(max_seconds=0.0))
+        stats = service.process_author("austen", profiler=Profiler())
+        assert stats.files_failed == 1
+        assert "deadline" in stats.errors[0][1]
+        assert stats.profile.slowest[0].status == "timeout"
+
+    def test_time_budget_checked_after_normalize(self, tmp_path, monkeypatch):
+        """A book whose normalization overruns the budget is not tokenized."""
+        from gutenburg_stylometry.io.reader import BookContent
+        from gutenburg_stylometry.metrics.ttr import TTRCalculator
+        from gutenburg_stylometry.services.budget import BookBudget
+        from gutenburg_stylometry.services.ttr_service import process_content
+        from gutenburg_stylometry.tokenizer import VictorianTokenizer
+
+        tokenized = []
+        monkeypatch.setattr(
+            VictorianTokenizer, "normalize", lambda self, text: time.sleep(0.02) or text
+        )
+        monkeypatch.setattr(
+            VictorianTokenizer, "tokenize_normalized", lambda *args, **kwargs: tokenized.append(1)
+        )
+        tokenizer = VictorianTokenizer()
+        content = BookContent("1", "book", "austen", " ".join(WORDS), tmp_path / "book.txt")
+        result = process_content(
+            content, tokenizer, TTRCalculator(), budget=BookBudget(max_seconds=0.01)
+        )
+        assert not result.success and "after normalize" in result.error
+        assert not tokenized
+
+
+class TestEstimateSTTR:
+    """Tests for the sampled STTR estimation mode."""
+
+    def test_estimates_track_full_sttr_and_rank_authors(self, tmp_path):
+        """Sampled estimates are close to the full STTR and ranked correctly."""
+        from gutenburg_stylometry.metrics.ttr import TTRConfig
+
+        write_corpus(tmp_path)
+        normalized = tmp_path / "data" / "normalized"
+        for i in range(3):
+            words = [WORDS[j % 7] for j in range(3000 + i)]
+            (normalized / f"bronte-plain-{i}-{200 + i}.txt").write_text(" ".join(words))
+
+        service = TTRService(tmp_path, ttr_config=TTRConfig(sttr_chunk_size=200))
+        estimates = service.estimate_sttr(samples_per_book=4)
+        assert [e.author for e in estimates] == ["austen", "bronte"]
+        assert [e.rank for e in estimates] == [1, 2]
+        assert estimates[0].books == 6 and estimates[0].chunks == 24
+        assert estimates[0].ci_low <= estimates[0].sttr <= estimates[0].ci_high
+        assert (service.estimates_dir / "sttr_sampled.jsonl").exists()
+
+        service.process_author("austen")
+        full = service.aggregate_author("austen")["sttr_mean"]
+        assert abs(estimates[0].sttr - full) < 0.05
+
+        subset = service.estimate_sttr(authors=["austen"], max_books=2, samples_per_book=2)
+        assert subset[0].books == 2
+
+
+class TestCorpusVocabulary:
+    """Tests for corpus-level vocabulary aggregation."""
+
+    def test_corpus_union_of_author_sketches(self, tmp_path):
+        """Corpus vocabulary covers every author's sketched books."""
+        from gutenburg_stylometry.metrics.ttr import TTRConfig
+
+        write_corpus(tmp_path)
+        service = TTRService(tmp_path, ttr_config=TTRConfig(vocabulary_sketch=True))
+        service.process_author("austen")
+        author = service.aggregate_author("austen")
+
+        corpus = service.aggregate_corpus()
+        assert corpus["book_count"] == 6
+        assert corpus["author_vocabulary"] == {"austen": author["vocabulary_estimate"]}
+        assert corpus["vocabulary_estimate"] == author["vocabulary_estimate"]
+        assert service.corpus_aggregate_path.exists()
+
+
+class TestChapters:
+    """Tests for chapter segmentation during tokenization."""
+
+    BOOK = (
+        "CHAPTER I. The Beginning\n\n"
+        "It was the best of times, it was the worst of times.\n"
+        "Part I of the estate was sold.\n\n"
+        "Chapter II\n\n"
+        "A new chapter begins here with new words entirely.\n\n"
+        "CHAPTER THREE\n\n"
+        "And the end."
+    )
+
+    def test_headings_need_blank_lines_around_them(self):
+        """Only standalone heading lines are chapter boundaries."""
+        from gutenburg_stylometry.normalize import find_chapter_headings
+
+        headings = find_chapter_headings(self.BOOK)
+        assert [h.heading for h in headings] == [
+            "CHAPTER I. The Beginning",
+            "Chapter II",
+            "CHAPTER THREE",
+        ]
+        assert self.BOOK[headings[1].start:].startswith("Chapter II")
+        assert self.BOOK[headings[1].start : headings[1].end] == "Chapter II"
+
+    def test_chapter_offsets_match_whole_text_tokens(self):
+        """Segmented tokenization equals whole-text tokenization; headings sit outside chapters."""
+        from gutenburg_stylometry.io.reader import BookContent
+        from gutenburg_stylometry.metrics.ttr import TTRCalculator, TTRConfig
+        from gutenburg_stylometry.services.ttr_service import process_content
+        from gutenburg_stylometry.tokenizer import VictorianTokenizer
+
+        tokenizer = VictorianTokenizer()
+        content = BookContent("1", "t", "a", self.BOOK, None)
+        result = process_content(content, tokenizer, TTRCalculator(TTRConfig(chapters=True))).result
+        tokens = tokenizer.tokenize(self.BOOK)
+        chapters = result.chapters
+
+        assert result.total_words == len(tokens)
+        assert chapters.token_offsets == [4, 25, 36]
+        assert tokens[23:25] == ["chapter", "ii"]
+        assert tokens[25] == "a"
+        assert chapters.tokens == [19, 9, 3]
+        assert chapters.types[2] == 3 and chapters.ttr[2] == 1.0
+        assert chapters.sttr == [None, None, None]
+        assert process_content(content, tokenizer, TTRCalculator()).result.chapters is None
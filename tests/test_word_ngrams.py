@@ -0,0 +1,129 @@
+"""Tests for word n-gram and collocation counting."""
+
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from gutenburg_stylometry.metrics.word_ngrams import (
+    CountMinSketch,
+    WordNgramCounter,
+    pack_ngrams,
+    unpack_ngrams,
+)
+from gutenburg_stylometry.services.ttr_service import TTRService
+
+from tests.test_ttr_service import WORDS, write_corpus
+
+
+def make_books(count: int = 4, length: int = 5000) -> list[list[str]]:
+    """Random books that repeat the phrase "sherlock holmes"."""
+    books = []
+    for seed in range(count):
+        rng = random.Random(seed)
+        tokens = [rng.choice(WORDS) for _ in range(length)]
+        for i in range(0, length, 100):
+            tokens[i : i + 2] = ["sherlock", "holmes"]
+        books.append(tokens)
+    return books
+
+
+def exact_counts(books: list[list[str]], n: int) -> Counter:
+    """Reference n-gram counts."""
+    return Counter(" ".join(t[i : i + n]) for t in books for i in range(len(t) - n + 1))
+
+
+class TestPacking:
+    """Tests for packed n-gram keys and the count-min sketch."""
+
+    @pytest.mark.parametrize("n", [2, 3])
+    def test_pack_round_trip(self, n):
+        """Unpacking recovers the word IDs of every n-gram."""
+        ids = np.array([5, 0, (1 << 21) - 1, 7, 3])
+        grams = unpack_ngrams(pack_ngrams(ids, n), n)
+        expected = np.stack([ids[j : len(ids) - n + 1 + j] for j in range(n)], axis=1)
+        assert np.array_equal(grams, expected)
+
+    def test_pack_rejects_wide_ids(self):
+        """IDs that would overlap neighbouring fields are refused."""
+        with pytest.raises(ValueError):
+            pack_ngrams(np.array([1 << 21, 0, 0]), 3)
+
+    def test_sketch_never_undercounts(self):
+        """Estimates are at least the true count, and merging adds tables."""
+        keys = np.arange(5000, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        counts = np.arange(1, 5001)
+        sketch = CountMinSketch(width=1024, depth=4)
+        sketch.add(keys, counts)
+        assert (sketch.estimate(keys) >= counts).all()
+
+        other = CountMinSketch(width=1024, depth=4)
+        other.add(keys, counts)
+        sketch.merge(other)
+        assert (sketch.estimate(keys) >= 2 * counts).all()
+        with pytest.raises(ValueError):
+            sketch.merge(CountMinSketch(width=1024, depth=4, seed=2))
+
+
+class TestWordNgramCounter:
+    """Tests for WordNgramCounter."""
+
+    def test_top_ngrams_match_exact_counts(self):
+        """With room for every n-gram, the top counts are exact."""
+        books = make_books()
+        counter = WordNgramCounter(capacity=1000)
+        for tokens in books:
+            counter.add_tokens(tokens)
+
+        for n in (2, 3):
+            exact = exact_counts(books, n)
+            top = counter.top(n, 10)
+            assert all(t.count == exact[t.ngram] for t in top)
+            assert [t.count for t in top] == [c for _, c in exact.most_common(10)]
+        assert counter.top(2, 1)[0].ngram == "sherlock holmes"
+
+    def test_bounded_candidates_keep_heavy_hitters(self):
+        """A small capacity still finds the frequent n-grams."""
+        books = make_books()
+        counter = WordNgramCounter(width=1 << 12, capacity=20)
+        for tokens in books:
+            counter.add_tokens(tokens)
+        exact = exact_counts(books, 2)
+
+        assert len(counter.ngrams[2].keys) == len(counter.ngrams[2].labels) == 20
+        top = counter.top(2, 5)
+        assert top[0].ngram == "sherlock holmes"
+        assert all(t.count >= exact[t.ngram] for t in top)
+
+    def test_merge_matches_single_pass(self, tmp_path):
+        """Counters of disjoint books merge (also after a save/load round trip)."""
+        books = make_books()
+        single, left, right = (WordNgramCounter(capacity=50) for _ in range(3))
+        for i, tokens in enumerate(books):
+            single.add_tokens(tokens)
+            (left if i % 2 else right).add_tokens(tokens)
+
+        right.save(tmp_path / "right.npz")
+        left.merge(WordNgramCounter.load(tmp_path / "right.npz"))
+        assert left.books == single.books == 4
+        for n in (2, 3):
+            assert left.top(n, 20) == single.top(n, 20)
+
+    def test_collocations_rank_fixed_phrases(self):
+        """A phrase whose words rarely occur apart has the highest PMI."""
+        counter = WordNgramCounter(capacity=1000)
+        for tokens in make_books():
+            counter.add_tokens(tokens)
+        best = counter.collocations(3, min_count=10)[0]
+        assert best.ngram == "sherlock holmes"
+        assert best.pmi > 5
+
+    def test_service_builds_author_counts(self, tmp_path):
+        """TTRService counts an author's n-grams and saves the counter."""
+        write_corpus(tmp_path)
+        service = TTRService(tmp_path)
+        counter = service.build_word_ngrams("austen")
+        assert counter.books == 6
+        assert service.load_word_ngrams("austen").top(2, 5) == counter.top(2, 5)
+        assert service.load_word_ngrams("dickens") is None